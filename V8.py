@@ -1,7 +1,26 @@
+import argparse
+import atexit
+import os
+import time
+
 import pyxel
 import pygame
-import math
-import random
+
+from simulation import SCREEN_WIDTH, SCREEN_HEIGHT, Simulation, Ball, Player, Team
+from timestep import FixedTimestep, SIM_HZ
+from replay import Replay, ReplayRecorder
+from inputs import InputMixer, KeyboardSource, team_mask
+from netplay import RollbackSession, UdpTransport
+from profiler import FrameProfiler
+from controllers import ControllerManager, GamepadSource
+from analog import STICK_CURVES
+from policy import BUILTIN_AI, POLICIES, make_policies
+from hud import HudLayer
+from simthread import SimulationThread
+from drawing import (
+    BALL_ROW, SPRITE_BANK, SPRITE_CELL, SPRITE_CENTER, SPRITE_COLKEY, SPRITE_SIZE,
+    Camera, paint_field, paint_sprites, player_sprite,
+)
 
 # ================================
 # Initialisation des manettes via pygame
@@ -10,18 +29,10 @@ import random
 pygame.init()
 pygame.joystick.init()
 
-# On initialise deux manettes (si disponibles)
-joystick_a = None
-joystick_b = None
-nb_joysticks = pygame.joystick.get_count()
-if nb_joysticks >= 1:
-    joystick_a = pygame.joystick.Joystick(0)
-    joystick_a.init()
-    print("Joystick A connecté:", joystick_a.get_name(), "| Nombre de boutons:", joystick_a.get_numbuttons())
-if nb_joysticks >= 2:
-    joystick_b = pygame.joystick.Joystick(1)
-    joystick_b.init()
-    print("Joystick B connecté:", joystick_b.get_name(), "| Nombre de boutons:", joystick_b.get_numbuttons())
+# Les manettes (déjà branchées ou branchées en cours de partie) sont placées
+# dans les équipes au fil des événements : voir controllers.py. La lecture
+# commence dans main (option --joy-thread).
+CONTROLLERS = ControllerManager()
 
 # --- Mapping physique des boutons ---
 # Pour une manette type Xbox par exemple : 
@@ -30,389 +41,121 @@ BUTTON_A = 0    # Bouton A pour passer
 BUTTON_B = 1    # Bouton B pour tirer
 BUTTON_X = 2    # Bouton X pour changer de joueur
 
+BUTTONS = {'PASS': BUTTON_A, 'SHOOT': BUTTON_B, 'SELECT': BUTTON_X}
+
 # ================================
-# États des contrôleurs (séparés par équipe)
+# Clavier (mêmes touches que mainv7.py)
 # ================================
 
-# Pour l'équipe A
-CONTROLLER_STATE_A = {}
-PREV_CONTROLLER_STATE_A = {}
-
-# Pour l'équipe B
-CONTROLLER_STATE_B = {}
-PREV_CONTROLLER_STATE_B = {}
-
-def update_controller():
-    """
-    Met à jour les états des deux manettes en remplissant les dictionnaires
-    avec des clés propres à chaque équipe.
-    
-    Pour l'équipe A (joystick_a) :
-      - Mouvement : A_LEFT, A_RIGHT, A_UP, A_DOWN (basé sur les axes)
-      - Boutons : 
-          A_PASS  : bouton A (passer)
-          A_SHOOT : bouton B (tirer)
-          A_SELECT: bouton X (changer de joueur)
-          
-    Pour l'équipe B (joystick_b) :
-      - Mouvement : B_LEFT, B_RIGHT, B_UP, B_DOWN
-      - Boutons : 
-          B_PASS  : bouton A (passer)
-          B_SHOOT : bouton B (tirer)
-          B_SELECT: bouton X (changer de joueur)
-    """
-    deadzone = 0.2
-    # Mise à jour pour l'équipe A
-    if joystick_a:
-        pygame.event.pump()
-        axis_x = joystick_a.get_axis(0)
-        axis_y = joystick_a.get_axis(1)
-        CONTROLLER_STATE_A["A_LEFT"]  = (axis_x < -deadzone)
-        CONTROLLER_STATE_A["A_RIGHT"] = (axis_x >  deadzone)
-        CONTROLLER_STATE_A["A_UP"]    = (axis_y < -deadzone)
-        CONTROLLER_STATE_A["A_DOWN"]  = (axis_y >  deadzone)
-        CONTROLLER_STATE_A["A_PASS"]  = (joystick_a.get_button(BUTTON_A) > 0)
-        CONTROLLER_STATE_A["A_SHOOT"] = (joystick_a.get_button(BUTTON_B) > 0)
-        CONTROLLER_STATE_A["A_SELECT"]= (joystick_a.get_button(BUTTON_X) > 0)
-    # Mise à jour pour l'équipe B
-    if joystick_b:
-        pygame.event.pump()
-        axis_x = joystick_b.get_axis(0)
-        axis_y = joystick_b.get_axis(1)
-        CONTROLLER_STATE_B["B_LEFT"]  = (axis_x < -deadzone)
-        CONTROLLER_STATE_B["B_RIGHT"] = (axis_x >  deadzone)
-        CONTROLLER_STATE_B["B_UP"]    = (axis_y < -deadzone)
-        CONTROLLER_STATE_B["B_DOWN"]  = (axis_y >  deadzone)
-        CONTROLLER_STATE_B["B_PASS"]  = (joystick_b.get_button(BUTTON_A) > 0)
-        CONTROLLER_STATE_B["B_SHOOT"] = (joystick_b.get_button(BUTTON_B) > 0)
-        CONTROLLER_STATE_B["B_SELECT"]= (joystick_b.get_button(BUTTON_X) > 0)
-
-def update_prev_controller_state():
-    """Sauvegarde l'état précédent pour chaque équipe."""
-    for key, value in CONTROLLER_STATE_A.items():
-        PREV_CONTROLLER_STATE_A[key] = value
-    for key, value in CONTROLLER_STATE_B.items():
-        PREV_CONTROLLER_STATE_B[key] = value
-
-# --- Fonctions d'aide pour tester l'état d'une touche ---
-def btn(state, key):
-    return state.get(key, False)
-
-def btnp(state, prev_state, key):
-    return state.get(key, False) and not prev_state.get(key, False)
-
-# --- Patche de pyxel.run pour intégrer la mise à jour des contrôleurs ---
-_original_pyxel_run = pyxel.run
-def patched_run(update, draw):
-    def patched_update():
-        update_controller()              # Lit les entrées des deux manettes
-        update()                         # Met à jour la logique du jeu
-        update_prev_controller_state()   # Sauvegarde pour la détection de front montant
-    _original_pyxel_run(patched_update, draw)
-pyxel.run = patched_run
+KEYBOARD_BINDINGS = {
+    'A': {'UP': pyxel.KEY_Z, 'DOWN': pyxel.KEY_S, 'LEFT': pyxel.KEY_Q, 'RIGHT': pyxel.KEY_D,
+          'PASS': pyxel.KEY_A, 'SHOOT': pyxel.KEY_E, 'SELECT': pyxel.KEY_R},
+    'B': {'UP': pyxel.KEY_UP, 'DOWN': pyxel.KEY_DOWN, 'LEFT': pyxel.KEY_LEFT, 'RIGHT': pyxel.KEY_RIGHT,
+          'PASS': pyxel.KEY_K, 'SHOOT': pyxel.KEY_L, 'SELECT': pyxel.KEY_O},
+}
 
 # ================================
 # Code du jeu
 # ================================
-
-SCREEN_WIDTH = 256
-SCREEN_HEIGHT = 192
-
-BALL_SPEED = 3.0       
-PLAYER_SPEED = 2.0     
-FRICTION = 0.98        
-
-BALL_RADIUS = 3
-PLAYER_RADIUS = 4
-
-TEAM_A_COLOR = 8      
-TEAM_B_COLOR = 12      
-FIELD_COLOR = 11
-BACKGROUND_COLOR = 3   
-GOAL_COLOR = 7  
-
-FIELD_MARGIN = 5
-
-GOAL_WIDTH = 12
-GOAL_HEIGHT = 40
-
-# Mappages pour les deux équipes (utilisant nos constantes personnalisées)
-TEAM_A_KEYS = {
-    'up':    "A_UP",
-    'down':  "A_DOWN",
-    'left':  "A_LEFT",
-    'right': "A_RIGHT",
-    'pass':  "A_PASS",
-    'shoot': "A_SHOOT",
-    'select':"A_SELECT"
-}
-
-TEAM_B_KEYS = {
-    'up':    "B_UP",
-    'down':  "B_DOWN",
-    'left':  "B_LEFT",
-    'right': "B_RIGHT",
-    'pass':  "B_PASS",
-    'shoot': "B_SHOOT",
-    'select':"B_SELECT"
-}
-
-class Ball:
-    def __init__(self):
-        self.reset()
-
-    def reset(self):
-        self.x = SCREEN_WIDTH // 2
-        self.y = SCREEN_HEIGHT // 2
-        self.vx = 0
-        self.vy = 0
-        self.radius = BALL_RADIUS
-        self.in_pass = False
-        self.pass_receiver = None
-        self.cooldown = 0
-
-    def update(self):
-        self.x += self.vx
-        self.y += self.vy
-        self.vx *= FRICTION
-        self.vy *= FRICTION
-        if self.cooldown > 0:
-            self.cooldown -= 1
-        if abs(self.vx) < 0.1 and abs(self.vy) < 0.1:
-            self.vx = 0
-            self.vy = 0
-            self.in_pass = False
-            self.pass_receiver = None
-        goal_top = (SCREEN_HEIGHT - GOAL_HEIGHT) // 2
-        goal_bottom = goal_top + GOAL_HEIGHT
-        if self.x - self.radius < 0:
-            if goal_top <= self.y <= goal_bottom:
-                Game.instance.score['B'] += 1
-                Game.instance.reset_positions()
-                return
-            else:
-                self.vx = abs(self.vx) * 0.7
-                self.x = self.radius
-        if self.x + self.radius > SCREEN_WIDTH:
-            if goal_top <= self.y <= goal_bottom:
-                Game.instance.score['A'] += 1
-                Game.instance.reset_positions()
-                return
-            else:
-                self.vx = -abs(self.vx) * 0.7
-                self.x = SCREEN_WIDTH - self.radius
-        if self.y - self.radius < FIELD_MARGIN:
-            self.vy = abs(self.vy) * 0.7
-            self.y = self.radius + FIELD_MARGIN
-        if self.y + self.radius > SCREEN_HEIGHT - FIELD_MARGIN:
-            self.vy = -abs(self.vy) * 0.7
-            self.y = SCREEN_HEIGHT - self.radius - FIELD_MARGIN
-
-    def draw(self):
-        pyxel.circ(self.x, self.y, self.radius, pyxel.COLOR_WHITE)
-
-class Player:
-    def __init__(self, x, y, team, keys=None, is_keeper=False, controlled=False):
-        self.x = x
-        self.y = y
-        self.team = team            # 'A' ou 'B'
-        self.keys = keys            # Mapping personnalisé (voir TEAM_A_KEYS / TEAM_B_KEYS)
-        self.is_keeper = is_keeper
-        self.controlled = controlled  # Contrôlé par l'humain
-        self.radius = PLAYER_RADIUS
-        self.has_ball = False
-        self.facing = (0, 0)
-        self.default_x = x
-        self.default_y = y
-
-    def update(self, ball, teammates, opponents):
-        self.check_ball_collision(ball)
-        if self.controlled and self.keys is not None:
-            self.handle_input(ball)
-        else:
-            self.ai_behavior(ball, teammates, opponents)
-        self.x = max(FIELD_MARGIN + self.radius, min(self.x, SCREEN_WIDTH - FIELD_MARGIN - self.radius))
-        self.y = max(FIELD_MARGIN + self.radius, min(self.y, SCREEN_HEIGHT - FIELD_MARGIN - self.radius))
-        if self.has_ball:
-            ball.x = self.x
-            ball.y = self.y
-            ball.vx = 0
-            ball.vy = 0
-
-    def check_ball_collision(self, ball):
-        if ball.cooldown > 0 and ball.pass_receiver != self:
-            self.has_ball = False
-            return
-        distance = math.hypot(self.x - ball.x, self.y - ball.y)
-        if distance < self.radius + ball.radius:
-            if ball.in_pass and ball.pass_receiver is not None:
-                if ball.pass_receiver == self:
-                    self.has_ball = True
-                    ball.in_pass = False
-                    ball.pass_receiver = None
-                    ball.vx = 0
-                    ball.vy = 0
-                elif self.team != ball.pass_receiver.team:
-                    self.has_ball = True
-                    ball.in_pass = False
-                    ball.pass_receiver = None
-                    ball.vx = 0
-                    ball.vy = 0
-                else:
-                    self.has_ball = False
-            else:
-                self.has_ball = True
-                ball.vx = 0
-                ball.vy = 0
-        else:
-            self.has_ball = False
-
-    def handle_input(self, ball):
-        dx = 0
-        dy = 0
-        # Choix de la table de contrôle en fonction de l'équipe
-        if self.team == 'A':
-            ctrl = CONTROLLER_STATE_A
-            prev_ctrl = PREV_CONTROLLER_STATE_A
-        else:
-            ctrl = CONTROLLER_STATE_B
-            prev_ctrl = PREV_CONTROLLER_STATE_B
-        if btn(ctrl, self.keys['left']):
-            dx -= PLAYER_SPEED
-        if btn(ctrl, self.keys['right']):
-            dx += PLAYER_SPEED
-        if btn(ctrl, self.keys['up']):
-            dy -= PLAYER_SPEED
-        if btn(ctrl, self.keys['down']):
-            dy += PLAYER_SPEED
-        if dx != 0 or dy != 0:
-            self.facing = (dx, dy)
-        self.x += dx
-        self.y += dy
-        if self.has_ball:
-            if btnp(ctrl, prev_ctrl, self.keys['pass']):
-                self.pass_ball(ball)
-            elif btnp(ctrl, prev_ctrl, self.keys['shoot']):
-                self.shoot_ball(ball)
-
-    def pass_ball(self, ball):
-        best_mate = None
-        best_dist = float('inf')
-        for mate in Game.instance.teams[self.team].players:
-            if mate is not self:
-                d = math.hypot(mate.x - self.x, mate.y - self.y)
-                if d < best_dist:
-                    best_dist = d
-                    best_mate = mate
-        if best_mate is not None:
-            dx = best_mate.x - self.x
-            dy = best_mate.y - self.y
-            d = math.hypot(dx, dy)
-            if d != 0:
-                ball.vx = (dx / d) * BALL_SPEED * 1.2
-                ball.vy = (dy / d) * BALL_SPEED * 1.2
-            ball.in_pass = True
-            ball.pass_receiver = best_mate
-            ball.cooldown = 10
-            team = Game.instance.teams[self.team]
-            for p in team.players:
-                p.controlled = False
-                p.keys = None
-            best_mate.controlled = True
-            best_mate.keys = team.keys
-            self.has_ball = False
-
-    def shoot_ball(self, ball):
-        if self.team == 'A':
-            goal_x = SCREEN_WIDTH - FIELD_MARGIN - GOAL_WIDTH // 2
-        else:
-            goal_x = FIELD_MARGIN + GOAL_WIDTH // 2
-        goal_y = SCREEN_HEIGHT // 2
-        dx = goal_x - self.x
-        dy = goal_y - self.y
-        d = math.hypot(dx, dy)
-        if d != 0:
-            ball.vx = (dx / d) * BALL_SPEED * 1.5
-            ball.vy = (dy / d) * BALL_SPEED * 1.5
-            ball.in_pass = True
-            ball.pass_receiver = None
-            ball.cooldown = 10
-            self.has_ball = False
-
-    def ai_behavior(self, ball, teammates, opponents):
-        if Game.instance.team_has_possession(self.team):
-            if self.team == 'A':
-                target_x = SCREEN_WIDTH - FIELD_MARGIN - GOAL_WIDTH - 10
-            else:
-                target_x = FIELD_MARGIN + GOAL_WIDTH + 10
-            target_y = self.y
-        else:
-            target_x = self.default_x
-            target_y = self.default_y
-        if self.is_keeper:
-            if self.team == 'A':
-                target_x = FIELD_MARGIN + self.radius + 2
-                target_y = SCREEN_HEIGHT // 2
-            else:
-                target_x = SCREEN_WIDTH - FIELD_MARGIN - self.radius - 2
-                target_y = SCREEN_HEIGHT // 2
-        angle = math.atan2(target_y - self.y, target_x - self.x)
-        self.x += math.cos(angle) * PLAYER_SPEED * 0.6
-        self.y += math.sin(angle) * PLAYER_SPEED * 0.6
-
-    def draw(self):
-        color = TEAM_A_COLOR if self.team == 'A' else TEAM_B_COLOR
-        pyxel.circ(self.x, self.y, self.radius, color)
-        if self.controlled:
-            pyxel.circb(self.x, self.y, self.radius + 2, pyxel.COLOR_YELLOW)
-        if self.has_ball:
-            pyxel.circ(self.x, self.y, self.radius - 2, pyxel.COLOR_WHITE)
-
-class Team:
-    def __init__(self, team, keys):
-        self.team = team
-        self.keys = keys
-        self.players = []
-        self.selected_index = 0
-
-    def add_player(self, player):
-        self.players.append(player)
-
-    def cycle_player(self):
-        self.selected_index = (self.selected_index + 1) % len(self.players)
-        for i, player in enumerate(self.players):
-            player.controlled = (i == self.selected_index)
-            player.keys = self.keys if player.controlled else None
-
-    def update_selection(self):
-        # On gère le changement de joueur sur le front montant du bouton "select"
-        if self.team == 'A':
-            ctrl = CONTROLLER_STATE_A
-            prev_ctrl = PREV_CONTROLLER_STATE_A
-        else:
-            ctrl = CONTROLLER_STATE_B
-            prev_ctrl = PREV_CONTROLLER_STATE_B
-        if btnp(ctrl, prev_ctrl, self.keys['select']):
-            self.cycle_player()
-
-    def draw_players(self):
-        for player in self.players:
-            player.draw()
+# La logique (Ball, Player, Team) est dans simulation.py ; Game ne fait que
+# lire les entrées (clavier et manettes réunis en un masque par image, voir
+# inputs.InputMixer), avancer la simulation et dessiner.
+# La simulation tourne à pas fixe (timestep.SIM_HZ) et l'affichage, plus
+# rapide, interpole entre les deux derniers pas.
+# Le terrain et les sprites sont dessinés par drawing.py, partagé avec
+# l'export vidéo sans fenêtre (render.py).
+
+RENDER_FPS = 60
+REPLAY_DIR = "replays"         # Chaque match joué y est enregistré
+REPLAY_SEEK = 30 * SIM_HZ      # Saut (en pas de simulation) des flèches en relecture
+GOAL_BANNER_FRAMES = 2 * RENDER_FPS   # Durée d'affichage de "BUT!" (2 secondes)
 
 class Game:
     instance = None
 
-    def __init__(self):
-        pyxel.init(SCREEN_WIDTH, SCREEN_HEIGHT, title="Pyxel Football")
+    def __init__(self, replay_path=None, net=None, profiler=None, threaded=False, players_per_side=4,
+                 keepers=True, ai=None):
+        self.profiler = profiler
+        self.threaded = threaded       # Match local : simulation dans son thread (simthread.py)
+        self.players_per_side = players_per_side
+        self.keepers = keepers         # Un gardien par équipe (un replay garde son propre réglage)
+        self.ai = ai or {'A': BUILTIN_AI, 'B': BUILTIN_AI}   # IA de chaque équipe (policy.py), idem
+        self.sim_thread = None
+        self.input = InputMixer([
+            KeyboardSource(KEYBOARD_BINDINGS, pyxel.btn),
+            GamepadSource(CONTROLLERS, BUTTONS),
+        ])
+        pyxel.init(SCREEN_WIDTH, SCREEN_HEIGHT, title="Pyxel Football", fps=RENDER_FPS)
         Game.instance = self
-        self.ball = Ball()
-        self.teams = {}
-        self.teams['A'] = Team('A', TEAM_A_KEYS)
-        self.teams['B'] = Team('B', TEAM_B_KEYS)
-        self.score = {'A': 0, 'B': 0}
+        self.pitch = None
+        self.field = None
+        self.camera = None
+        paint_sprites(pyxel.images[SPRITE_BANK])
+        # Textes du HUD redessinés seulement quand leur valeur change (hud.py)
+        self.hud = HudLayer()
+        self.score_widget = self.hud.widget(
+            pyxel.COLOR_YELLOW, lambda score: f"Équipe A: {score[0]}   Équipe B: {score[1]}")
+        self.goal_widget = self.hud.widget(pyxel.COLOR_RED)
+        self.goal_widget.update("BUT!")
+        self.goal_display_timer = 0
+        self.goals = 0
+        self.sim = None
+        self.timestep = None
+        self.recorder = None
+        self.replay = None
+        self.session = None
         self.selected_team = None
+        if replay_path is not None:
+            self.start_replay(replay_path)
+        elif net is not None:
+            self.start_network(*net)
         pyxel.run(self.update, self.draw)
 
+    def start_network(self, local_team, local_port, remote_addr):
+        """Match à deux machines : les commandes de l'équipe A jouent local_team, l'autre équipe vient du réseau."""
+        self.selected_team = 'A'
+        self.sim = Simulation(self.selected_team, self.players_per_side, policies=make_policies(self.ai),
+                              keepers=self.keepers)
+        self.use_pitch(self.sim.pitch)
+        transport = UdpTransport(('0.0.0.0', local_port), remote_addr)
+        self.session = RollbackSession(self.sim, local_team, transport)
+        self.timestep = FixedTimestep(self.sim, step=self.network_step)
+
+    def network_step(self, inputs=None, sticks=None):
+        self.session.advance(team_mask(inputs, 'A'))
+
+    def start_replay(self, path):
+        """Relit un match enregistré au lieu de lire les manettes."""
+        self.replay = Replay.load(path)
+        self.selected_team = self.replay.selected_team or 'B'
+        self.sim = self.replay.new_simulation()
+        self.use_pitch(self.sim.pitch)
+        self.timestep = FixedTimestep(self.sim, step=self.replay_step)
+
+    def use_pitch(self, pitch):
+        """Pré-dessine le terrain de la partie (une seule fois par taille) et place la caméra."""
+        if self.pitch is None or (pitch.width, pitch.height) != (self.pitch.width, self.pitch.height):
+            self.field = pyxel.Image(pitch.width, pitch.height)
+            paint_field(self.field, pitch)
+        self.pitch = pitch
+        self.camera = Camera(pitch)
+
+    def replay_step(self, inputs=None, sticks=None):
+        # Les entrées viennent du fichier ; les manettes sont ignorées
+        self.replay.step(self.sim)
+
+    def handle_replay_keys(self):
+        if pyxel.btnp(pyxel.KEY_RIGHT):
+            self.replay.seek(self.sim, self.sim.frame + REPLAY_SEEK)
+            self.timestep.sync()
+            self.goals = self.sim.score['A'] + self.sim.score['B']
+            self.camera.center_on(self.sim.ball.x, self.sim.ball.y)
+        elif pyxel.btnp(pyxel.KEY_LEFT):
+            self.replay.seek(self.sim, self.sim.frame - REPLAY_SEEK)
+            self.timestep.sync()
+            self.goals = self.sim.score['A'] + self.sim.score['B']
+            self.camera.center_on(self.sim.ball.x, self.sim.ball.y)
+
 
     def handle_team_selection(self):
         if pyxel.btnp(pyxel.KEY_1):
@@ -424,69 +167,74 @@ class Game:
 
 
     def setup_teams(self):
-        if self.selected_team == 'A':
-            self.teams['A'].add_player(Player(30, 50, 'A', TEAM_A_KEYS, controlled=True))
-            self.teams['A'].add_player(Player(50, 70, 'A'))
-            self.teams['A'].add_player(Player(30, 100, 'A'))
-            self.teams['A'].add_player(Player(50, 130, 'A'))
-            self.teams['B'].add_player(Player(220, 50, 'B', TEAM_B_KEYS, controlled=True))
-            self.teams['B'].add_player(Player(200, 70, 'B'))
-            self.teams['B'].add_player(Player(220, 100, 'B'))
-            self.teams['B'].add_player(Player(200, 130, 'B'))
+        # Une manette par joueur humain : deux par équipe si une seconde place est prise
+        self.sim = Simulation(self.selected_team, self.players_per_side, policies=make_policies(self.ai),
+                              keepers=self.keepers, seats=CONTROLLERS.seats())
+        self.use_pitch(self.sim.pitch)
+        os.makedirs(REPLAY_DIR, exist_ok=True)
+        path = os.path.join(REPLAY_DIR, time.strftime("match-%Y%m%d-%H%M%S.frpl"))
+        self.recorder = ReplayRecorder(self.sim, self.selected_team, self.players_per_side, path=path)
+        # Le fichier n'est réécrit qu'à chaque instantané (30 s) : on l'écrit aussi en
+        # quittant (pyxel.quit appelle atexit), sinon un match court n'est jamais enregistré
+        # et un long perd ses dernières secondes. Enregistré avant le thread de simulation :
+        # atexit appelle dans l'ordre inverse, le thread est arrêté avant l'écriture
+        atexit.register(self.recorder.save)
+        if self.threaded:
+            step = self.recorder.step if self.profiler is None else self.profiled_step
+            self.sim_thread = SimulationThread(self.sim, step=step)
+            self.sim_thread.start()
         else:
-            self.teams['A'].add_player(Player(30, 50, 'A'))
-            self.teams['A'].add_player(Player(50, 70, 'A'))
-            self.teams['A'].add_player(Player(30, 100, 'A'))
-            self.teams['A'].add_player(Player(50, 130, 'A'))
-            self.teams['B'].add_player(Player(220, 50, 'B', TEAM_B_KEYS, controlled=True))
-            self.teams['B'].add_player(Player(200, 70, 'B'))
-            self.teams['B'].add_player(Player(220, 100, 'B'))
-            self.teams['B'].add_player(Player(200, 130, 'B'))
-
-
-    def team_has_possession(self, team):
-        for player in self.teams[team].players:
-            if player.has_ball:
-                return True
-        return False
+            self.timestep = FixedTimestep(self.sim, step=self.recorder.step)
+
+    def profiled_step(self, mask, sticks):
+        """Pas du thread de simulation : ses temps vont au profiler après chaque pas."""
+        self.recorder.step(mask, sticks)
+        self.profiler.publish()
 
     def update(self):
+        if self.profiler is not None:
+            self.profiler.next_frame()
+        if self.sim_thread is not None and self.sim_thread.inputs_seen():
+            CONTROLLERS.consume_taps()
+        self.input.poll()
         if self.selected_team is None:
             self.handle_team_selection()
         else:
-            self.teams['A'].update_selection()
-            self.teams['B'].update_selection()
-            for team in self.teams.values():
-                for player in team.players:
-                    teammates = team.players
-                    opponents = self.teams['B'].players if team.team == 'A' else self.teams['A'].players
-                    player.update(self.ball, teammates, opponents)
-            self.ball.update()
-            if self.ball.x - self.ball.radius < 0:
-                self.score['B'] += 1
-                self.reset_positions()
-            elif self.ball.x + self.ball.radius > SCREEN_WIDTH:
-                self.score['A'] += 1
-                self.reset_positions()
-
-    def reset_positions(self):
-        self.ball.reset()
-        for team in self.teams.values():
-            for player in team.players:
-                player.x = player.default_x
-                player.y = player.default_y
+            if self.replay is not None:
+                self.handle_replay_keys()
+            if self.sim_thread is not None:
+                self.sim_thread.publish(self.input.mask, self.input.sticks)
+            elif self.timestep.advance(self.input.mask, self.input.sticks):
+                # Les appuis brefs ont été vus par au moins un pas de simulation
+                CONTROLLERS.consume_taps()
+            goals = sum(self.view()[2])
+            if goals != self.goals:
+                self.goals = goals
+                self.goal_display_timer = GOAL_BANNER_FRAMES
+            elif self.goal_display_timer > 0:
+                self.goal_display_timer -= 1
 
     def draw_field(self):
-        pyxel.cls(BACKGROUND_COLOR)
-        pyxel.rect(FIELD_MARGIN, FIELD_MARGIN, SCREEN_WIDTH - 2 * FIELD_MARGIN, SCREEN_HEIGHT - 2 * FIELD_MARGIN, FIELD_COLOR)
-        pyxel.rectb(FIELD_MARGIN, FIELD_MARGIN, SCREEN_WIDTH - 2 * FIELD_MARGIN, SCREEN_HEIGHT - 2 * FIELD_MARGIN, pyxel.COLOR_WHITE)
-        goal_top = (SCREEN_HEIGHT - GOAL_HEIGHT) // 2
-        pyxel.rect(0, goal_top, GOAL_WIDTH, GOAL_HEIGHT, GOAL_COLOR)
-        pyxel.rectb(0, goal_top, GOAL_WIDTH, GOAL_HEIGHT, pyxel.COLOR_BLACK)
-        pyxel.rect(SCREEN_WIDTH - GOAL_WIDTH, goal_top, GOAL_WIDTH, GOAL_HEIGHT, GOAL_COLOR)
-        pyxel.rectb(SCREEN_WIDTH - GOAL_WIDTH, goal_top, GOAL_WIDTH, GOAL_HEIGHT, pyxel.COLOR_BLACK)
-        pyxel.line(SCREEN_WIDTH // 2, FIELD_MARGIN, SCREEN_WIDTH // 2, SCREEN_HEIGHT - FIELD_MARGIN, pyxel.COLOR_WHITE)
-
+        # Le terrain ne change jamais : il est pré-dessiné dans self.field
+        # (paint_field), on n'en copie que la partie sous la caméra
+        x, y = self.camera.x, self.camera.y
+        pyxel.blt(x, y, self.field, x, y, SCREEN_WIDTH, SCREEN_HEIGHT)
+
+    def draw_ball(self, x, y):
+        pyxel.blt(x - SPRITE_CENTER, y - SPRITE_CENTER, SPRITE_BANK, 0, BALL_ROW * SPRITE_CELL,
+                  SPRITE_SIZE, SPRITE_SIZE, SPRITE_COLKEY)
+
+    def draw_player(self, player, x, y):
+        u, v = player_sprite(player)
+        pyxel.blt(x - SPRITE_CENTER, y - SPRITE_CENTER, SPRITE_BANK, u, v,
+                  SPRITE_SIZE, SPRITE_SIZE, SPRITE_COLKEY)
+
+    def view(self):
+        """(positions interpolées, joueurs, score) à dessiner."""
+        if self.sim_thread is not None:
+            return self.sim_thread.view()
+        return (self.timestep.interpolated_positions(), self.sim.players(),
+                (self.sim.score['A'], self.sim.score['B']))
 
     def draw(self):
         if self.selected_team is None:
@@ -495,15 +243,86 @@ class Game:
             pyxel.text(50, 100, "Appuyez sur 1 pour l'equipe A", pyxel.COLOR_CYAN)
             pyxel.text(50, 120, "Appuyez sur 2 pour l'equipe B", pyxel.COLOR_RED)
         else:
+            positions, players, score = self.view()
+            camera = self.camera
+            camera.follow(*positions[0])
+            pyxel.camera(camera.x, camera.y)
             self.draw_field()
-            self.ball.draw()
-            self.teams['A'].draw_players()
-            self.teams['B'].draw_players()
-            score_text = f"Équipe A: {self.score['A']}   Équipe B: {self.score['B']}"
-            pyxel.text(SCREEN_WIDTH // 2 - 40, 10, score_text, pyxel.COLOR_YELLOW)
+            if camera.visible(*positions[0], SPRITE_CENTER):
+                self.draw_ball(*positions[0])
+            for player, (x, y) in zip(players, positions[1:]):
+                if camera.visible(x, y, SPRITE_CENTER):
+                    self.draw_player(player, x, y)
+            # Le HUD reste fixe à l'écran
+            pyxel.camera()
+            self.score_widget.update(score)
+            self.score_widget.draw(SCREEN_WIDTH // 2 - 40, 10)
+            if self.goal_display_timer > 0:
+                self.goal_widget.draw(SCREEN_WIDTH // 2 - 8, SCREEN_HEIGHT // 2 - 10)
+        if self.profiler is not None:
+            self.profiler.draw_overlay(self.hud)
+
+def install_profiler(profiler):
+    """
+    Chronomètre les manettes, la sélection, les joueurs, la balle et le dessin.
+
+    Avec la simulation dans son thread, sélection, joueurs et balle sont
+    comptés dans l'image où le pas est remis (Game.profiled_step).
+    """
+    profiler.wrap(InputMixer, 'poll', 'InputMixer.poll')
+    profiler.wrap(Team, 'update_selection', 'Team.update_selection')
+    profiler.wrap(Player, 'update', 'Player.update')
+    profiler.wrap(Ball, 'update', 'Ball.update')
+    profiler.wrap(Game, 'draw', 'Game.draw')
+
+def parse_address(text):
+    host, port = text.rsplit(':', 1)
+    return host, int(port)
 
 def main():
-    Game()
+    # python V8.py                                -> nouveau match (enregistré dans replays/)
+    # python V8.py match.frpl                     -> relecture (flèches gauche / droite : -30 s / +30 s)
+    # python V8.py --net A 7000 192.168.1.20:7000 -> match en réseau, on joue l'équipe A
+    parser = argparse.ArgumentParser(description="Pyxel Football")
+    parser.add_argument('replay', nargs='?', help="fichier .frpl à relire")
+    parser.add_argument('--net', nargs=3, metavar=('EQUIPE', 'PORT', 'HOTE:PORT'),
+                        help="jeu en réseau avec rollback")
+    parser.add_argument('--curve', action='append', default=[], metavar='[GUID=]COURBE',
+                        help="courbe du stick (" + ", ".join(sorted(STICK_CURVES)) + ") de la manette GUID "
+                             "(affiché au branchement), ou de toutes ; répétable")
+    parser.add_argument('--players', type=int, default=4,
+                        help="joueurs par équipe ; au-delà de 4, terrain plus grand que l'écran")
+    parser.add_argument('--no-keepers', dest='keepers', action='store_false',
+                        help="pas de gardien (en réseau, les deux machines doivent avoir le même réglage)")
+    ai_choices = [BUILTIN_AI] + sorted(POLICIES)
+    parser.add_argument('--ai-a', choices=ai_choices, default=BUILTIN_AI,
+                        help="IA des joueurs non contrôlés de l'équipe A (en réseau, même réglage des deux côtés)")
+    parser.add_argument('--ai-b', choices=ai_choices, default=BUILTIN_AI,
+                        help="IA des joueurs non contrôlés de l'équipe B")
+    parser.add_argument('--sim-thread', action='store_true',
+                        help="match local : simulation dans un thread séparé de l'affichage")
+    parser.add_argument('--joy-thread', action='store_true',
+                        help="lit les événements manette dans un thread (ouverture des manettes hors de l'image)")
+    parser.add_argument('--profile', action='store_true', help="affiche les temps par sous-système")
+    parser.add_argument('--profile-csv', metavar='FICHIER', help="écrit les temps de chaque image en CSV")
+    args = parser.parse_args()
+    for choice in args.curve:
+        guid, _, name = choice.rpartition('=')
+        if name not in STICK_CURVES:
+            parser.error(f"courbe inconnue : {name}")
+        CONTROLLERS.set_curve(STICK_CURVES[name], guid or None)
+    CONTROLLERS.start(args.joy_thread)
+    profiler = None
+    if args.profile or args.profile_csv:
+        profiler = FrameProfiler(csv_path=args.profile_csv)
+        install_profiler(profiler)
+        atexit.register(profiler.close)
+    net = None
+    if args.net:
+        team, port, remote = args.net
+        net = (team.upper(), int(port), parse_address(remote))
+    Game(args.replay, net, profiler, args.sim_thread, args.players, args.keepers,
+         {'A': args.ai_a, 'B': args.ai_b})
 
 if __name__ == "__main__":
-    main()
+    main()
\ No newline at end of file
@@ -0,0 +1,52 @@
+import math
+
+from inputs import STICK_MAX
+
+# =============================================================================
+# STICKS ANALOGIQUES ET COURBES DE RÉPONSE
+# =============================================================================
+# Un stick donne un vecteur (x, y) dans le disque unité. On applique une zone
+# morte radiale (sur la longueur du vecteur, pas axe par axe : les diagonales
+# ne sont plus favorisées) puis une courbe de réponse, et on arrondit le
+# résultat à un entier entre -STICK_MAX et STICK_MAX. Ce sont ces entiers que
+# la simulation reçoit (clés "A_STICK_X", ...) et que les replays
+# enregistrent : la simulation reste déterministe.
+#
+# La courbe est précalculée dans une table de LUT_SIZE entrées indexée par la
+# longueur du vecteur : à chaque image, il ne reste qu'une lecture de table.
+
+LUT_SIZE = 256
+
+class StickCurve:
+    """
+    Zone morte radiale et courbe de réponse d'un stick.
+
+    deadzone : longueur en dessous de laquelle le stick est au repos
+    outer    : longueur à partir de laquelle on est à fond (sticks usés)
+    exponent : 1 = linéaire, > 1 = plus précis au centre, < 1 = plus nerveux
+    """
+
+    def __init__(self, deadzone=0.2, outer=0.95, exponent=1.0, size=LUT_SIZE):
+        self.size = size
+        self.lut = []
+        for i in range(size):
+            length = i / (size - 1)
+            if length <= deadzone:
+                self.lut.append(0)
+            else:
+                t = min(1.0, (length - deadzone) / (outer - deadzone))
+                self.lut.append(round(STICK_MAX * t ** exponent))
+
+    def apply(self, x, y):
+        """Vecteur quantifié (entiers dans [-STICK_MAX, STICK_MAX]) pour les axes bruts x, y."""
+        length = math.hypot(x, y)
+        level = self.lut[min(int(length * (self.size - 1)), self.size - 1)]
+        if level == 0:
+            return 0, 0
+        return round(x / length * level), round(y / length * level)
+
+STICK_CURVES = {
+    'linear':  StickCurve(),
+    'precise': StickCurve(exponent=2.0),
+    'fast':    StickCurve(exponent=0.5),
+}
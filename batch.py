@@ -0,0 +1,360 @@
+import time
+
+import numpy as np
+
+from simulation import (
+    BALL_SPEED, PLAYER_SPEED, FRICTION, BALL_STOP_SPEED, BALL_RADIUS, PLAYER_RADIUS, FIELD_MARGIN, KICK_SHOOT, KICK_PASS, lineup, pitch_for,
+)
+from intercept import intercept as ball_intercept, line_crossing
+from policy import observe_batch
+
+# =============================================================================
+# SIMULATION DE N MATCHS EN PARALLÈLE (IA CONTRE IA)
+# =============================================================================
+# BatchSimulator fait avancer des centaines de matchs indépendants en même
+# temps. Chaque tableau a une ligne par match et une colonne par joueur : la
+# boucle ne parcourt que les joueurs (dans l'ordre de Simulation), et chaque
+# itération traite tous les matchs d'un coup. Le résultat de chaque match est
+# donc exactement celui du modèle objet (Ball.update / Player.ai_behavior),
+# sans un graphe d'objets Python par match.
+#
+# Chaque match a son propre score, sa propre remise en jeu et sa propre graine
+# aléatoire. PLAYER_SPEED, FRICTION et BALL_SPEED peuvent être donnés par match
+# pour régler ces constantes sur un tournoi entier.
+#
+# Une équipe peut être jouée par une politique (policy.py) au lieu des règles
+# de ai_behavior : elle est évaluée une fois par image pour tous les matchs.
+
+KICKOFF_JITTER = 3.0   # Décalage aléatoire maximal des joueurs à la remise en jeu
+
+TOUCH_DISTANCE = PLAYER_RADIUS + BALL_RADIUS
+
+def per_match(value, count):
+    """Transforme un réglage (nombre ou liste) en tableau d'une valeur par match."""
+    return np.broadcast_to(np.asarray(value, dtype=np.float64), (count,)).copy()
+
+class BatchSimulator:
+    """
+    count matchs IA contre IA avancés ensemble par step().
+
+    seeds donne une graine par match (par défaut 0..count-1) : deux matchs de
+    même graine et mêmes réglages se déroulent à l'identique, quel que soit
+    le lot dans lequel ils tournent. Tous les matchs se jouent sur le même
+    terrain (par défaut pitch_for(players_per_side), comme Simulation).
+    policies : {équipe ('A' / 'B'): policy.Policy} et keepers (un gardien
+    par équipe), comme pour Simulation.
+    """
+
+    def __init__(self, count, seeds=None, players_per_side=4, player_speed=PLAYER_SPEED,
+                 ball_speed=BALL_SPEED, friction=FRICTION, kickoff_jitter=KICKOFF_JITTER, pitch=None,
+                 policies=None, keepers=False):
+        if seeds is None:
+            seeds = range(count)
+        seeds = list(seeds)
+        if len(seeds) != count:
+            raise ValueError("Il faut une graine par match")
+        self.count = count
+        self.seeds = seeds
+        self.rngs = [np.random.default_rng(seed) for seed in seeds]
+        self.player_speed = per_match(player_speed, count)
+        self.ball_speed = per_match(ball_speed, count)
+        self.friction = per_match(friction, count)
+        self.kickoff_jitter = kickoff_jitter
+        policies = policies or {}
+        self.policies = tuple(policies.get(team) for team in ('A', 'B'))
+        self.actions = [None, None]    # Actions de l'image en cours, par équipe
+
+        pitch = self.pitch = pitch or pitch_for(players_per_side)
+        self.goal_top, self.goal_bottom = pitch.goal_top, pitch.goal_bottom
+        self.min_x, self.max_x = pitch.min_x, pitch.max_x
+        self.min_y, self.max_y = pitch.min_y, pitch.max_y
+        # Par équipe (0 = A, 1 = B) : ligne d'attaque, but visé, position du gardien
+        self.attack_x, self.shot_x, self.keeper_x = pitch.attack_x, pitch.shot_x, pitch.keeper_x
+        self.goal_y = pitch.center_y     # Hauteur visée par les tirs (centre du but)
+
+        positions_a, keeper_a = lineup('A', players_per_side, pitch, keepers)
+        positions_b, keeper_b = lineup('B', players_per_side, pitch, keepers)
+        positions = positions_a + positions_b
+        n = len(positions)
+        self.players = n
+        self.team = np.array([0] * players_per_side + [1] * players_per_side, dtype=np.int8)
+        self.team_slices = (slice(0, players_per_side), slice(players_per_side, n))
+        self.is_keeper = np.zeros(n, dtype=bool)
+        if keepers:
+            self.is_keeper[[keeper_a, players_per_side + keeper_b]] = True
+        self.default_x = np.tile(np.array([p[0] for p in positions], dtype=np.float64), (count, 1))
+        self.default_y = np.tile(np.array([p[1] for p in positions], dtype=np.float64), (count, 1))
+        self.x = self.default_x.copy()
+        self.y = self.default_y.copy()
+        self.has_ball = np.zeros((count, n), dtype=bool)
+
+        self.ball_x = np.empty(count)
+        self.ball_y = np.empty(count)
+        self.ball_vx = np.empty(count)
+        self.ball_vy = np.empty(count)
+        self.in_pass = np.empty(count, dtype=bool)
+        self.receiver = np.empty(count, dtype=np.int64)
+        self.cooldown = np.empty(count, dtype=np.int64)
+
+        # Statistiques par match et par équipe
+        self.scores = np.zeros((count, 2), dtype=np.int64)
+        self.shots = np.zeros((count, 2), dtype=np.int64)
+        self.possession = np.zeros((count, 2), dtype=np.int64)
+        self.frame = 0
+
+        self.reset_positions(np.ones(count, dtype=bool))
+
+    def score(self, m):
+        """Score du match m, au même format que Simulation.score."""
+        return {'A': int(self.scores[m, 0]), 'B': int(self.scores[m, 1])}
+
+    def reset_positions(self, mask):
+        """Remise en jeu (Game.reset_positions) des matchs sélectionnés par mask."""
+        self.ball_x[mask] = self.pitch.center_x
+        self.ball_y[mask] = self.pitch.center_y
+        self.ball_vx[mask] = 0.0
+        self.ball_vy[mask] = 0.0
+        self.in_pass[mask] = False
+        self.receiver[mask] = -1
+        self.cooldown[mask] = 0
+        self.x[mask] = self.default_x[mask]
+        self.y[mask] = self.default_y[mask]
+        if self.kickoff_jitter > 0:
+            # Les remises en jeu sont rares : une boucle Python par match suffit
+            j = self.kickoff_jitter
+            for m in np.flatnonzero(mask):
+                rng = self.rngs[m]
+                self.x[m] += rng.uniform(-j, j, self.players)
+                self.y[m] += rng.uniform(-j, j, self.players)
+
+    # -------------------------------------------------------------------------
+    # Boucle principale
+    # -------------------------------------------------------------------------
+    def step(self):
+        """Avance tous les matchs d'une image."""
+        for t, policy in enumerate(self.policies):
+            if policy is not None:
+                self.actions[t] = policy.act(observe_batch(self, t))
+        for p in range(self.players):
+            self.update_player(p)
+        self.update_ball()
+        for t in (0, 1):
+            self.possession[:, t] += self.has_ball[:, self.team_slices[t]].any(axis=1)
+        self.frame += 1
+
+    def run(self, frames):
+        for _ in range(frames):
+            self.step()
+
+    def update_player(self, p):
+        """Player.update du joueur p, pour tous les matchs à la fois."""
+        t = int(self.team[p])
+        x = self.x[:, p]
+        y = self.y[:, p]
+
+        # --- check_ball_collision ---
+        allowed = (self.cooldown <= 0) | (self.receiver == p)
+        touch = allowed & (np.hypot(x - self.ball_x, y - self.ball_y) < TOUCH_DISTANCE)
+        passing = self.in_pass & (self.receiver >= 0)
+        receiver_team = self.team[np.maximum(self.receiver, 0)]
+        intercept = touch & passing & ((self.receiver == p) | (receiver_team != t))
+        gain = intercept | (touch & ~passing)
+        self.has_ball[:, p] = gain
+        self.in_pass[intercept] = False
+        self.receiver[intercept] = -1
+        self.ball_vx[gain] = 0.0
+        self.ball_vy[gain] = 0.0
+
+        step = self.player_speed * 0.6
+        if self.policies[t] is not None:
+            # --- follow_action ---
+            actions = self.actions[t]
+            kick = actions.kick[:, p]
+            shooters = gain & (kick == KICK_SHOOT)
+            if shooters.any():
+                self.shoot(p, t, shooters)
+            passers = gain & (kick == KICK_PASS)
+            if passers.any():
+                if actions.pass_to is None:
+                    self.pass_ball(p, t, passers)
+                else:
+                    aim_x = None if actions.pass_x is None else actions.pass_x[passers, p]
+                    aim_y = None if actions.pass_y is None else actions.pass_y[passers, p]
+                    self.pass_ball(p, t, passers, actions.pass_to[passers, p], aim_x, aim_y)
+            self.move(p, actions.target_x[:, p], actions.target_y[:, p], step, stop=True)
+            return
+
+        if self.is_keeper[p]:
+            # --- keeper_behavior ---
+            if gain.any():
+                self.distribute(p, t, gain)
+            line_x = self.keeper_x[t]
+            crossing, arrives = line_crossing(self.ball_x, self.ball_y, self.ball_vx, self.ball_vy,
+                                              line_x, self.friction)
+            target_x = np.full(self.count, float(line_x))
+            target_y = np.clip(np.where(arrives, crossing, self.ball_y), self.goal_top, self.goal_bottom)
+            # Tir cadré qu'il touche avant la ligne (et après le délai de la frappe) : il va au-devant
+            shot = arrives & (crossing >= self.goal_top) & (crossing <= self.goal_bottom)
+            if shot.any():
+                frames, meet_x, meet_y = ball_intercept(self.ball_x, self.ball_y, self.ball_vx, self.ball_vy,
+                                                        x[:, None], y[:, None], step=step[:, None],
+                                                        friction=self.friction[:, None])
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    line_frames = (np.log(1.0 - (line_x - self.ball_x) * (1.0 - self.friction) / self.ball_vx)
+                                   / np.log(self.friction))
+                frames = frames[:, 0]
+                save = shot & (self.cooldown <= frames) & (frames <= line_frames)
+                target_x = np.where(save, meet_x[:, 0], target_x)
+                target_y = np.where(save, meet_y[:, 0], target_y)
+            self.move(p, target_x, target_y, step, stop=True)
+            return
+
+        # --- ai_behavior ---
+        possession = self.has_ball[:, self.team_slices[t]].any(axis=1)
+        target_x = np.where(possession, self.attack_x[t], self.default_x[:, p])
+        target_y = np.where(possession, y, self.default_y[:, p])
+        self.move(p, target_x, target_y, step)
+
+    def move(self, p, target_x, target_y, step, stop=False):
+        """Pas de l'IA du joueur p vers la cible (Player.move_towards), bornage et balle au pied."""
+        x = self.x[:, p]
+        y = self.y[:, p]
+        dx = target_x - x
+        dy = target_y - y
+        d = np.hypot(dx, dy)
+        moving = d > 0
+        safe_d = np.where(moving, d, 1.0)
+        x += np.where(moving, dx / safe_d, 1.0) * step
+        y += np.where(moving, dy / safe_d, 0.0) * step
+        if stop:
+            # Player.move_towards(stop=True) : arrêt sur la cible au lieu de la dépasser
+            arrived = d < step
+            np.copyto(x, target_x, where=arrived)
+            np.copyto(y, target_y, where=arrived)
+        np.clip(x, self.min_x, self.max_x, out=x)
+        np.clip(y, self.min_y, self.max_y, out=y)
+
+        # --- la balle suit son porteur ---
+        holder = self.has_ball[:, p]
+        self.ball_x[holder] = x[holder]
+        self.ball_y[holder] = y[holder]
+        self.ball_vx[holder] = 0.0
+        self.ball_vy[holder] = 0.0
+
+    def shoot(self, p, t, mask):
+        """Player.shoot_ball du joueur p dans les matchs sélectionnés."""
+        dx = self.shot_x[t] - self.x[:, p]
+        dy = self.goal_y - self.y[:, p]
+        d = np.hypot(dx, dy)
+        # Comme Player.shoot_ball : pas de tir depuis le point visé lui-même
+        mask = mask & (d != 0)
+        dx, dy, d = dx[mask], dy[mask], d[mask]
+        speed = self.ball_speed[mask] * 1.5
+        self.ball_vx[mask] = dx / d * speed
+        self.ball_vy[mask] = dy / d * speed
+        self.in_pass[mask] = True
+        self.receiver[mask] = -1
+        self.cooldown[mask] = 10
+        self.has_ball[mask, p] = False
+        self.shots[mask, t] += 1
+
+    def pass_ball(self, p, t, mask, receiver=None, aim_x=None, aim_y=None):
+        """
+        Player.pass_ball du joueur p dans les matchs sélectionnés : vers
+        receiver (un indice de joueur par match sélectionné, -1 = le plus
+        proche) et le point aim_x, aim_y (par défaut, sa position).
+        """
+        mates = np.arange(self.players)[self.team_slices[t]]
+        mates = mates[mates != p]
+        if len(mates) == 0:
+            return
+        dx = self.x[mask][:, mates] - self.x[mask, p][:, None]
+        dy = self.y[mask][:, mates] - self.y[mask, p][:, None]
+        d = np.hypot(dx, dy)
+        best = np.argmin(d, axis=1)
+        rows = np.arange(len(best))
+        nearest = mates[best]
+        dx, dy, d = dx[rows, best], dy[rows, best], d[rows, best]
+        if receiver is None:
+            receiver = nearest
+        else:
+            aimed = receiver >= 0
+            receiver = np.where(aimed, receiver, nearest)
+            if aim_x is None:
+                aim_x = self.x[mask][rows, receiver]
+                aim_y = self.y[mask][rows, receiver]
+            dx = np.where(aimed, aim_x - self.x[mask, p], dx)
+            dy = np.where(aimed, aim_y - self.y[mask, p], dy)
+            d = np.hypot(dx, dy)
+        safe_d = np.where(d > 0, d, 1.0)
+        speed = self.ball_speed[mask]
+        self.ball_vx[mask] = np.where(d > 0, dx / safe_d * speed * 1.2, self.ball_vx[mask])
+        self.ball_vy[mask] = np.where(d > 0, dy / safe_d * speed * 1.2, self.ball_vy[mask])
+        self.in_pass[mask] = True
+        self.receiver[mask] = receiver
+        self.cooldown[mask] = 10
+        self.has_ball[mask, p] = False
+
+    def distribute(self, p, t, mask):
+        """Player.distribute du gardien p : passe au coéquipier le plus éloigné de tout adversaire."""
+        mates = np.arange(self.players)[self.team_slices[t]]
+        mates = mates[mates != p]
+        if len(mates) == 0:
+            return
+        rivals = np.arange(self.players)[self.team_slices[1 - t]]
+        x = self.x[mask]
+        y = self.y[mask]
+        gap = np.hypot(x[:, None, rivals] - x[:, mates, None], y[:, None, rivals] - y[:, mates, None]).min(axis=2)
+        self.pass_ball(p, t, mask, mates[np.argmax(gap, axis=1)])
+
+    def update_ball(self):
+        """Ball.update pour tous les matchs."""
+        self.ball_x += self.ball_vx
+        self.ball_y += self.ball_vy
+        self.ball_vx *= self.friction
+        self.ball_vy *= self.friction
+        self.cooldown[self.cooldown > 0] -= 1
+        stopped = (np.abs(self.ball_vx) < BALL_STOP_SPEED) & (np.abs(self.ball_vy) < BALL_STOP_SPEED)
+        self.ball_vx[stopped] = 0.0
+        self.ball_vy[stopped] = 0.0
+        self.in_pass[stopped] = False
+        self.receiver[stopped] = -1
+
+        in_goal = (self.goal_top <= self.ball_y) & (self.ball_y <= self.goal_bottom)
+        left = self.ball_x - BALL_RADIUS < 0
+        goal_b = left & in_goal
+        bounce = left & ~in_goal
+        self.ball_vx[bounce] = np.abs(self.ball_vx[bounce]) * 0.7
+        self.ball_x[bounce] = BALL_RADIUS
+        right = (self.ball_x + BALL_RADIUS > self.pitch.width) & ~goal_b
+        goal_a = right & in_goal
+        bounce = right & ~in_goal
+        self.ball_vx[bounce] = -np.abs(self.ball_vx[bounce]) * 0.7
+        self.ball_x[bounce] = self.pitch.width - BALL_RADIUS
+        top = self.ball_y - BALL_RADIUS < FIELD_MARGIN
+        self.ball_vy[top] = np.abs(self.ball_vy[top]) * 0.7
+        self.ball_y[top] = BALL_RADIUS + FIELD_MARGIN
+        bottom = self.ball_y + BALL_RADIUS > self.pitch.height - FIELD_MARGIN
+        self.ball_vy[bottom] = -np.abs(self.ball_vy[bottom]) * 0.7
+        self.ball_y[bottom] = self.pitch.height - BALL_RADIUS - FIELD_MARGIN
+
+        self.scores[:, 1] += goal_b
+        self.scores[:, 0] += goal_a
+        goals = goal_a | goal_b
+        if goals.any():
+            self.reset_positions(goals)
+
+def main():
+    # Banc d'essai : 500 matchs de 2 minutes (à 30 images par seconde)
+    matches = 500
+    frames = 3600
+    batch = BatchSimulator(matches)
+    start = time.perf_counter()
+    batch.run(frames)
+    elapsed = time.perf_counter() - start
+    print(f"{matches} matchs x {frames} images en {elapsed:.2f} s "
+          f"({matches * frames / elapsed:.0f} images-match/s)")
+    print("Buts A / B :", batch.scores.sum(axis=0), "| tirs A / B :", batch.shots.sum(axis=0))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+from analog import STICK_CURVES
+from inputs import SEATS, pack, pack_sticks, seat
+from joystick import DEVICE_ADDED, JoystickEvents
+
+# =============================================================================
+# GESTION DE N MANETTES BRANCHÉES À CHAUD
+# =============================================================================
+# Chaque manette reçoit une place (équipe, numéro) dès qu'elle est branchée,
+# en alternant les équipes : A0, B0, A1, B1... Au-delà de SLOTS_PER_TEAM
+# places par équipe, les manettes en trop attendent qu'une place se libère.
+# Une manette débranchée libère sa place ; rebranchée, elle la retrouve si
+# personne ne l'a prise entre-temps (on la reconnaît à son GUID).
+#
+# Chaque manette a sa courbe de stick (analog.py), retenue elle aussi par
+# GUID : elle la garde quelle que soit sa place.
+#
+# Chaque place est une place de joueur humain de la simulation (inputs.SEATS) :
+# la manette A0 remplit les clés "A_...", A1 les clés "A2_...". À 2 contre 2,
+# chaque coéquipier déplace son propre joueur et en change avec SELECT.
+# Le nombre de places jouées est fixé au début du match (seats()) : une
+# manette branchée ensuite sur une place sans joueur attend le match suivant.
+
+TEAMS = ('A', 'B')
+SLOTS_PER_TEAM = 2
+
+class ControllerManager:
+    def __init__(self, slots_per_team=SLOTS_PER_TEAM, curve=STICK_CURVES['linear']):
+        if slots_per_team > len(SEATS) // len(TEAMS):
+            raise ValueError(f"Au plus {len(SEATS) // len(TEAMS)} places par équipe (inputs.SEATS)")
+        self.events = JoystickEvents()
+        self.slots_per_team = slots_per_team
+        self.places = {}         # instance_id -> (équipe, numéro)
+        self.known = {}          # GUID -> dernière place occupée
+        self.waiting = set()     # Manettes branchées sans place libre
+        self.curve = curve       # Courbe des manettes sans courbe propre
+        self.curves = {}         # GUID -> courbe du stick (analog.StickCurve)
+
+    def start(self, threaded=False):
+        self.events.start(threaded)
+
+    def set_curve(self, curve, guid=None):
+        """Courbe du stick de la manette guid, ou de toutes celles qui n'en ont pas."""
+        if guid is None:
+            self.curve = curve
+        else:
+            self.curves[guid] = curve
+
+    def curve_for(self, pad):
+        return self.curves.get(pad.guid, self.curve)
+
+    def free_place(self, preferred=None):
+        taken = set(self.places.values())
+        if preferred is not None and preferred not in taken:
+            return preferred
+        for slot in range(self.slots_per_team):
+            for team in TEAMS:
+                if (team, slot) not in taken:
+                    return (team, slot)
+        return None
+
+    def update(self):
+        """Lit les événements de l'image et place les manettes branchées ou débranchées."""
+        devices = self.events.drain()
+        for kind, instance_id in devices:
+            if kind != DEVICE_ADDED:
+                place = self.places.pop(instance_id, None)
+                self.waiting.discard(instance_id)
+                if place is not None:
+                    print(f"Manette débranchée: équipe {place[0]}, place {place[1]}")
+        if devices:
+            # Nouvelles manettes, ou manettes en attente d'une place libérée
+            for instance_id, pad in self.events.pads.items():
+                if instance_id not in self.places:
+                    self.place(instance_id, pad)
+
+    def place(self, instance_id, pad):
+        place = self.free_place(self.known.get(pad.guid))
+        if place is None:
+            if instance_id not in self.waiting:
+                self.waiting.add(instance_id)
+                print("Manette en attente (toutes les places sont prises):", pad.name)
+            return
+        self.waiting.discard(instance_id)
+        self.places[instance_id] = place
+        self.known[pad.guid] = place
+        print(f"Manette connectée: {pad.name} ({pad.guid}) -> équipe {place[0]}, place {place[1]}")
+
+    def pad_at(self, team, slot):
+        """Manette assise à la place (team, slot), ou None."""
+        for instance_id, place in self.places.items():
+            if place == (team, slot):
+                return self.events.pads[instance_id]
+        return None
+
+    def seats(self):
+        """Joueurs humains par équipe à prévoir pour un match : 1, ou 2 si une place 1 est prise."""
+        return max([slot + 1 for _, slot in self.places.values()], default=1)
+
+    def fill(self, team, slot, state, buttons):
+        """
+        Remplit le dictionnaire d'entrées state de la place (team, slot)
+        (clés "A_LEFT", "A2_STICK_X", ...) avec la courbe de sa manette.
+        buttons associe chaque action ('PASS', 'SHOOT', 'SELECT') à un
+        bouton.
+        """
+        state.clear()
+        pad = self.pad_at(team, slot)
+        if pad is None:
+            return
+        name = seat(team, slot)
+        stick_x, stick_y = self.curve_for(pad).apply(pad.axis(0), pad.axis(1))
+        state[f"{name}_STICK_X"] = stick_x
+        state[f"{name}_STICK_Y"] = stick_y
+        state[f"{name}_LEFT"]  = (stick_x < 0)
+        state[f"{name}_RIGHT"] = (stick_x > 0)
+        state[f"{name}_UP"]    = (stick_y < 0)
+        state[f"{name}_DOWN"]  = (stick_y > 0)
+        for action, button in buttons.items():
+            state[f"{name}_{action}"] = pad.pressed(button)
+
+    def consume_taps(self):
+        self.events.consume_taps()
+
+class GamepadSource:
+    """
+    Source d'entrées (voir inputs.InputMixer) pour les manettes d'un
+    ControllerManager, une place de joueur par manette.
+    """
+
+    def __init__(self, manager, buttons):
+        self.manager = manager
+        self.buttons = buttons
+        self.states = {name: {} for name in SEATS}
+
+    def poll(self):
+        self.manager.update()
+        for slot in range(self.manager.slots_per_team):
+            for team in TEAMS:
+                self.manager.fill(team, slot, self.states[seat(team, slot)], self.buttons)
+        return pack(self.states), pack_sticks(self.states)
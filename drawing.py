@@ -0,0 +1,133 @@
+import math
+
+from simulation import (
+    SCREEN_WIDTH, SCREEN_HEIGHT, TEAM_A_COLOR, TEAM_B_COLOR, FIELD_COLOR,
+    BACKGROUND_COLOR, GOAL_COLOR, FIELD_MARGIN, GOAL_WIDTH, GOAL_HEIGHT, BALL_RADIUS, PLAYER_RADIUS,
+)
+
+# =============================================================================
+# DESSIN DU TERRAIN ET DES SPRITES
+# =============================================================================
+# Partagé par le jeu (V8.py, avec pyxel) et l'export vidéo sans fenêtre
+# (render.py, avec un Framebuffer NumPy). Les fonctions ne reçoivent qu'un
+# « canvas » qui a les primitives de pyxel (cls, rect, rectb, line, circ,
+# circb, pset) : ce module n'importe donc pas pyxel.
+
+# Indices de la palette par défaut de pyxel (pyxel.COLOR_...)
+COLOR_BLACK = 0
+COLOR_WHITE = 7
+COLOR_YELLOW = 10
+COLOR_PINK = 14
+
+# Terrain pré-dessiné une fois sur une image à sa taille (dans V8.py une
+# pyxel.Image : il peut dépasser les 256 x 256 d'une banque), puis copié d'un
+# seul blt : seule la partie visible par la caméra est copiée.
+CENTER_CIRCLE_RADIUS = 20
+PENALTY_BOX_WIDTH = 28
+PENALTY_BOX_HEIGHT = 80
+
+def paint_field(canvas, pitch):
+    """Dessine le terrain complet sur canvas (pyxel, une pyxel.Image ou un render.Framebuffer)."""
+    width = pitch.width - 2 * FIELD_MARGIN
+    height = pitch.height - 2 * FIELD_MARGIN
+    canvas.cls(BACKGROUND_COLOR)
+    canvas.rect(FIELD_MARGIN, FIELD_MARGIN, width, height, FIELD_COLOR)
+    canvas.rectb(FIELD_MARGIN, FIELD_MARGIN, width, height, COLOR_WHITE)
+    # Ligne médiane et rond central
+    canvas.line(pitch.center_x, FIELD_MARGIN, pitch.center_x, pitch.height - FIELD_MARGIN, COLOR_WHITE)
+    canvas.circb(pitch.center_x, pitch.center_y, CENTER_CIRCLE_RADIUS, COLOR_WHITE)
+    # Surfaces de réparation
+    box_top = (pitch.height - PENALTY_BOX_HEIGHT) // 2
+    canvas.rectb(FIELD_MARGIN, box_top, PENALTY_BOX_WIDTH, PENALTY_BOX_HEIGHT, COLOR_WHITE)
+    canvas.rectb(pitch.width - FIELD_MARGIN - PENALTY_BOX_WIDTH, box_top,
+                 PENALTY_BOX_WIDTH, PENALTY_BOX_HEIGHT, COLOR_WHITE)
+    # Buts
+    goal_top = pitch.goal_top
+    canvas.rect(0, goal_top, GOAL_WIDTH, GOAL_HEIGHT, GOAL_COLOR)
+    canvas.rectb(0, goal_top, GOAL_WIDTH, GOAL_HEIGHT, COLOR_BLACK)
+    canvas.rect(pitch.width - GOAL_WIDTH, goal_top, GOAL_WIDTH, GOAL_HEIGHT, GOAL_COLOR)
+    canvas.rectb(pitch.width - GOAL_WIDTH, goal_top, GOAL_WIDTH, GOAL_HEIGHT, COLOR_BLACK)
+
+# Caméra : quand le terrain est plus grand que l'écran (plus de 4 joueurs par
+# équipe, voir simulation.pitch_for), la vue suit la balle sans sortir du
+# terrain. Les positions restent en coordonnées du monde : camera() (de pyxel
+# ou du Framebuffer) décale tout le dessin, et ce qui sort de l'écran n'est pas dessiné du tout.
+CAMERA_FOLLOW = 0.15           # Part du retard rattrapée à chaque image (lissage)
+
+class Camera:
+    def __init__(self, pitch, width=SCREEN_WIDTH, height=SCREEN_HEIGHT):
+        self.width = width
+        self.height = height
+        self.max_x = max(0, pitch.width - width)
+        self.max_y = max(0, pitch.height - height)
+        self.fx = 0.0
+        self.fy = 0.0
+        self.x = 0
+        self.y = 0
+        self.center_on(pitch.center_x, pitch.center_y)
+
+    def clamp(self, fx, fy):
+        return max(0.0, min(fx, self.max_x)), max(0.0, min(fy, self.max_y))
+
+    def center_on(self, x, y):
+        """Place la vue sur (x, y) sans lissage (coup d'envoi, saut en relecture)."""
+        self.fx, self.fy = self.clamp(x - self.width / 2, y - self.height / 2)
+        self.x, self.y = round(self.fx), round(self.fy)
+
+    def follow(self, x, y):
+        tx, ty = self.clamp(x - self.width / 2, y - self.height / 2)
+        self.fx += (tx - self.fx) * CAMERA_FOLLOW
+        self.fy += (ty - self.fy) * CAMERA_FOLLOW
+        # Coin entier : pas de scintillement des sprites d'un pixel à l'autre
+        self.x, self.y = round(self.fx), round(self.fy)
+
+    def visible(self, x, y, margin=0):
+        return (self.x - margin <= x < self.x + self.width + margin and
+                self.y - margin <= y < self.y + self.height + margin)
+
+# Atlas de sprites : chaque joueur est dessiné d'un seul blt. Une ligne par
+# combinaison (équipe, contrôlé, balle au pied), une colonne par direction
+# (8 directions, tous les 45°, repérées par un pixel noir sur le bord). La
+# moitié droite de la banque reste libre pour des images d'animation.
+# La balle est sur la ligne suivante.
+SPRITE_BANK = 0
+SPRITE_CELL = 16
+SPRITE_CENTER = PLAYER_RADIUS + 2          # Centre du sprite dans sa case (anneau compris)
+SPRITE_SIZE = 2 * SPRITE_CENTER + 1
+SPRITE_COLKEY = COLOR_PINK           # Couleur transparente (absente des sprites)
+FACINGS = 8
+DEFAULT_FACING = {'A': 0, 'B': 4}          # Vers le but adverse tant que le joueur n'a pas bougé
+BALL_ROW = 8
+
+def sprite_row(team, controlled, has_ball):
+    return (0 if team == 'A' else 4) + 2 * bool(controlled) + bool(has_ball)
+
+def facing_index(player):
+    fx, fy = player.facing
+    if fx == 0 and fy == 0:
+        return DEFAULT_FACING[player.team]
+    return round(math.atan2(fy, fx) / (math.pi / 4)) % FACINGS
+
+def paint_sprites(image):
+    """Dessine l'atlas des joueurs et de la balle dans image."""
+    image.cls(SPRITE_COLKEY)
+    for team, color in (('A', TEAM_A_COLOR), ('B', TEAM_B_COLOR)):
+        for controlled in (False, True):
+            for has_ball in (False, True):
+                cy = sprite_row(team, controlled, has_ball) * SPRITE_CELL + SPRITE_CENTER
+                for facing in range(FACINGS):
+                    cx = facing * SPRITE_CELL + SPRITE_CENTER
+                    image.circ(cx, cy, PLAYER_RADIUS, color)
+                    if controlled:
+                        image.circb(cx, cy, PLAYER_RADIUS + 2, COLOR_YELLOW)
+                    if has_ball:
+                        image.circ(cx, cy, PLAYER_RADIUS - 2, COLOR_WHITE)
+                    angle = facing * math.pi / 4
+                    image.pset(cx + round(math.cos(angle) * (PLAYER_RADIUS - 1)),
+                               cy + round(math.sin(angle) * (PLAYER_RADIUS - 1)), COLOR_BLACK)
+    image.circ(SPRITE_CENTER, BALL_ROW * SPRITE_CELL + SPRITE_CENTER, BALL_RADIUS, COLOR_WHITE)
+
+def player_sprite(player):
+    """Coin (u, v) dans l'atlas du sprite de player (PlayerView ou Player)."""
+    return (facing_index(player) * SPRITE_CELL,
+            sprite_row(player.team, player.controlled, player.has_ball) * SPRITE_CELL)
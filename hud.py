@@ -0,0 +1,55 @@
+import pyxel
+
+# =============================================================================
+# TEXTES DU HUD MIS EN CACHE
+# =============================================================================
+# pyxel.text redessine chaque caractère à chaque image. Un TextWidget garde
+# son texte déjà dessiné dans une bande de la banque d'images HUD_BANK et ne
+# le redessine que lorsque sa valeur change. À chaque image, il ne reste
+# qu'un blt. Le texte n'est même pas reformaté tant que la valeur est la même
+# (score, bannière de but, lignes du profiler...).
+
+HUD_BANK = 1
+LINE_HEIGHT = 8              # Police pyxel : 6 px de haut, plus une marge
+CHAR_WIDTH = 4
+HUD_COLKEY = pyxel.COLOR_PINK
+
+class HudLayer:
+    """Répartit les bandes de la banque HUD_BANK entre les widgets."""
+
+    def __init__(self, bank=HUD_BANK):
+        self.bank = bank
+        self.image = pyxel.images[bank]
+        self.next_row = 0
+
+    def widget(self, color, fmt=str):
+        """Nouveau TextWidget ; fmt transforme la valeur en texte."""
+        row = self.next_row
+        if row + LINE_HEIGHT > self.image.height:
+            raise ValueError("Plus de place dans la banque du HUD")
+        self.next_row += LINE_HEIGHT
+        return TextWidget(self, row, color, fmt)
+
+class TextWidget:
+    def __init__(self, layer, row, color, fmt=str):
+        self.layer = layer
+        self.row = row
+        self.color = color
+        self.fmt = fmt
+        self.value = None
+        self.width = 0
+
+    def update(self, value):
+        """Change la valeur affichée ; le texte n'est redessiné que si elle a changé."""
+        if value == self.value:
+            return
+        self.value = value
+        text = self.fmt(value)
+        image = self.layer.image
+        image.rect(0, self.row, image.width, LINE_HEIGHT, HUD_COLKEY)
+        image.text(0, self.row, text, self.color)
+        self.width = min(len(text) * CHAR_WIDTH, image.width)
+
+    def draw(self, x, y):
+        if self.width:
+            pyxel.blt(x, y, self.layer.bank, 0, self.row, self.width, LINE_HEIGHT, HUD_COLKEY)
@@ -0,0 +1,152 @@
+import math
+
+import numpy as np
+
+from simulation import FIELD_MARGIN
+
+# =============================================================================
+# CARTES D'INFLUENCE POUR LE PLACEMENT DE L'IA
+# =============================================================================
+# Le terrain est découpé en cases de INFLUENCE_CELL pixels. Chaque joueur
+# « rayonne » autour de sa case : un noyau entier de rayon INFLUENCE_SPREAD
+# cases, ajouté à la carte de son équipe. On en déduit pour chaque équipe :
+#   - l'espace libre : influence de l'équipe moins celle de l'adversaire
+#     (lignes de passe ouvertes quand c'est positif) ;
+#   - le danger : influence adverse (pression sur le porteur, zones à couper) ;
+#   - la menace : proximité du but adverse, fixe, calculée une fois.
+#
+# Mise à jour incrémentale : seuls les joueurs qui ont changé de case depuis
+# l'image précédente retirent leur ancien noyau et posent le nouveau (à 2 m/s,
+# un joueur change de case environ une image sur huit). Les valeurs sont
+# entières, donc les ajouts et retraits successifs ne dérivent pas.
+#
+# Après une mise à jour, best_cells() calcule en quelques passes NumPy, pour
+# chaque case, la meilleure case de son voisinage selon un score ; seuls les
+# matchs marqués dans dirty sont recalculés. Un joueur IA lit ensuite sa cible
+# en O(1) : meilleure case autour de sa case de départ.
+#
+# Les cartes ont une première dimension par match (comme policy.Observation),
+# pour servir aussi bien Simulation que BatchSimulator.
+
+INFLUENCE_CELL = 16
+INFLUENCE_SPREAD = 3     # Rayon du noyau, en cases
+TARGET_REACH = 2         # Rayon (en cases) du voisinage où un joueur cherche sa cible
+
+def influence_kernel(spread=INFLUENCE_SPREAD):
+    """Décalages (dy, dx) et poids entiers (spread + 1 au centre, décroissants) du noyau."""
+    offsets = []
+    weights = []
+    for dy in range(-spread, spread + 1):
+        for dx in range(-spread, spread + 1):
+            weight = spread + 1 - round(math.hypot(dx, dy))
+            if weight > 0:
+                offsets.append((dy, dx))
+                weights.append(weight)
+    offsets = np.array(offsets, dtype=np.int64)
+    return offsets[:, 0], offsets[:, 1], np.array(weights, dtype=np.int32)
+
+class InfluenceMap:
+    """Influence de chaque équipe sur une grille grossière, pour matches matchs."""
+
+    def __init__(self, pitch, matches, team, cell=INFLUENCE_CELL, spread=INFLUENCE_SPREAD):
+        self.pitch = pitch
+        self.matches = matches
+        self.team = np.asarray(team, dtype=np.int64)    # Équipe (0 / 1) de chaque joueur
+        self.cell = cell
+        self.cols = max(1, math.ceil(pitch.width / cell))
+        self.rows = max(1, math.ceil(pitch.height / cell))
+        self.pad = spread
+        self.kernel_dy, self.kernel_dx, self.kernel = influence_kernel(spread)
+        # Bordure de spread cases : un noyau posé au bord ne sort jamais du tableau
+        self.grid = np.zeros((matches, 2, self.rows + 2 * spread, self.cols + 2 * spread), dtype=np.int32)
+        self.influence = self.grid[:, :, spread:spread + self.rows, spread:spread + self.cols]
+        self.cells = None          # Case (indice à plat) de chaque joueur à la dernière mise à jour
+        self.dirty = np.ones(matches, dtype=bool)   # Matchs dont une case a changé à la dernière mise à jour
+        # Centres des cases en pixels, et menace (proximité du but visé) par équipe
+        self.center_x = (np.arange(self.cols) + 0.5) * cell
+        self.center_y = (np.arange(self.rows) + 0.5) * cell
+        gx, gy = np.meshgrid(self.center_x, self.center_y)
+        reach = math.hypot(pitch.width, pitch.height)
+        self.threat = np.stack([
+            1.0 - np.hypot(gx - goal_x, gy - pitch.center_y) / reach
+            for goal_x in (pitch.width - FIELD_MARGIN, FIELD_MARGIN)
+        ])
+
+    def cell_of(self, x, y):
+        """Indice à plat (ligne * cols + colonne) de la case de chaque position."""
+        col = np.clip((np.asarray(x) // self.cell).astype(np.int64), 0, self.cols - 1)
+        row = np.clip((np.asarray(y) // self.cell).astype(np.int64), 0, self.rows - 1)
+        return row * self.cols + col
+
+    def stamp(self, matches, players, cells, sign):
+        """Ajoute (sign = 1) ou retire (-1) le noyau des joueurs donnés."""
+        rows = (cells // self.cols + self.pad)[:, None] + self.kernel_dy
+        cols = (cells % self.cols + self.pad)[:, None] + self.kernel_dx
+        np.add.at(self.grid, (matches[:, None], self.team[players][:, None], rows, cols), sign * self.kernel)
+
+    def update(self, x, y):
+        """Met les cartes à jour pour les positions x, y (matchs, joueurs) et renseigne dirty."""
+        cells = self.cell_of(x, y)
+        if self.cells is None:
+            matches, players = np.indices(cells.shape).reshape(2, -1)
+            self.stamp(matches, players, cells.ravel(), 1)
+            self.dirty[:] = True
+        else:
+            moved = cells != self.cells
+            matches, players = np.nonzero(moved)
+            if len(matches):
+                self.stamp(matches, players, self.cells[matches, players], -1)
+                self.stamp(matches, players, cells[matches, players], 1)
+            self.dirty = moved.any(axis=1)
+        self.cells = cells
+
+    def space(self, side):
+        """Influence de l'équipe side moins celle de l'adversaire (matchs, lignes, colonnes)."""
+        return self.influence[:, side] - self.influence[:, 1 - side]
+
+    def danger(self, side):
+        """Influence adverse pour l'équipe side."""
+        return self.influence[:, 1 - side]
+
+    def at(self, values, cells):
+        """values (matchs, lignes, colonnes) lues aux cases cells (matchs, joueurs)."""
+        return np.take_along_axis(values.reshape(len(values), -1), cells, axis=1)
+
+    def best_cells(self, score, reach=TARGET_REACH):
+        """
+        Pour chaque case, indice à plat de la case de meilleur score dans un
+        carré de rayon reach autour d'elle (matchs, lignes * colonnes).
+
+        Le maximum sur un carré se fait en deux passes (lignes puis colonnes)
+        de 2 * reach + 1 comparaisons chacune ; à égalité, la première case
+        dans l'ordre des lignes l'emporte.
+        """
+        matches, rows, cols = score.shape
+        # Passe horizontale : meilleure colonne de chaque ligne du voisinage
+        padded = np.pad(score, ((0, 0), (0, 0), (reach, reach)), constant_values=-np.inf)
+        row_best = padded[:, :, :cols].copy()
+        row_dx = np.full(score.shape, -reach, dtype=np.int64)
+        for d in range(1, 2 * reach + 1):
+            values = padded[:, :, d:d + cols]
+            better = values > row_best
+            np.maximum(row_best, values, out=row_best)
+            np.copyto(row_dx, d - reach, where=better)
+        # Passe verticale sur les meilleurs de chaque ligne
+        padded = np.pad(row_best, ((0, 0), (reach, reach), (0, 0)), constant_values=-np.inf)
+        padded_dx = np.pad(row_dx, ((0, 0), (reach, reach), (0, 0)))
+        best = padded[:, :rows].copy()
+        best_dy = np.full(score.shape, -reach, dtype=np.int64)
+        best_dx = padded_dx[:, :rows].copy()
+        for d in range(1, 2 * reach + 1):
+            values = padded[:, d:d + rows]
+            better = values > best
+            np.maximum(best, values, out=best)
+            np.copyto(best_dy, d - reach, where=better)
+            np.copyto(best_dx, padded_dx[:, d:d + rows], where=better)
+        target_rows = np.arange(rows)[:, None] + best_dy
+        target_cols = np.arange(cols)[None, :] + best_dx
+        return (target_rows * cols + target_cols).reshape(matches, -1)
+
+    def cell_center(self, cells):
+        """Centre en pixels (x, y) des cases données."""
+        return self.center_x[cells % self.cols], self.center_y[cells // self.cols]
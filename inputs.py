@@ -0,0 +1,170 @@
+# =============================================================================
+# ENTRÉES D'UNE IMAGE SOUS FORME DE MASQUE DE BITS
+# =============================================================================
+# Les dictionnaires CONTROLLER_STATE_A / CONTROLLER_STATE_B (clés "A_LEFT",
+# "B_PASS", ...) tiennent dans un seul entier : un octet par équipe, un bit
+# par action. C'est ce format que l'on enregistre dans les replays.
+#
+# Une équipe peut avoir deux joueurs humains (une manette chacun, voir
+# controllers.py). Chaque place a son préfixe de clés (SEATS) : "A" et "B"
+# pour la première, "A2" et "B2" pour la seconde, dont les octets suivent
+# ceux de la première. Sans seconde place, le masque tient toujours sur 16 bits.
+#
+# Les sticks analogiques (clés "A_STICK_X", "A_STICK_Y", ...) sont à part :
+# des entiers entre -STICK_MAX et STICK_MAX (voir analog.py), enregistrés à
+# côté du masque, un octet signé par axe.
+
+ACTIONS = ('LEFT', 'RIGHT', 'UP', 'DOWN', 'PASS', 'SHOOT', 'SELECT')
+TEAM_SHIFT = {'A': 0, 'B': 8}
+SEAT_SHIFT = {'A': 0, 'B': 8, 'A2': 16, 'B2': 24}
+SEATS = tuple(SEAT_SHIFT)
+STICKS = ('STICK_X', 'STICK_Y')
+STICK_MAX = 127
+
+def seat(team, slot):
+    """Préfixe des clés de la place slot (0 ou 1) de l'équipe : 'A', 'A2'..."""
+    return team if slot == 0 else f"{team}{slot + 1}"
+
+def pack_team(state, team):
+    """Masque (7 bits) des actions d'une équipe (ou d'une place) à partir de son dictionnaire d'entrées."""
+    mask = 0
+    for bit, action in enumerate(ACTIONS):
+        if state.get(f"{team}_{action}", False):
+            mask |= 1 << bit
+    return mask
+
+def pack(inputs):
+    """Masque d'une image à partir de {'A': {...}, 'B': {...}} (et 'A2', 'B2' s'il y a lieu)."""
+    if not inputs:
+        return 0
+    mask = 0
+    for name, state in inputs.items():
+        mask |= pack_team(state, name) << SEAT_SHIFT[name]
+    return mask
+
+def pack_sticks(inputs):
+    """Axes des sticks d'une image : (A_STICK_X, A_STICK_Y, B_STICK_X, B_STICK_Y, A2_STICK_X...)."""
+    if not inputs:
+        return NO_STICKS
+    return tuple(int(inputs.get(name, {}).get(f"{name}_{axis}", 0))
+                 for name in SEATS for axis in STICKS)
+
+def unpack(mask, sticks=None):
+    """Inverse de pack (et de pack_sticks) : renvoie {'A': {...}, 'B': {...}, ...} avec toutes les clés."""
+    inputs = {}
+    for name, shift in SEAT_SHIFT.items():
+        bits = mask >> shift
+        inputs[name] = {f"{name}_{action}": bool(bits & (1 << bit))
+                        for bit, action in enumerate(ACTIONS)}
+    if sticks is not None:
+        values = iter(sticks)
+        for name in SEATS:
+            for axis in STICKS:
+                inputs[name][f"{name}_{axis}"] = next(values, 0)
+    return inputs
+
+# =============================================================================
+# MASQUES : BITS PAR TOUCHE ET FRONTS MONTANTS
+# =============================================================================
+# La simulation travaille directement sur les masques : une touche est un
+# bit, et les fronts montants de toutes les touches s'obtiennent d'un coup
+# avec pressed(mask, prev_mask).
+
+KEY_BITS = {f"{name}_{action}": 1 << (shift + bit)
+            for name, shift in SEAT_SHIFT.items() for bit, action in enumerate(ACTIONS)}
+STICK_INDEX = {f"{name}_{axis}": 2 * i + j
+               for i, name in enumerate(SEATS) for j, axis in enumerate(STICKS)}
+TEAM_BITS = (1 << len(ACTIONS)) - 1
+NO_STICKS = (0,) * (len(SEATS) * len(STICKS))
+
+def pressed(mask, prev_mask):
+    """Bits qui passent de 0 à 1 entre prev_mask et mask."""
+    return (mask ^ prev_mask) & mask
+
+def team_mask(mask, team):
+    """Masque 7 bits d'une équipe extrait du masque 16 bits d'une image."""
+    return (mask >> TEAM_SHIFT[team]) & TEAM_BITS
+
+def as_mask(inputs, sticks=None):
+    """(masque, sticks) d'une image donnée en dictionnaires, ou déjà en masque."""
+    if inputs is None or isinstance(inputs, int):
+        return inputs or 0, tuple(sticks) if sticks is not None else NO_STICKS
+    return pack(inputs), tuple(sticks) if sticks is not None else pack_sticks(inputs)
+
+# =============================================================================
+# SOURCES D'ENTRÉES
+# =============================================================================
+# Clavier, manettes (controllers.GamepadSource) et entrées enregistrées ou
+# scriptées ont la même interface : poll() renvoie (masque, sticks) pour
+# l'image. InputMixer les combine une fois par image.
+
+class KeyboardSource:
+    """
+    Touches du clavier. bindings associe à chaque équipe un dictionnaire
+    {action: touche} ; btn est la fonction de lecture (pyxel.btn dans V8.py).
+    """
+
+    def __init__(self, bindings, btn):
+        self.btn = btn
+        self.keys = [(KEY_BITS[f"{team}_{action}"], key)
+                     for team, actions in bindings.items() for action, key in actions.items()]
+
+    def poll(self):
+        mask = 0
+        for bit, key in self.keys:
+            if self.btn(key):
+                mask |= bit
+        return mask, NO_STICKS
+
+class ScriptedSource:
+    """Entrées fixées à l'avance : une liste de masques (et de sticks), une image par appel."""
+
+    def __init__(self, masks, sticks=None):
+        self.masks = masks
+        self.sticks = sticks
+        self.frame = 0
+
+    def poll(self):
+        if self.frame >= len(self.masks):
+            return 0, NO_STICKS
+        mask = self.masks[self.frame]
+        sticks = tuple(self.sticks[4 * self.frame:4 * self.frame + 4]) if self.sticks else NO_STICKS
+        self.frame += 1
+        return mask, sticks
+
+class InputMixer:
+    """
+    Combine plusieurs sources : les masques sont réunis (OU), et pour chaque
+    place on garde le stick le plus incliné.
+    """
+
+    def __init__(self, sources):
+        self.sources = list(sources)
+        self.mask = 0
+        self.prev_mask = 0
+        self.sticks = NO_STICKS
+
+    def poll(self):
+        """Lit toutes les sources pour l'image ; renvoie le masque combiné."""
+        mask = 0
+        sticks = list(NO_STICKS)
+        for source in self.sources:
+            source_mask, source_sticks = source.poll()
+            mask |= source_mask
+            for i in range(0, len(source_sticks), 2):
+                x, y = source_sticks[i], source_sticks[i + 1]
+                if x * x + y * y > sticks[i] * sticks[i] + sticks[i + 1] * sticks[i + 1]:
+                    sticks[i], sticks[i + 1] = x, y
+        self.prev_mask = self.mask
+        self.mask = mask
+        self.sticks = tuple(sticks)
+        return mask
+
+    @property
+    def pressed(self):
+        """Touches enfoncées depuis le poll() précédent."""
+        return pressed(self.mask, self.prev_mask)
+
+    def inputs(self):
+        """Entrées de l'image au format dictionnaire (voir unpack)."""
+        return unpack(self.mask, self.sticks)
@@ -0,0 +1,155 @@
+import numpy as np
+
+from passing import AI_STEP, TOUCH_DISTANCE
+from simulation import BALL_STOP_SPEED, FRICTION
+
+# =============================================================================
+# TEMPS D'INTERCEPTION DE LA BALLE
+# =============================================================================
+# Ball.update fait x += vx puis vx *= FRICTION : après n images, la balle a
+# parcouru v * (1 - FRICTION ** n) / (1 - FRICTION), jusqu'à ce que sa
+# vitesse passe sous BALL_STOP_SPEED (elle s'arrête net). Sa position future
+# a donc une forme close, sans simuler image par image.
+#
+# Un joueur qui avance de step par image peut toucher la balle à l'image n
+# si elle est alors à moins de step * n + TOUCH_DISTANCE de lui. intercept()
+# cherche la première image où c'est vrai, pour tous les joueurs de tous les
+# matchs en même temps :
+#   - tant que la balle va plus vite que le joueur, elle peut lui échapper
+#     après avoir été à sa portée : on teste chacune de ces images (une
+#     soixantaine au plus pour un tir) en un seul tableau ;
+#   - ensuite elle va moins vite que lui : une fois à portée, elle le reste,
+#     et une dichotomie sur les images suffit ;
+#   - si la balle s'arrête avant, le joueur la rejoint à l'arrêt.
+#
+# Les rebonds sur les bords ne sont pas prévus : un point d'interception
+# hors du terrain est à borner par l'appelant.
+
+def stop_frames(vx, vy, friction=FRICTION):
+    """Nombre d'images avant que Ball.update arrête la balle."""
+    fastest = np.maximum(np.abs(vx), np.abs(vy))
+    with np.errstate(divide='ignore'):
+        frames = np.ceil(np.log(BALL_STOP_SPEED / fastest) / np.log(friction))
+    # Même lente, une balle en mouvement avance encore d'une image
+    return np.where(fastest > 0, np.maximum(frames, 1.0), 0.0)
+
+def ball_at(bx, by, vx, vy, frames, friction=FRICTION):
+    """Position de la balle après frames images de vol libre."""
+    travel = (1.0 - friction ** frames) / (1.0 - friction)
+    return bx + vx * travel, by + vy * travel
+
+def intercept(bx, by, vx, vy, x, y, step=AI_STEP, friction=FRICTION, reach=TOUCH_DISTANCE):
+    """
+    Première image où chaque joueur peut toucher la balle, et le point où il
+    la touche.
+
+    bx, by, vx, vy : balle (matchs,) ; x, y : joueurs (matchs, joueurs) ;
+    step : déplacement des joueurs par image (nombre ou (matchs, joueurs)).
+    Renvoie (images, x, y), tableaux (matchs, joueurs).
+    """
+    bx, by, vx, vy = (np.asarray(v, dtype=np.float64)[:, None] for v in (bx, by, vx, vy))
+    step = np.broadcast_to(np.asarray(step, dtype=np.float64), np.shape(x))
+    stop = stop_frames(vx, vy, friction)
+
+    def reaches(frames):
+        ball_x, ball_y = ball_at(bx, by, vx, vy, np.minimum(frames, stop), friction)
+        return np.hypot(ball_x - x, ball_y - y) <= step * frames + reach
+
+    # Images où la balle va plus vite que le joueur : toutes testées d'un coup
+    speed = np.hypot(vx, vy)
+    with np.errstate(divide='ignore'):
+        slow = np.ceil(np.log(step / speed) / np.log(friction))
+    slow = np.clip(slow, 0.0, stop)
+    found = reaches(np.zeros_like(slow))
+    first = np.zeros_like(slow)
+    # Seuls les joueurs qui n'ont pas la balle à portée tout de suite, et
+    # qui peuvent atteindre le trajet de la balle avant qu'elle ralentisse,
+    # ont une grille d'images à tester
+    end_x, end_y = ball_at(bx, by, vx, vy, slow, friction)
+    path_x = end_x - bx
+    path_y = end_y - by
+    length = np.maximum(np.hypot(path_x, path_y), 1e-9)
+    along = np.clip(((x - bx) * path_x + (y - by) * path_y) / length, 0.0, length)
+    off_path = np.hypot(x - bx - along * path_x / length, y - by - along * path_y / length)
+    rows, cols = np.nonzero(~found & (slow > 0) & (off_path <= step * slow + reach))
+    if len(rows):
+        frames = np.arange(1, int(slow[rows, cols].max()) + 1, dtype=np.float64)
+        friction_rows = friction if np.ndim(friction) == 0 else np.broadcast_to(friction, np.shape(bx))[rows]
+        ball_x, ball_y = ball_at(bx[rows], by[rows], vx[rows], vy[rows], frames, friction_rows)
+        gap = np.hypot(ball_x - x[rows, cols, None], ball_y - y[rows, cols, None])
+        early = (gap <= step[rows, cols, None] * frames + reach) & (frames <= slow[rows, cols, None])
+        hit = early.any(axis=1)
+        found[rows, cols] = hit
+        first[rows, cols] = np.where(hit, np.argmax(early, axis=1) + 1.0, 0.0)
+
+    # Ensuite, portée acquise = portée gardée : dichotomie entre slow et stop
+    lo = slow.copy()
+    hi = np.broadcast_to(stop, lo.shape).copy()
+    before_stop = reaches(hi)
+    todo = ~found & before_stop
+    while True:
+        todo &= hi - lo > 1
+        if not todo.any():
+            break
+        mid = np.floor((lo + hi) / 2)
+        ok = reaches(mid)
+        hi = np.where(todo & ok, mid, hi)
+        lo = np.where(todo & ~ok, mid, lo)
+
+    # Balle arrêtée avant : le joueur la rejoint là où elle s'est arrêtée
+    rest_x, rest_y = ball_at(bx, by, vx, vy, stop, friction)
+    late = np.maximum(stop, np.ceil((np.hypot(rest_x - x, rest_y - y) - reach) / step))
+    frames = np.where(found, first, np.where(before_stop, hi, late))
+    meet_x, meet_y = ball_at(bx, by, vx, vy, np.minimum(frames, stop), friction)
+    return frames, meet_x, meet_y
+
+def line_crossing(bx, by, vx, vy, line_x, friction=FRICTION):
+    """
+    simulation.shot_crossing pour tous les matchs : hauteur où la balle
+    franchira la ligne x = line_x, et si elle l'atteint (tableaux (matchs,)).
+    """
+    distance = line_x - bx
+    with np.errstate(divide='ignore', invalid='ignore'):
+        remaining = 1.0 - distance * (1.0 - friction) / vx
+        crossing = by + vy * distance / vx
+        arrives = ((vx != 0) & (distance * vx > 0)
+                   & (remaining * np.maximum(np.abs(vx), np.abs(vy)) >= BALL_STOP_SPEED))
+    return np.where(arrives, crossing, by), arrives
+
+def path_gap(bx, by, vx, vy, x, y, friction=FRICTION):
+    """
+    Distance de chaque point (x, y) (matchs, joueurs) au trajet restant de la
+    balle, du point actuel à celui où elle s'arrêtera.
+    """
+    bx, by, vx, vy = (np.asarray(v, dtype=np.float64)[:, None] for v in (bx, by, vx, vy))
+    end_x, end_y = ball_at(bx, by, vx, vy, stop_frames(vx, vy, friction), friction)
+    path_x = end_x - bx
+    path_y = end_y - by
+    length = np.maximum(np.hypot(path_x, path_y), 1e-9)
+    along = np.clip(((x - bx) * path_x + (y - by) * path_y) / length, 0.0, length)
+    return np.hypot(x - bx - along * path_x / length, y - by - along * path_y / length)
+
+def intercept_runner(bx, by, vx, vy, x, y, step=AI_STEP, reach=TOUCH_DISTANCE):
+    """
+    Point où chaque joueur (matchs, joueurs) rejoint au plus tôt un porteur
+    qui court tout droit à vitesse constante (vx, vy) depuis (bx, by) (matchs,) :
+    |balle à t - joueur| = step * t + reach. Renvoie (rejoint, x, y) ; sans
+    solution (porteur plus rapide et parti), le point est la balle elle-même.
+    """
+    bx, by, vx, vy = (np.asarray(v, dtype=np.float64)[:, None] for v in (bx, by, vx, vy))
+    rx = bx - x
+    ry = by - y
+    a = vx * vx + vy * vy - step * step
+    b = 2.0 * (rx * vx + ry * vy - step * reach)
+    c = rx * rx + ry * ry - reach * reach
+    with np.errstate(divide='ignore', invalid='ignore'):
+        root = np.sqrt(b * b - 4.0 * a * c)
+        # Racines de a t² + b t + c = 0 ; a = 0 (même vitesse) : équation du premier degré
+        t1 = np.where(a != 0, (-b - root) / (2.0 * a), -c / b)
+        t2 = np.where(a != 0, (-b + root) / (2.0 * a), -c / b)
+    t1 = np.where(np.isfinite(t1) & (t1 >= 0), t1, np.inf)
+    t2 = np.where(np.isfinite(t2) & (t2 >= 0), t2, np.inf)
+    t = np.where(c <= 0, 0.0, np.minimum(t1, t2))
+    met = np.isfinite(t)
+    t = np.where(met, t, 0.0)
+    return met, bx + vx * t, by + vy * t
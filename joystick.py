@@ -0,0 +1,207 @@
+import atexit
+import threading
+import time
+
+import pygame
+
+# =============================================================================
+# LECTURE DES MANETTES PAR ÉVÉNEMENTS
+# =============================================================================
+# Au lieu d'appeler pygame.event.pump() puis get_axis / get_button à chaque
+# image, on lit les événements manette de pygame et on les range, horodatés,
+# dans un anneau (EventRing). La boucle du jeu vide l'anneau une fois par
+# image (drain) et met à jour l'état de chaque manette.
+#
+# Par défaut, drain() lit lui-même les événements, sur le thread principal :
+# SDL ne garantit la file d'événements que là (macOS et Windows en
+# particulier). Seuls les types manette sont retirés de la file, les autres
+# restent pour pyxel.
+#
+# Avec start(threaded=True), le thread principal ne fait plus que remplir la
+# file (pygame.event.pump, toujours sur le thread principal) puis réveille un
+# thread de lecture. Celui-ci retire les événements manette sans relancer
+# SDL (pump=False) et ouvre les manettes branchées : un branchement ne fait
+# plus attendre l'image en cours. En contrepartie, les événements arrivent
+# dans l'anneau pendant l'image et ne sont appliqués qu'au drain suivant.
+#
+# L'anneau n'a qu'un écrivain (le thread, ou drain) et qu'un lecteur (la
+# boucle du jeu) : chacun ne modifie que son propre indice, il n'y a donc pas
+# besoin de verrou.
+#
+# Un appui plus court qu'une image (bouton enfoncé puis relâché entre deux
+# drain) n'est pas perdu : il reste « appuyé » jusqu'à ce que la simulation
+# l'ait vu (consume_taps).
+#
+# Les branchements et débranchements (JOYDEVICEADDED / JOYDEVICEREMOVED)
+# passent par le même anneau : la manette est ouverte à la lecture de
+# l'événement, la boucle du jeu ne fait que l'enregistrer. Les manettes déjà
+# branchées au lancement arrivent aussi sous forme de JOYDEVICEADDED.
+
+RING_CAPACITY = 256          # Puissance de deux
+WAIT_TIMEOUT = 0.05          # Le thread se réveille au moins toutes les 50 ms pour vérifier stop()
+
+AXIS = 0
+BUTTON_DOWN = 1
+BUTTON_UP = 2
+DEVICE_ADDED = 3
+DEVICE_REMOVED = 4
+
+JOY_EVENTS = [pygame.JOYAXISMOTION, pygame.JOYBUTTONDOWN, pygame.JOYBUTTONUP,
+              pygame.JOYDEVICEADDED, pygame.JOYDEVICEREMOVED]
+
+class EventRing:
+    """File circulaire à un écrivain et un lecteur, sans verrou."""
+
+    def __init__(self, capacity=RING_CAPACITY):
+        self.capacity = capacity
+        self.mask = capacity - 1
+        self.slots = [None] * capacity
+        self.head = 0            # Écrit seulement par le producteur
+        self.tail = 0            # Écrit seulement par le consommateur
+        self.dropped = 0
+
+    def push(self, item):
+        if self.head - self.tail >= self.capacity:
+            self.dropped += 1
+            return False
+        self.slots[self.head & self.mask] = item
+        self.head += 1           # Publié après l'écriture de la case
+        return True
+
+    def drain(self):
+        head = self.head
+        items = [self.slots[i & self.mask] for i in range(self.tail, head)]
+        self.tail = head
+        return items
+
+class PadState:
+    """Axes et boutons d'une manette, tels que vus au dernier drain."""
+
+    def __init__(self, joystick):
+        self.joystick = joystick
+        self.instance_id = joystick.get_instance_id()
+        self.name = joystick.get_name()
+        self.guid = joystick.get_guid()
+        self.axes = [joystick.get_axis(i) for i in range(joystick.get_numaxes())]
+        self.held = [joystick.get_button(i) > 0 for i in range(joystick.get_numbuttons())]
+        self.taps = set()        # Boutons appuyés depuis le dernier consume_taps
+
+    def axis(self, index):
+        return self.axes[index] if index < len(self.axes) else 0.0
+
+    def pressed(self, button):
+        return (button < len(self.held) and self.held[button]) or button in self.taps
+
+    def apply(self, kind, index, value):
+        if kind == AXIS:
+            if index < len(self.axes):
+                self.axes[index] = value
+        elif index < len(self.held):
+            self.held[index] = kind == BUTTON_DOWN
+            if kind == BUTTON_DOWN:
+                self.taps.add(index)
+
+class JoystickEvents:
+    """Reçoit les événements manette et tient à jour un PadState par manette."""
+
+    def __init__(self, clock=time.perf_counter):
+        self.ring = EventRing()
+        self.pads = {}           # instance_id -> PadState
+        self.threaded = False
+        self.clock = clock
+        self.thread = None
+        self.running = False
+        self.pumped = threading.Event()   # La file vient d'être remplie par le thread principal
+        self.latency = 0.0       # Âge du plus vieil événement au dernier drain (secondes)
+        pygame.event.set_allowed(JOY_EVENTS)
+
+    def add(self, joystick):
+        state = PadState(joystick)
+        self.pads[state.instance_id] = state
+        return state
+
+    def pad(self, joystick):
+        return self.pads[joystick.get_instance_id()]
+
+    def start(self, threaded=False):
+        """Avec threaded, les événements sont lus par un thread (voir en tête du module)."""
+        self.threaded = threaded
+        if threaded and self.thread is None:
+            self.running = True
+            self.thread = threading.Thread(target=self.run, name="joystick-events", daemon=True)
+            self.thread.start()
+            # Avant le pygame.quit() de fin de programme (atexit appelle dans l'ordre inverse)
+            atexit.register(self.stop)
+
+    def stop(self):
+        self.running = False
+        self.pumped.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def push(self, event):
+        if event.type == pygame.JOYAXISMOTION:
+            self.ring.push((self.clock(), event.instance_id, AXIS, event.axis, event.value))
+        elif event.type == pygame.JOYBUTTONDOWN:
+            self.ring.push((self.clock(), event.instance_id, BUTTON_DOWN, event.button, 1.0))
+        elif event.type == pygame.JOYBUTTONUP:
+            self.ring.push((self.clock(), event.instance_id, BUTTON_UP, event.button, 0.0))
+        elif event.type == pygame.JOYDEVICEADDED:
+            try:
+                pad = PadState(pygame.joystick.Joystick(event.device_index))
+            except pygame.error:
+                return           # Débranchée entre-temps
+            self.ring.push((self.clock(), pad.instance_id, DEVICE_ADDED, 0, pad))
+        elif event.type == pygame.JOYDEVICEREMOVED:
+            self.ring.push((self.clock(), event.instance_id, DEVICE_REMOVED, 0, 0.0))
+
+    def run(self):
+        while self.running:
+            if not self.pumped.wait(WAIT_TIMEOUT):
+                continue
+            self.pumped.clear()
+            try:
+                # Seulement les événements manette déjà dans la file : le reste est à pyxel
+                events = pygame.event.get(JOY_EVENTS, pump=False)
+            except pygame.error:
+                # pygame a été arrêté : plus d'événements à lire
+                self.running = False
+                return
+            for event in events:
+                self.push(event)
+
+    def drain(self):
+        """
+        Applique les événements reçus depuis le dernier appel (une fois par image).
+
+        Renvoie les branchements / débranchements : liste de (DEVICE_ADDED ou
+        DEVICE_REMOVED, instance_id).
+        """
+        if self.threaded:
+            pygame.event.pump()
+            self.pumped.set()
+        else:
+            for event in pygame.event.get(JOY_EVENTS):
+                self.push(event)
+        events = self.ring.drain()
+        self.latency = self.clock() - events[0][0] if events else 0.0
+        devices = []
+        for _, instance_id, kind, index, value in events:
+            if kind == DEVICE_ADDED:
+                if instance_id not in self.pads:
+                    self.pads[instance_id] = value
+                    devices.append((kind, instance_id))
+            elif kind == DEVICE_REMOVED:
+                if self.pads.pop(instance_id, None) is not None:
+                    devices.append((kind, instance_id))
+            else:
+                pad = self.pads.get(instance_id)
+                if pad is not None:
+                    pad.apply(kind, index, value)
+        return devices
+
+    def consume_taps(self):
+        """Oublie les appuis brefs une fois que la simulation les a vus."""
+        for pad in self.pads.values():
+            pad.taps.clear()
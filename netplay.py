@@ -0,0 +1,289 @@
+import argparse
+import heapq
+import random
+import socket
+import struct
+import sys
+
+from inputs import ACTIONS, TEAM_SHIFT
+from simulation import Simulation
+from snapshot import SnapshotRing
+from timestep import SIM_DT
+
+# =============================================================================
+# JEU EN RÉSEAU AVEC ROLLBACK (STYLE GGPO)
+# =============================================================================
+# Chaque machine contrôle une équipe et fait tourner toute la simulation.
+# Les entrées locales sont envoyées en UDP avec INPUT_DELAY images d'avance.
+# Pour l'équipe distante, on prédit que le joueur garde les mêmes touches
+# que lors de sa dernière entrée connue, et on continue sans attendre. Quand
+# la vraie entrée arrive et ne correspond pas à la prédiction, on restaure
+# l'instantané de cette image (snapshot.SnapshotRing) et on resimule jusqu'à
+# l'image courante.
+#
+# Chaque paquet renvoie toutes les entrées locales que l'autre n'a pas encore
+# confirmées : un paquet perdu est rattrapé par le suivant. On ne prédit pas
+# plus de MAX_PREDICTION images d'avance ; au-delà, on attend (stall).
+#
+# Paquet (petit-boutiste) : b"FN", version, accusé (dernière image distante
+# reçue sans trou), première image, nombre d'entrées, puis un octet par image.
+#
+# Banc d'essai local : python netplay.py --latency-ms 120 --loss 0.1
+# fait jouer deux sessions l'une contre l'autre sur 127.0.0.1 et vérifie
+# qu'elles finissent dans le même état.
+#
+# Les sticks analogiques (analog.py) ne sont pas transmis : en réseau, les
+# déplacements restent en 8 directions (le masque contient leur direction).
+
+PACKET = struct.Struct("<2sBiiH")
+MAGIC = b"FN"
+VERSION = 1
+INPUT_DELAY = 2           # Images de retard volontaire sur les entrées locales
+MAX_PREDICTION = 12       # Images jouées au maximum sans entrée distante confirmée
+MAX_PACKET_INPUTS = 64
+
+# =============================================================================
+# TRANSPORT UDP
+# =============================================================================
+class UdpTransport:
+    """Socket UDP non bloquante reliée à un seul pair."""
+
+    def __init__(self, local_addr=('127.0.0.1', 0), remote_addr=None):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind(local_addr)
+        self.sock.setblocking(False)
+        self.remote_addr = remote_addr
+
+    @property
+    def address(self):
+        return self.sock.getsockname()
+
+    def send(self, data):
+        if self.remote_addr is not None:
+            self.sock.sendto(data, self.remote_addr)
+
+    def receive(self):
+        packets = []
+        while True:
+            try:
+                data, addr = self.sock.recvfrom(2048)
+            except (BlockingIOError, InterruptedError):
+                return packets
+            except ConnectionResetError:
+                # Windows signale ainsi un port distant pas encore ouvert
+                continue
+            if self.remote_addr is None:
+                self.remote_addr = addr
+            packets.append(data)
+
+    def close(self):
+        self.sock.close()
+
+class LossyTransport:
+    """
+    Enveloppe un transport pour simuler un mauvais réseau : latence, gigue
+    et pertes sont appliquées à l'envoi. clock donne le temps en secondes.
+    """
+
+    def __init__(self, transport, clock, latency=0.0, jitter=0.0, loss=0.0, seed=0):
+        self.transport = transport
+        self.clock = clock
+        self.latency = latency
+        self.jitter = jitter
+        self.loss = loss
+        self.rng = random.Random(seed)
+        self.queue = []
+        self.sequence = 0
+
+    def send(self, data):
+        if self.rng.random() < self.loss:
+            return
+        due = self.clock() + self.latency + self.rng.uniform(0.0, self.jitter)
+        heapq.heappush(self.queue, (due, self.sequence, data))
+        self.sequence += 1
+
+    def flush(self):
+        now = self.clock()
+        while self.queue and self.queue[0][0] <= now:
+            self.transport.send(heapq.heappop(self.queue)[2])
+
+    def receive(self):
+        self.flush()
+        return self.transport.receive()
+
+# =============================================================================
+# SESSION DE ROLLBACK
+# =============================================================================
+class RollbackSession:
+    """
+    Fait avancer sim pour une partie à deux machines.
+
+    local_team est l'équipe jouée ici ('A' ou 'B') ; les entrées sont des
+    masques de 7 bits (inputs.pack_team, inputs.team_mask).
+    """
+
+    def __init__(self, sim, local_team, transport, input_delay=INPUT_DELAY, max_prediction=MAX_PREDICTION):
+        self.sim = sim
+        self.local_team = local_team
+        self.remote_team = 'B' if local_team == 'A' else 'A'
+        self.transport = transport
+        self.input_delay = input_delay
+        self.max_prediction = max_prediction
+        self.ring = SnapshotRing(sim, capacity=max_prediction + 2)
+        self.local = {}           # image -> entrée locale
+        self.remote = {}          # image -> entrée distante confirmée
+        self.predicted = {}       # image -> entrée distante utilisée pour simuler
+        # Les premières images (avant le retard d'entrée) sont vides des deux côtés
+        for frame in range(input_delay):
+            self.local[frame] = 0
+            self.remote[frame] = 0
+        self.last_remote = input_delay - 1   # Dernière image distante reçue sans trou
+        self.remote_ack = input_delay - 1    # Dernière image locale confirmée par le pair
+        self.rollbacks = 0
+        self.resimulated = 0
+        self.stalls = 0
+
+    def remote_input(self, frame):
+        """Entrée distante confirmée, ou prédiction (on répète la dernière connue)."""
+        if frame in self.remote:
+            return self.remote[frame]
+        return self.remote[self.last_remote]
+
+    def frame_inputs(self, frame):
+        """Masque 16 bits de l'image (voir inputs.py)."""
+        return (self.local[frame] << TEAM_SHIFT[self.local_team]) | \
+               (self.remote_input(frame) << TEAM_SHIFT[self.remote_team])
+
+    def simulate(self, frame):
+        self.predicted[frame] = self.remote_input(frame)
+        self.sim.step(self.frame_inputs(frame))
+
+    def advance(self, local_mask):
+        """
+        Joue une image avec l'entrée locale donnée (masque 7 bits).
+
+        Renvoie False si la session attend le pair (trop d'images prédites).
+        """
+        self.poll()
+        if self.sim.frame - self.last_remote > self.max_prediction:
+            self.stalls += 1
+            self.send()
+            return False
+        self.local[self.sim.frame + self.input_delay] = local_mask
+        self.send()
+        self.ring.save(self.sim)
+        self.simulate(self.sim.frame)
+        return True
+
+    def poll(self):
+        """Lit les paquets reçus et corrige la simulation si une prédiction était fausse."""
+        rollback_to = None
+        for data in self.transport.receive():
+            if len(data) < PACKET.size:
+                continue
+            magic, version, ack, start, count = PACKET.unpack_from(data)
+            if magic != MAGIC or version != VERSION:
+                continue
+            self.remote_ack = max(self.remote_ack, ack)
+            masks = data[PACKET.size:PACKET.size + count]
+            for i, mask in enumerate(masks):
+                frame = start + i
+                if frame in self.remote or frame <= self.last_remote:
+                    continue
+                self.remote[frame] = mask
+                if frame < self.sim.frame and self.predicted.get(frame) != mask:
+                    rollback_to = frame if rollback_to is None else min(rollback_to, frame)
+            while self.last_remote + 1 in self.remote:
+                self.last_remote += 1
+        if rollback_to is not None:
+            self.rollback(rollback_to)
+        self.forget()
+
+    def rollback(self, frame):
+        """Restaure l'image frame et resimule jusqu'à l'image courante."""
+        current = self.sim.frame
+        self.ring.restore(self.sim, frame)
+        self.rollbacks += 1
+        for f in range(frame, current):
+            if f != frame:
+                self.ring.save(self.sim)
+            self.simulate(f)
+            self.resimulated += 1
+
+    def send(self):
+        last = max(self.local)
+        start = max(self.remote_ack + 1, last - MAX_PACKET_INPUTS + 1)
+        masks = bytes(self.local[f] for f in range(start, last + 1))
+        self.transport.send(PACKET.pack(MAGIC, VERSION, self.last_remote, start, len(masks)) + masks)
+
+    def forget(self):
+        """Oublie les entrées qui ne peuvent plus servir (ni renvoi, ni resimulation)."""
+        horizon = min(self.remote_ack, self.last_remote, self.sim.frame - self.max_prediction - 2)
+        for table in (self.local, self.remote, self.predicted):
+            for frame in [f for f in table if f < horizon]:
+                del table[frame]
+
+    def confirmed(self, frame):
+        """Vrai si toutes les entrées jusqu'à frame (exclue) sont connues et déjà simulées."""
+        return self.last_remote >= frame - 1 and self.sim.frame >= frame
+
+# =============================================================================
+# BANC D'ESSAI EN BOUCLE LOCALE
+# =============================================================================
+def bot_input(seed, frame):
+    """Entrée pseudo-aléatoire reproductible pour une image (7 bits)."""
+    rng = random.Random(seed * 1000003 + frame // 8)
+    return rng.getrandbits(len(ACTIONS)) & rng.getrandbits(len(ACTIONS))
+
+def run_loopback(frames=900, latency=0.1, jitter=0.02, loss=0.1, input_delay=INPUT_DELAY, seed=0):
+    """
+    Fait jouer deux sessions l'une contre l'autre sur 127.0.0.1 avec une
+    horloge virtuelle. Renvoie (sessions, états identiques ?).
+    """
+    now = [0.0]
+    clock = lambda: now[0]
+    sockets = [UdpTransport(), UdpTransport()]
+    sockets[0].remote_addr = sockets[1].address
+    sockets[1].remote_addr = sockets[0].address
+    sessions = []
+    for i, team in enumerate(('A', 'B')):
+        link = LossyTransport(sockets[i], clock, latency, jitter, loss, seed=seed * 2 + i)
+        sessions.append(RollbackSession(Simulation('A'), team, link, input_delay))
+    ticks = 0
+    while any(s.sim.frame < frames for s in sessions) or not all(s.confirmed(frames) for s in sessions):
+        for i, session in enumerate(sessions):
+            if session.sim.frame < frames:
+                session.advance(bot_input(seed * 2 + i, session.sim.frame + input_delay))
+            else:
+                # Fin du match : on continue d'échanger jusqu'à tout confirmer
+                session.poll()
+                session.send()
+        now[0] += SIM_DT
+        ticks += 1
+        if ticks > frames * 20:
+            break
+    for s in sockets:
+        s.close()
+    same = sessions[0].sim.get_state() == sessions[1].sim.get_state()
+    return sessions, same
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Test du rollback réseau en boucle locale")
+    parser.add_argument('--frames', type=int, default=900)
+    parser.add_argument('--latency-ms', type=float, default=100.0)
+    parser.add_argument('--jitter-ms', type=float, default=20.0)
+    parser.add_argument('--loss', type=float, default=0.1)
+    parser.add_argument('--delay', type=int, default=INPUT_DELAY)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+    sessions, same = run_loopback(args.frames, args.latency_ms / 1000.0, args.jitter_ms / 1000.0,
+                                  args.loss, args.delay, args.seed)
+    for session in sessions:
+        print(f"Équipe {session.local_team}: image {session.sim.frame}, score {session.sim.score}, "
+              f"{session.rollbacks} rollbacks, {session.resimulated} images resimulées, "
+              f"{session.stalls} attentes")
+    print("États identiques" if same else "DÉSYNCHRONISATION")
+    return 0 if same else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+from collections import namedtuple
+
+import numpy as np
+
+from simulation import BALL_RADIUS, BALL_SPEED, FRICTION, PLAYER_RADIUS, PLAYER_SPEED
+
+# =============================================================================
+# CHOIX DES PASSES : COULOIRS ET INTERCEPTIONS
+# =============================================================================
+# Player.pass_ball envoie la balle au coéquipier le plus proche, même si un
+# adversaire se tient entre les deux. pass_options() note toutes les passes
+# possibles d'un coup : pour chaque receveur, le couloir est le segment entre
+# le passeur et le point où le receveur sera quand la balle arrivera (passe
+# en avant de lui), et chaque adversaire est jugé sur sa distance au point le
+# plus proche de ce segment.
+#
+# La balle ralentit géométriquement (vx *= FRICTION à chaque image), donc le
+# temps qu'elle met à parcourir une distance a une forme close (voir
+# travel_frames). Un adversaire intercepte s'il peut, dans ce temps, arriver
+# à portée de la balle au point le plus proche : la marge d'un couloir est la
+# plus petite des distances qui restent, négative si la passe est coupée.
+# Personne d'autre que le receveur ne touche la balle pendant PASS_COOLDOWN
+# images après la passe : le couloir ne commence qu'après.
+#
+# Tout est calculé en un seul passage NumPy sur les tableaux (matchs,
+# receveurs, adversaires) : la note de toutes les passes de tous les matchs
+# coûte moins qu'une image de jeu, on peut la recalculer à chaque image.
+# ZonePolicy (policy.py) le fait pour son porteur et transmet le receveur et
+# le point visé avec ses Actions ; les passes des humains ne changent pas.
+
+PASS_SPEED = BALL_SPEED * 1.2   # Vitesse de départ d'une passe (Player.pass_ball)
+PASS_COOLDOWN = 10              # ball.cooldown donné par une passe
+PASS_MIN_SPEED = 1.0            # Vitesse minimale de la balle à l'arrivée (sinon passe trop longue)
+PASS_SAFE_MARGIN = 16           # Marge (pixels) à partir de laquelle un couloir est sûr
+PASS_FORWARD_WEIGHT = 0.1       # Valeur d'un pixel gagné vers le but adverse
+LEAD_ITERATIONS = 2             # Raffinements du point d'arrivée (temps de vol <-> course du receveur)
+
+AI_STEP = PLAYER_SPEED * 0.6
+TOUCH_DISTANCE = PLAYER_RADIUS + BALL_RADIUS
+
+# Tableaux (matchs, receveurs) : point visé, marge du couloir, note (-inf si impossible)
+PassOptions = namedtuple('PassOptions', 'lead_x lead_y margin score')
+
+def travel_frames(distance, speed=PASS_SPEED, friction=FRICTION):
+    """
+    Images que met la balle lancée à speed pour parcourir distance (inf si
+    elle s'arrête avant) : en n images, elle fait
+    speed * (1 - friction ** n) / (1 - friction).
+    """
+    remaining = 1.0 - distance * (1.0 - friction) / speed
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(remaining > 0, np.log(remaining) / np.log(friction), np.inf)
+
+def travel_distance(frames, speed=PASS_SPEED, friction=FRICTION):
+    """Distance parcourue par la balle en frames images."""
+    return speed * (1.0 - friction ** frames) / (1.0 - friction)
+
+def pass_options(px, py, rx, ry, tx, ty, ox, oy, toward, opponent_step=AI_STEP,
+                 speed=PASS_SPEED, friction=FRICTION, receiver_step=AI_STEP):
+    """
+    Note les passes d'un passeur par match vers chaque receveur.
+
+    px, py : passeur (matchs,) ; rx, ry : receveurs (matchs, receveurs), qui
+    courent vers tx, ty à receiver_step par image ; ox, oy : adversaires
+    (matchs, adversaires), à opponent_step par image (nombre ou tableau de
+    même forme). toward : sens de l'attaque (1 vers la droite, -1 vers la
+    gauche). speed et friction : nombre ou tableau (matchs,).
+    """
+    px = np.asarray(px, dtype=np.float64)[:, None]
+    py = np.asarray(py, dtype=np.float64)[:, None]
+    speed = np.reshape(speed, (-1, 1))
+    friction = np.reshape(friction, (-1, 1))
+
+    # Point d'arrivée : le receveur avance vers sa cible pendant le vol
+    run_x = tx - rx
+    run_y = ty - ry
+    run = np.hypot(run_x, run_y)
+    safe_run = np.where(run > 0, run, 1.0)
+    lead_x, lead_y = rx, ry
+    for _ in range(LEAD_ITERATIONS):
+        frames = travel_frames(np.hypot(lead_x - px, lead_y - py), speed, friction)
+        ahead = np.minimum(frames * receiver_step, run) / safe_run
+        lead_x = rx + run_x * ahead
+        lead_y = ry + run_y * ahead
+
+    dx = lead_x - px
+    dy = lead_y - py
+    length = np.hypot(dx, dy)
+    arrival = speed * (1.0 - length * (1.0 - friction) / speed)
+    reachable = arrival >= PASS_MIN_SPEED
+    safe_length = np.where(length > 0, length, 1.0)
+    ux = (dx / safe_length)[:, :, None]
+    uy = (dy / safe_length)[:, :, None]
+
+    # Point du couloir le plus proche de chaque adversaire (matchs, receveurs, adversaires)
+    rel_x = (ox - px)[:, None, :]
+    rel_y = (oy - py)[:, None, :]
+    start = np.minimum(travel_distance(PASS_COOLDOWN, speed, friction), length)[:, :, None]
+    along = np.clip(rel_x * ux + rel_y * uy, start, length[:, :, None])
+    gap = np.hypot(rel_x - along * ux, rel_y - along * uy)
+    frames = travel_frames(along, speed[:, :, None], friction[:, :, None])
+    step = np.broadcast_to(opponent_step, np.shape(ox))[:, None, :]
+    margin = np.min(gap - step * frames - TOUCH_DISTANCE, axis=2, initial=np.inf)
+
+    score = np.minimum(margin, PASS_SAFE_MARGIN) + PASS_FORWARD_WEIGHT * toward * dx
+    score = np.where(reachable, score, -np.inf)
+    return PassOptions(lead_x, lead_y, margin, score)
+
+def best_pass(options, allowed=None):
+    """
+    Meilleure passe de chaque match parmi les receveurs allowed (matchs,
+    receveurs) : (receveur, point visé x, y, marge), tableaux (matchs,).
+    """
+    score = options.score if allowed is None else np.where(allowed, options.score, -np.inf)
+    best = np.argmax(score, axis=1)[:, None]
+    pick = lambda values: np.take_along_axis(values, best, axis=1)[:, 0]
+    margin = np.where(np.isfinite(pick(score)), pick(options.margin), -np.inf)
+    return best[:, 0], pick(options.lead_x), pick(options.lead_y), margin
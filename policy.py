@@ -0,0 +1,418 @@
+from collections import namedtuple
+
+import numpy as np
+
+from influence import INFLUENCE_SPREAD, InfluenceMap
+from intercept import intercept, intercept_runner, line_crossing, path_gap
+from passing import AI_STEP, TOUCH_DISTANCE, best_pass, pass_options, travel_frames
+from simulation import BALL_SPEED, PLAYER_SPEED, KICK_NONE, KICK_SHOOT, KICK_PASS
+
+# =============================================================================
+# POLITIQUES D'IA INTERCHANGEABLES
+# =============================================================================
+# Par défaut, chaque joueur IA décide seul dans Player.ai_behavior (et ses
+# copies dans vectorized.py et batch.py). Une politique décide pour toute une
+# équipe d'un coup : Policy.act reçoit une Observation du match et renvoie
+# des Actions pour tous les joueurs, sous forme de tableaux NumPy.
+#
+# Les tableaux ont une ligne par match et une colonne par joueur (équipe A
+# puis équipe B, comme Simulation.players()). Simulation n'a qu'une ligne ;
+# BatchSimulator en a une par match : la même politique joue des centaines de
+# matchs en une seule évaluation.
+#
+# La politique est consultée une fois par image, avant le déplacement des
+# joueurs : elle voit l'état du début de l'image, alors que ai_behavior voit
+# la balle déjà déplacée par les joueurs précédents. Chaque joueur applique
+# ensuite son action dans l'ordre habituel (contact avec la balle, frappe,
+# déplacement vers la cible à la vitesse de l'IA). Une frappe n'a lieu que si
+# le joueur a la balle à ce moment-là. Pour une passe, la politique peut
+# choisir le receveur et le point visé (pass_to, pass_x, pass_y) ; sinon la
+# balle part vers le coéquipier le plus proche, comme pour un humain.
+#
+# Chaque équipe peut avoir sa politique (Simulation(policies={'A': ...}),
+# BatchSimulator(policies=...)) ; une équipe sans politique garde
+# ai_behavior. tournament.py s'en sert pour comparer deux IA (--ai-a / --ai-b).
+#
+# Les replays n'enregistrent que les entrées des joueurs : un match joué avec
+# une politique se relit avec la même politique.
+
+# side : indice (0 = A, 1 = B) de l'équipe qui décide
+# ball_*, receiver (joueur à qui la balle est passée, -1 sinon) : (matchs,)
+# x, y, has_ball, default_x, default_y, ai : (matchs, joueurs)
+# team, is_keeper : (joueurs,) ; pitch : simulation.Pitch
+Observation = namedtuple('Observation', 'side ball_x ball_y ball_vx ball_vy receiver x y has_ball '
+                                        'default_x default_y ai team is_keeper pitch')
+# target_x, target_y : cible de chaque joueur ; kick : KICK_* (tableaux (matchs, joueurs))
+# pass_to, pass_x, pass_y : receveur (indice de joueur, -1 = le plus proche) et point visé
+# d'une passe, tableaux (matchs, joueurs) ou None
+Actions = namedtuple('Actions', 'target_x target_y kick pass_to pass_x pass_y', defaults=(None, None, None))
+
+TEAM_IDS = ('A', 'B')
+
+def observe_simulation(sim, side):
+    """Observation d'une Simulation (une seule ligne)."""
+    players = sim.players()
+    ball = sim.ball
+    row = lambda values: np.array([values], dtype=np.float64)
+    return Observation(
+        side,
+        row(ball.x), row(ball.y), row(ball.vx), row(ball.vy),
+        np.array([players.index(ball.pass_receiver) if ball.pass_receiver is not None else -1]),
+        row([p.x for p in players]), row([p.y for p in players]),
+        np.array([[p.has_ball for p in players]]),
+        row([p.default_x for p in players]), row([p.default_y for p in players]),
+        np.array([[not (p.controlled and p.keys is not None) for p in players]]),
+        np.array([TEAM_IDS.index(p.team) for p in players], dtype=np.int8),
+        np.array([p.is_keeper for p in players]),
+        sim.pitch,
+    )
+
+def observe_batch(batch, side):
+    """Observation de tous les matchs d'un BatchSimulator (tous les joueurs sont IA)."""
+    return Observation(side, batch.ball_x, batch.ball_y, batch.ball_vx, batch.ball_vy, batch.receiver,
+                       batch.x, batch.y, batch.has_ball, batch.default_x, batch.default_y,
+                       np.ones_like(batch.has_ball), batch.team, batch.is_keeper, batch.pitch)
+
+class Policy:
+    """
+    Interface d'une IA d'équipe. act(observation) renvoie des Actions pour
+    tous les joueurs ; seules celles des joueurs IA de l'équipe observation.side
+    sont appliquées.
+    """
+
+    name = None
+
+    def act(self, observation):
+        raise NotImplementedError
+
+    def reset(self):
+        """Oublie ce qui est gardé d'une image à l'autre (Simulation.set_state : rollback, relecture)."""
+
+    def decide(self, sim, team):
+        """Applique act à une Simulation : renseigne player.action pour l'équipe team."""
+        actions = self.act(observe_simulation(sim, TEAM_IDS.index(team)))
+        players = sim.players()
+        start = 0 if team == 'A' else len(sim.teams['A'].players)
+        for i, player in enumerate(sim.teams[team].players):
+            j = start + i
+            if actions.pass_to is None or actions.pass_to[0, j] < 0:
+                receiver = target = None
+            else:
+                receiver = players[int(actions.pass_to[0, j])]
+                target = None if actions.pass_x is None else (float(actions.pass_x[0, j]),
+                                                              float(actions.pass_y[0, j]))
+            player.action = (float(actions.target_x[0, j]), float(actions.target_y[0, j]),
+                             int(actions.kick[0, j]), receiver, target)
+
+def keeper_y(obs):
+    """
+    Hauteur visée par les gardiens (matchs, 1) : là où la balle franchira
+    leur ligne (simulation.shot_crossing), sinon celle de la balle, sans
+    quitter le but.
+    """
+    pitch = obs.pitch
+    crossing, _ = line_crossing(obs.ball_x, obs.ball_y, obs.ball_vx, obs.ball_vy, pitch.keeper_x[obs.side])
+    return np.clip(crossing, pitch.goal_top, pitch.goal_bottom)[:, None]
+
+def most_open(obs, passer):
+    """Coéquipier de passer (matchs,) le plus éloigné de tout adversaire (Player.distribute)."""
+    ours = np.flatnonzero(obs.team == obs.side)
+    theirs = np.flatnonzero(obs.team != obs.side)
+    gap = np.hypot(obs.x[:, ours, None] - obs.x[:, None, theirs],
+                   obs.y[:, ours, None] - obs.y[:, None, theirs]).min(axis=2)
+    gap = np.where(ours[None, :] == passer[:, None], -np.inf, gap)
+    return ours[np.argmax(gap, axis=1)]
+
+AI_SHOOT_DISTANCE = 2.0  # Distance à la ligne d'attaque à partir de laquelle le porteur tire
+AI_CHASE_RADIUS = 90     # Rayon de la zone (autour de la position par défaut) où l'on va chercher la balle
+
+class ChasePolicy(Policy):
+    """
+    Les règles de ai_behavior, plus deux : un joueur va chercher la balle
+    quand son équipe ne l'a pas et qu'elle est à moins de AI_CHASE_RADIUS de
+    sa position par défaut, et le porteur tire en arrivant sur sa ligne
+    d'attaque.
+    """
+
+    name = 'chase'
+
+    def act(self, obs):
+        side, pitch = obs.side, obs.pitch
+        ours = obs.team == side
+        possession = (obs.has_ball & ours).any(axis=1, keepdims=True)
+        ball_x = obs.ball_x[:, None]
+        ball_y = obs.ball_y[:, None]
+        attack_x = pitch.attack_x[side]
+        chase = ~possession & (np.hypot(ball_x - obs.default_x, ball_y - obs.default_y) < AI_CHASE_RADIUS)
+        # Le chasseur va là où il rejoindra la balle (intercept.py), pas là où elle est
+        _, meet_x, meet_y = intercept(obs.ball_x, obs.ball_y, obs.ball_vx, obs.ball_vy, obs.x, obs.y,
+                                      step=np.where(obs.ai, AI_STEP, PLAYER_SPEED))
+        target_x = np.where(possession, attack_x, np.where(chase, meet_x, obs.default_x))
+        target_y = np.where(possession, obs.y, np.where(chase, meet_y, obs.default_y))
+        target_x = np.where(obs.is_keeper, pitch.keeper_x[side], target_x)
+        target_y = np.where(obs.is_keeper, keeper_y(obs), target_y)
+        shoot = ~obs.is_keeper & (np.abs(obs.x - attack_x) < AI_SHOOT_DISTANCE)
+        kick = np.where(shoot, KICK_SHOOT, np.where(obs.is_keeper, KICK_PASS, KICK_NONE))
+        # Le gardien relance vers le coéquipier le plus démarqué
+        receiver = most_open(obs, np.argmax(obs.has_ball & obs.is_keeper, axis=1))
+        return Actions(target_x, target_y, kick, np.broadcast_to(receiver[:, None], kick.shape))
+
+ZONE_FOLLOW = 0.4        # Part du déplacement de la balle suivie par le bloc
+ZONE_PUSH = 30           # Avancée des coéquipiers quand l'équipe a la balle
+PRESSURE_RADIUS = 18     # Un adversaire plus près que ça du porteur : il se débarrasse de la balle
+KEEPER_RANGE = 40        # Le gardien sort chercher une balle qu'il touche en premier à moins de ça de sa ligne
+ZONE_SHOT_RANGE = 80     # Pressé à moins de ça de sa ligne d'attaque, il tire (moins que la moitié du terrain)
+DODGE_RADIUS = 50        # Adversaire devant plus près que ça : le porteur le contourne
+DODGE_WIDTH = 20         # Écart visé sur le côté de cet adversaire
+
+class ZonePolicy(Policy):
+    """
+    Jeu en bloc : seul le joueur qui peut toucher la balle le plus tôt va au
+    point où il la rejoindra (intercept.py), ou le receveur d'une passe de
+    l'équipe qui ne passerait pas par lui ; les autres gardent leur zone en
+    suivant la balle. Contre un porteur, c'est un joueur resté entre lui et
+    le but qui va lui couper la route. Le porteur avance en contournant
+    l'adversaire devant lui et tire sur sa ligne d'attaque, ou plus tôt
+    s'il est pressé près du but et que le gardien ne peut pas couvrir le
+    tir. Sinon, pressé, il passe vers l'avant dans le meilleur couloir
+    ouvert (passing.py), devant le receveur ; faute de quoi il garde la
+    balle. Le gardien se place là où la balle franchira sa ligne, sort la
+    chercher s'il y arrive avant tout adversaire et relance dès qu'un
+    couloir s'ouvre, ou quand on le presse.
+    """
+
+    name = 'zone'
+
+    def block(self, obs, possession):
+        """Cibles des joueurs qui tiennent leur zone : positions par défaut décalées vers la balle."""
+        pitch = obs.pitch
+        toward = 1.0 if obs.side == 0 else -1.0
+        # Vers l'avant quand l'équipe a la balle
+        push = np.where(possession, toward * ZONE_PUSH, 0.0)
+        target_x = obs.default_x + ZONE_FOLLOW * (obs.ball_x[:, None] - pitch.center_x) + push
+        target_y = obs.default_y + ZONE_FOLLOW * (obs.ball_y[:, None] - pitch.center_y)
+        return target_x, target_y
+
+    def pressure(self, obs):
+        """Joueurs qui ont un adversaire à moins de PRESSURE_RADIUS."""
+        theirs = obs.team != obs.side
+        gap = np.hypot(obs.x[:, :, None] - obs.x[:, None, :], obs.y[:, :, None] - obs.y[:, None, :])
+        return np.where(theirs[None, None, :], gap, np.inf).min(axis=2) < PRESSURE_RADIUS
+
+    def dribble(self, obs):
+        """
+        Hauteur visée par chaque joueur s'il porte la balle : la sienne, ou
+        à côté de l'adversaire le plus proche devant lui s'il est à moins de
+        DODGE_RADIUS. Foncer tout droit sur le défenseur qui vient au point
+        d'interception le force à repasser en arrière, et l'équipe n'avance plus.
+        """
+        toward = 1.0 if obs.side == 0 else -1.0
+        dx = obs.x[:, None, :] - obs.x[:, :, None]
+        dy = obs.y[:, None, :] - obs.y[:, :, None]
+        ahead = (obs.team != obs.side)[None, None, :] & (dx * toward > 0)
+        gap = np.where(ahead, np.hypot(dx, dy), np.inf)
+        nearest = np.argmin(gap, axis=2)
+        close = np.take_along_axis(gap, nearest[:, :, None], axis=2)[:, :, 0] < DODGE_RADIUS
+        away = np.where(obs.y >= np.take_along_axis(obs.y, nearest, axis=1), 1.0, -1.0)
+        return np.where(close, obs.y + away * DODGE_WIDTH, obs.y)
+
+    def open_shot(self, obs):
+        """
+        Joueurs dont le tir (Player.shoot_ball, vers le milieu du but) franchirait
+        la ligne du gardien adverse avant que celui-ci n'arrive sur sa trajectoire.
+        """
+        pitch = obs.pitch
+        keepers = np.flatnonzero(obs.is_keeper & (obs.team != obs.side))
+        if len(keepers) == 0:
+            return np.ones_like(obs.has_ball)
+        keeper = keepers[0]
+        line_x = pitch.keeper_x[1 - obs.side]
+        goal_x = pitch.shot_x[obs.side]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            crossing = obs.y + (pitch.center_y - obs.y) * (line_x - obs.x) / (goal_x - obs.x)
+        frames = travel_frames(np.hypot(line_x - obs.x, crossing - obs.y), speed=BALL_SPEED * 1.5)
+        gap = np.hypot(obs.x[:, keeper, None] - line_x, obs.y[:, keeper, None] - crossing) - TOUCH_DISTANCE
+        keeper_step = np.where(obs.ai[:, keeper], AI_STEP, PLAYER_SPEED)[:, None]
+        return gap > keeper_step * frames
+
+    def interception(self, obs):
+        """
+        Première image où chaque joueur peut toucher la balle, et où
+        (intercept.intercept). Au pied d'un adversaire, la balle n'a pas de
+        vitesse : le point visé est celui où l'on coupe la route du porteur,
+        qui court tout droit vers sa ligne d'attaque (intercept.intercept_runner).
+        """
+        step = np.where(obs.ai, AI_STEP, PLAYER_SPEED)
+        frames, meet_x, meet_y = intercept(obs.ball_x, obs.ball_y, obs.ball_vx, obs.ball_vy, obs.x, obs.y,
+                                           step=step)
+        carried = obs.has_ball & (obs.team != obs.side)
+        speed = step[np.arange(len(step)), np.argmax(carried, axis=1)]
+        run_vx = speed * (-1.0 if obs.side == 0 else 1.0)
+        met, run_x, run_y = intercept_runner(obs.ball_x, obs.ball_y, run_vx, np.zeros_like(run_vx),
+                                             obs.x, obs.y, step=step)
+        # Il s'arrête sur sa ligne d'attaque pour tirer
+        line_x = obs.pitch.attack_x[1 - obs.side]
+        run_x = np.maximum(run_x, line_x) if obs.side == 0 else np.minimum(run_x, line_x)
+        cut = carried.any(axis=1, keepdims=True) & met
+        return frames, np.where(cut, run_x, meet_x), np.where(cut, run_y, meet_y)
+
+    def choose_pass(self, obs, holder, target_x, target_y):
+        """
+        Meilleure passe du porteur vers un coéquipier qui court vers sa cible :
+        (receveur, point visé x, y, couloir ouvert), tableaux (matchs,).
+        """
+        ours = np.flatnonzero(obs.team == obs.side)
+        theirs = np.flatnonzero(obs.team != obs.side)
+        passer = np.argmax(holder, axis=1)     # 0 sans porteur : le résultat ne sert pas
+        rows = np.arange(len(passer))
+        # Un humain ne suit pas la cible de la politique : on vise où il est
+        run_x = np.where(obs.ai[:, ours], target_x[:, ours], obs.x[:, ours])
+        run_y = np.where(obs.ai[:, ours], target_y[:, ours], obs.y[:, ours])
+        options = pass_options(obs.x[rows, passer], obs.y[rows, passer],
+                               obs.x[:, ours], obs.y[:, ours], run_x, run_y,
+                               obs.x[:, theirs], obs.y[:, theirs], 1.0 if obs.side == 0 else -1.0,
+                               opponent_step=np.where(obs.ai[:, theirs], AI_STEP, PLAYER_SPEED))
+        best, lead_x, lead_y, margin = best_pass(options, allowed=ours[None, :] != passer[:, None])
+        return ours[best], lead_x, lead_y, margin >= 0
+
+    def act(self, obs):
+        side, pitch = obs.side, obs.pitch
+        ours = obs.team == side
+        attack_x = pitch.attack_x[side]
+        possession = (obs.has_ball & ours).any(axis=1, keepdims=True)
+        # Pendant une passe de l'équipe, le bloc garde son placement offensif :
+        # la passe vise le point où le receveur sera au bout de sa course
+        # (passing.py), il continue donc vers sa cible au lieu de revenir vers la balle
+        receiver = np.maximum(obs.receiver, 0)
+        incoming = ((obs.receiver >= 0) & (obs.team[receiver] == side))[:, None]
+        target_x, target_y = self.block(obs, possession | incoming)
+
+        # Le joueur de champ qui touchera la balle le premier va là où il la
+        # rejoindra. Une passe de l'équipe qui ne passe pas par la cible de son
+        # receveur (trop courte, ou la cible a suivi la balle), c'est lui qui va la chercher
+        frames, meet_x, meet_y = self.interception(obs)
+        field = ours & ~obs.is_keeper & obs.ai
+        # Balle au pied d'un adversaire : un joueur déjà dépassé ne le rattrape pas (même
+        # vitesse) ; c'est le plus rapide de ceux restés entre la balle et le but qui y va
+        toward = 1.0 if side == 0 else -1.0
+        beaten = (obs.x - obs.ball_x[:, None]) * toward > TOUCH_DISTANCE
+        cover = field & ~((obs.has_ball & ~ours).any(axis=1, keepdims=True) & beaten)
+        candidates = np.where(cover.any(axis=1, keepdims=True), cover, field)
+        chaser = np.argmin(np.where(candidates, frames, np.inf), axis=1)
+        rows = np.arange(len(chaser))
+        gap = path_gap(obs.ball_x, obs.ball_y, obs.ball_vx, obs.ball_vy, target_x, target_y)
+        missed = incoming[:, 0] & (gap[rows, receiver] > TOUCH_DISTANCE)
+        chaser = np.where(incoming[:, 0], receiver, chaser)
+        chasing = np.zeros_like(obs.has_ball)
+        chasing[rows, chaser] = True
+        chasing &= ours & obs.ai & ~possession & (~incoming | missed[:, None])
+        target_x = np.where(chasing, meet_x, target_x)
+        target_y = np.where(chasing, meet_y, target_y)
+
+        # Le porteur file vers la ligne d'attaque en contournant qui lui barre la route ;
+        # passe si un adversaire le serre
+        holder = obs.has_ball & ours
+        target_x = np.where(holder, attack_x, target_x)
+        target_y = np.where(holder, self.dribble(obs), target_y)
+
+        # Gardien : sort si la balle arrive près de son but et qu'il la touche avant
+        # tout adversaire ; sinon sur sa ligne, à la hauteur de la balle sans quitter le but
+        first_theirs = np.where(ours, np.inf, frames).min(axis=1, keepdims=True)
+        claim = (obs.is_keeper & ~possession & ~incoming & (frames < first_theirs)
+                 & (np.abs(meet_x - pitch.keeper_x[side]) < KEEPER_RANGE))
+        target_x = np.where(claim, meet_x, target_x)
+        target_y = np.where(claim, meet_y, target_y)
+        keeper = obs.is_keeper & ~chasing & ~claim
+        target_x = np.where(keeper, pitch.keeper_x[side], target_x)
+        target_y = np.where(keeper, keeper_y(obs), target_y)
+        np.clip(target_x, pitch.min_x, pitch.max_x, out=target_x)
+        np.clip(target_y, pitch.min_y, pitch.max_y, out=target_y)
+
+        pressed = self.pressure(obs)
+        to_line = np.abs(obs.x - attack_x)
+        shoot = (to_line < AI_SHOOT_DISTANCE) | (pressed & (to_line < ZONE_SHOT_RANGE) & self.open_shot(obs))
+        shoot &= ~obs.is_keeper
+        receiver, pass_x, pass_y, open_lane = self.choose_pass(obs, holder, target_x, target_y)
+        # Pressé, le joueur de champ ne passe que vers l'avant : une passe en retrait
+        # vers un bloc resté derrière lui ramène la balle là où il l'a prise, et
+        # l'équipe tourne en rond. Le gardien relance dès qu'un couloir s'ouvre et,
+        # pressé, même dans un couloir coupé ; sinon il garde la balle
+        passer_x = obs.x[rows, np.argmax(holder, axis=1)]
+        forward = ((pass_x - passer_x) * toward > 0) & open_lane
+        passing = np.where(obs.is_keeper, pressed | open_lane[:, None], pressed & forward[:, None])
+        # Seul le porteur du début de l'image frappe : celui qui reçoit la balle la contrôle d'abord
+        kick = np.where(holder & shoot, KICK_SHOOT, np.where(holder & passing, KICK_PASS, KICK_NONE))
+        shape = kick.shape
+        return Actions(target_x, target_y, kick, np.broadcast_to(receiver[:, None], shape),
+                       np.broadcast_to(pass_x[:, None], shape), np.broadcast_to(pass_y[:, None], shape))
+
+SPACE_WEIGHT = 1.0 / (INFLUENCE_SPREAD + 1)   # Un adversaire de moins sur la case vaut 1
+THREAT_WEIGHT = 3.0       # Attaque : poids de la proximité du but adverse
+COVER_WEIGHT = 2.0        # Défense : poids de la proximité de son propre but
+PRESSURE_LEVEL = INFLUENCE_SPREAD   # Danger sur la case du porteur : adversaire sur sa case ou la voisine
+
+class InfluencePolicy(ZonePolicy):
+    """
+    ZonePolicy dont les joueurs de zone se placent avec les cartes
+    d'influence (influence.py) : en attaque, la case la plus libre et la plus
+    menaçante autour de leur zone ; en défense, celle où l'adversaire pèse le
+    plus, côté but. La pression sur le porteur se lit aussi sur la carte, au
+    lieu de mesurer la distance à chaque adversaire.
+
+    Les cartes sont gardées d'une image à l'autre (une par équipe jouée).
+    """
+
+    name = 'influence'
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        # Les cartes ne dépendent que des positions : elles sont reconstruites à la prochaine image
+        self.maps = {}            # side -> InfluenceMap
+        self.best = {}            # side -> (meilleures cases en attaque, en défense)
+        self.map = None
+
+    def prepare(self, obs):
+        side = obs.side
+        influence = self.maps.get(side)
+        if influence is None or influence.matches != len(obs.x) or influence.pitch is not obs.pitch:
+            influence = self.maps[side] = InfluenceMap(obs.pitch, len(obs.x), obs.team)
+            self.best.pop(side, None)
+        influence.update(obs.x, obs.y)
+        if side not in self.best:
+            empty = np.zeros((influence.matches, influence.rows * influence.cols), dtype=np.int64)
+            self.best[side] = (empty, empty.copy())
+        attack, cover = self.best[side]
+        # Seuls les matchs où un joueur a changé de case sont recalculés
+        dirty = influence.dirty
+        if dirty.any():
+            grid = influence.influence[dirty]
+            space = (grid[:, side] - grid[:, 1 - side]) * SPACE_WEIGHT
+            attack[dirty] = influence.best_cells(space + THREAT_WEIGHT * influence.threat[side])
+            cover[dirty] = influence.best_cells(grid[:, 1 - side] * SPACE_WEIGHT
+                                                + COVER_WEIGHT * influence.threat[1 - side])
+        self.map = influence
+        return attack, cover
+
+    def act(self, obs):
+        self.attack_cells, self.cover_cells = self.prepare(obs)
+        return super().act(obs)
+
+    def block(self, obs, possession):
+        # Meilleure case autour de la zone de ZonePolicy : une lecture par joueur
+        target_x, target_y = super().block(obs, possession)
+        home = self.map.cell_of(np.clip(target_x, 0, obs.pitch.width - 1), np.clip(target_y, 0, obs.pitch.height - 1))
+        best = np.where(possession, np.take_along_axis(self.attack_cells, home, axis=1),
+                        np.take_along_axis(self.cover_cells, home, axis=1))
+        return self.map.cell_center(best)
+
+    def pressure(self, obs):
+        return self.map.at(self.map.danger(obs.side), self.map.cells) >= PRESSURE_LEVEL
+
+POLICIES = {policy.name: policy for policy in (ChasePolicy, ZonePolicy, InfluencePolicy)}
+BUILTIN_AI = 'builtin'   # Player.ai_behavior, sans politique
+
+def make_policies(names):
+    """Politiques {équipe: Policy} pour des noms {équipe: nom de POLICIES ou BUILTIN_AI}."""
+    return {team: POLICIES[name]() for team, name in names.items() if name != BUILTIN_AI}
@@ -0,0 +1,151 @@
+import csv
+import functools
+import threading
+import time
+from collections import deque
+
+# =============================================================================
+# MESURE DU TEMPS PAR IMAGE ET PAR SOUS-SYSTÈME
+# =============================================================================
+# Instrumentation optionnelle : FrameProfiler.wrap() remplace une fonction ou
+# une méthode (InputMixer.poll, Player.update, Ball.update, Game.draw...)
+# par une version chronométrée. Sans profiler, rien n'est remplacé et le jeu
+# ne paie rien.
+#
+# Pour chaque section, on cumule le temps passé pendant l'image, puis on le
+# range dans un historique glissant (HISTORY images). L'historique s'affiche
+# en surimpression (textes du HUD mis en cache, rafraîchis toutes les
+# OVERLAY_REFRESH images) et peut être écrit en CSV (csv_path), une ligne
+# par image, pour voir si les ralentissements viennent des manettes
+# (pygame), de l'IA ou du dessin (pyxel).
+#
+# Les cumuls de l'image appartiennent au thread qui crée le profiler et
+# appelle next_frame. Un autre thread (la simulation de simthread.py) cumule
+# dans ses propres compteurs et les remet avec publish() après chaque pas :
+# next_frame les ajoute à l'image en cours. Les deux threads n'écrivent donc
+# jamais dans le même dictionnaire, et un pas n'est compté qu'une fois, dans
+# l'image où il est remis.
+
+HISTORY = 120            # Images gardées pour les moyennes glissantes
+OVERLAY_COLOR = 10       # Jaune
+OVERLAY_REFRESH = 15     # Images entre deux mises à jour des chiffres affichés
+
+class FrameProfiler:
+    def __init__(self, history=HISTORY, csv_path=None):
+        self.history = history
+        self.sections = {}        # nom -> deque des temps par image (secondes)
+        self.current = {}         # nom -> temps cumulé pendant l'image en cours
+        self.frame_times = deque(maxlen=history)
+        self.frame = 0
+        self.thread = threading.get_ident()
+        self.local = threading.local()   # cumuls des autres threads, depuis leur dernier publish
+        self.published = deque()         # cumuls remis par publish, pas encore comptés
+        self.last_time = None
+        self.patches = []
+        self.csv_file = None
+        self.csv_writer = None
+        self.widgets = []
+        self.overlay_frame = None
+        if csv_path:
+            self.csv_file = open(csv_path, 'w', newline='')
+            self.csv_writer = csv.writer(self.csv_file)
+
+    def section(self, name):
+        if name not in self.sections:
+            self.sections[name] = deque(maxlen=self.history)
+            self.current[name] = 0.0
+
+    def wrap(self, owner, attr, name=None):
+        """Chronomètre owner.attr (fonction d'un module ou méthode d'une classe)."""
+        name = name or attr
+        self.section(name)
+        original = getattr(owner, attr)
+        current = self.current
+        clock = time.perf_counter
+        owner_thread = self.thread
+        get_ident = threading.get_ident
+        worker_totals = self.worker_totals
+
+        @functools.wraps(original)
+        def timed(*args, **kwargs):
+            totals = current if get_ident() == owner_thread else worker_totals()
+            start = clock()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                totals[name] = totals.get(name, 0.0) + clock() - start
+
+        setattr(owner, attr, timed)
+        self.patches.append((owner, attr, original))
+
+    def worker_totals(self):
+        """Cumuls du thread appelant quand ce n'est pas celui des images."""
+        totals = getattr(self.local, 'totals', None)
+        if totals is None:
+            totals = self.local.totals = {}
+        return totals
+
+    def publish(self):
+        """Remet les cumuls du thread appelant : ils compteront dans l'image en cours."""
+        totals = getattr(self.local, 'totals', None)
+        if totals:
+            self.local.totals = {}
+            self.published.append(totals)
+
+    def uninstall(self):
+        """Remet les fonctions d'origine."""
+        for owner, attr, original in reversed(self.patches):
+            setattr(owner, attr, original)
+        self.patches = []
+
+    def next_frame(self):
+        """Clôt l'image en cours : à appeler une fois par image (début de update)."""
+        now = time.perf_counter()
+        if self.last_time is not None:
+            self.frame_times.append(now - self.last_time)
+        self.last_time = now
+        while self.published:
+            for name, spent in self.published.popleft().items():
+                self.current[name] += spent
+        for name, spent in self.current.items():
+            self.sections[name].append(spent)
+            self.current[name] = 0.0
+        if self.csv_writer is not None:
+            if self.frame == 0:
+                self.csv_writer.writerow(['frame', 'frame_ms'] + list(self.sections))
+            frame_ms = self.frame_times[-1] * 1000 if self.frame_times else 0.0
+            self.csv_writer.writerow([self.frame, f"{frame_ms:.3f}"] +
+                                     [f"{times[-1] * 1000:.3f}" for times in self.sections.values()])
+        self.frame += 1
+
+    def stats(self):
+        """{nom: (moyenne ms, max ms)} sur l'historique glissant, plus 'frame'."""
+        result = {}
+        for name, times in [('frame', self.frame_times)] + list(self.sections.items()):
+            if times:
+                result[name] = (sum(times) / len(times) * 1000, max(times) * 1000)
+            else:
+                result[name] = (0.0, 0.0)
+        return result
+
+    def overlay_lines(self):
+        return [f"{name[:18]:<18} {avg:5.2f} {peak:5.2f}" for name, (avg, peak) in self.stats().items()]
+
+    def draw_overlay(self, hud, x=2, y=20):
+        """Affiche les temps avec les widgets de hud (hud.HudLayer)."""
+        if not self.widgets:
+            header = hud.widget(OVERLAY_COLOR)
+            header.update("section              moy   max ms")
+            self.widgets = [header] + [hud.widget(OVERLAY_COLOR) for _ in range(len(self.sections) + 1)]
+        if self.overlay_frame is None or self.frame - self.overlay_frame >= OVERLAY_REFRESH:
+            self.overlay_frame = self.frame
+            for widget, line in zip(self.widgets[1:], self.overlay_lines()):
+                widget.update(line)
+        for i, widget in enumerate(self.widgets):
+            widget.draw(x, y + 7 * i)
+
+    def close(self):
+        if self.csv_file is not None:
+            self.csv_file.close()
+            self.csv_file = None
+            self.csv_writer = None
@@ -0,0 +1,306 @@
+import argparse
+import shutil
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+
+from drawing import (
+    BALL_ROW, SPRITE_CELL, SPRITE_CENTER, SPRITE_COLKEY, SPRITE_SIZE,
+    Camera, paint_field, paint_sprites, player_sprite,
+)
+from replay import Replay
+from simulation import SCREEN_WIDTH, SCREEN_HEIGHT
+from simthread import capture
+from timestep import SIM_HZ
+
+# =============================================================================
+# EXPORT VIDÉO D'UN MATCH ENREGISTRÉ, SANS FENÊTRE
+# =============================================================================
+# Rejoue un replay (replay.py) et dessine chaque pas de simulation dans un
+# Framebuffer : une image NumPy d'indices de la palette pyxel, avec les mêmes
+# primitives que pyxel (cls, rect, line, circ, blt, camera...). Le terrain et
+# les sprites sont peints par drawing.py, comme dans V8.py : la vidéo montre
+# le même match que le jeu, sans pyxel ni fenêtre (serveur sans écran).
+#
+# MatchRenderer.frames() est un générateur : une image RGB à la fois, passée
+# directement à ffmpeg par un tube. La mémoire ne dépend pas de la durée du
+# match.
+#
+# Les résumés (--highlights) ne gardent que quelques secondes autour de
+# chaque but : on repère les changements de score en rejouant le match sans
+# dessiner, puis on saute au début de chaque extrait grâce aux instantanés
+# du replay (Replay.seek).
+#
+# Les textes du HUD (score, "BUT!") ne sont pas dessinés : la police est
+# celle de pyxel.
+#
+# python render.py replays/match.frpl match.mp4
+# python render.py replays/match.frpl buts.gif --highlights --scale 1
+
+# Palette par défaut de pyxel (pyxel.colors), en RGB
+PALETTE = np.array([
+    (0x00, 0x00, 0x00), (0x2B, 0x33, 0x5F), (0x7E, 0x20, 0x72), (0x19, 0x95, 0x9C),
+    (0x8B, 0x48, 0x52), (0x39, 0x5C, 0x98), (0xA9, 0xC1, 0xFF), (0xEE, 0xEE, 0xEE),
+    (0xD4, 0x18, 0x6C), (0xD3, 0x84, 0x41), (0xE9, 0xC3, 0x5B), (0x70, 0xC6, 0xA9),
+    (0x76, 0x96, 0xDE), (0xA3, 0xA3, 0xA3), (0xFF, 0x97, 0x98), (0xED, 0xC7, 0xB0),
+], dtype=np.uint8)
+
+ATLAS_SIZE = 256                   # Comme une banque d'images pyxel
+HIGHLIGHT_BEFORE = 4 * SIM_HZ      # Pas gardés avant chaque but
+HIGHLIGHT_AFTER = 2 * SIM_HZ       # ... et après
+DEFAULT_SCALE = 2
+
+# =============================================================================
+# IMAGE EN MÉMOIRE
+# =============================================================================
+class Framebuffer:
+    """Image d'indices de couleur avec les primitives de dessin de pyxel."""
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.pixels = np.zeros((height, width), dtype=np.uint8)
+        self.cam_x = 0
+        self.cam_y = 0
+
+    def camera(self, x=0, y=0):
+        self.cam_x = x
+        self.cam_y = y
+
+    def clip(self, x, y, w, h):
+        """Tranches (lignes, colonnes) du rectangle (x, y, w, h) visibles, ou None."""
+        x0 = max(0, x - self.cam_x)
+        y0 = max(0, y - self.cam_y)
+        x1 = min(self.width, x - self.cam_x + w)
+        y1 = min(self.height, y - self.cam_y + h)
+        if x0 >= x1 or y0 >= y1:
+            return None
+        return slice(y0, y1), slice(x0, x1)
+
+    def cls(self, col):
+        self.pixels[:] = col
+
+    def pset(self, x, y, col):
+        x -= self.cam_x
+        y -= self.cam_y
+        if 0 <= x < self.width and 0 <= y < self.height:
+            self.pixels[y, x] = col
+
+    def rect(self, x, y, w, h, col):
+        area = self.clip(x, y, w, h)
+        if area is not None:
+            self.pixels[area] = col
+
+    def rectb(self, x, y, w, h, col):
+        self.rect(x, y, w, 1, col)
+        self.rect(x, y + h - 1, w, 1, col)
+        self.rect(x, y, 1, h, col)
+        self.rect(x + w - 1, y, 1, h, col)
+
+    def line(self, x1, y1, x2, y2, col):
+        steps = max(abs(x2 - x1), abs(y2 - y1))
+        xs = np.rint(np.linspace(x1, x2, steps + 1)).astype(np.int64) - self.cam_x
+        ys = np.rint(np.linspace(y1, y2, steps + 1)).astype(np.int64) - self.cam_y
+        inside = (xs >= 0) & (xs < self.width) & (ys >= 0) & (ys < self.height)
+        self.pixels[ys[inside], xs[inside]] = col
+
+    def disc(self, r):
+        """Masque (2r+1) x (2r+1) d'un disque de rayon r, et celui de son contour."""
+        d = np.arange(-r, r + 1)
+        filled = d[:, None] ** 2 + d[None, :] ** 2 <= r * (r + 1)
+        inner = np.zeros_like(filled)
+        inner[1:-1, 1:-1] = filled[:-2, 1:-1] & filled[2:, 1:-1] & filled[1:-1, :-2] & filled[1:-1, 2:]
+        return filled, filled & ~inner
+
+    def stamp(self, x, y, mask, col):
+        r = mask.shape[0] // 2
+        area = self.clip(x - r, y - r, mask.shape[1], mask.shape[0])
+        if area is None:
+            return
+        rows, cols = area
+        my = slice(rows.start - (y - r - self.cam_y), rows.stop - (y - r - self.cam_y))
+        mx = slice(cols.start - (x - r - self.cam_x), cols.stop - (x - r - self.cam_x))
+        self.pixels[rows, cols][mask[my, mx]] = col
+
+    def circ(self, x, y, r, col):
+        self.stamp(x, y, self.disc(r)[0], col)
+
+    def circb(self, x, y, r, col):
+        self.stamp(x, y, self.disc(r)[1], col)
+
+    def blt(self, x, y, src, u, v, w, h, colkey=None):
+        """Copie la zone (u, v, w, h) de src (un autre Framebuffer) en (x, y)."""
+        x, y = int(round(x)), int(round(y))
+        area = self.clip(x, y, w, h)
+        if area is None:
+            return
+        rows, cols = area
+        sy = v + rows.start - (y - self.cam_y)
+        sx = u + cols.start - (x - self.cam_x)
+        block = src.pixels[sy:sy + rows.stop - rows.start, sx:sx + cols.stop - cols.start]
+        if colkey is None:
+            self.pixels[rows, cols] = block
+        else:
+            opaque = block != colkey
+            self.pixels[rows, cols][opaque] = block[opaque]
+
+    def rgb(self, scale=1):
+        """Image (hauteur, largeur, 3) en uint8, agrandie scale fois (pixels nets)."""
+        image = PALETTE[self.pixels]
+        if scale > 1:
+            image = image.repeat(scale, axis=0).repeat(scale, axis=1)
+        return image
+
+# =============================================================================
+# RELECTURE DESSINÉE
+# =============================================================================
+class MatchRenderer:
+    """Dessine un replay image par image, comme Game.draw dans V8.py."""
+
+    def __init__(self, replay, width=SCREEN_WIDTH, height=SCREEN_HEIGHT, scale=DEFAULT_SCALE):
+        self.replay = replay
+        self.scale = scale
+        self.sim = replay.new_simulation()
+        pitch = self.sim.pitch
+        self.field = Framebuffer(pitch.width, pitch.height)
+        paint_field(self.field, pitch)
+        self.atlas = Framebuffer(ATLAS_SIZE, ATLAS_SIZE)
+        paint_sprites(self.atlas)
+        self.screen = Framebuffer(width, height)
+        self.camera = Camera(pitch, width, height)
+
+    @property
+    def size(self):
+        """(largeur, hauteur) des images produites."""
+        return self.screen.width * self.scale, self.screen.height * self.scale
+
+    def draw(self):
+        frame = capture(self.sim, 0.0)
+        screen, camera = self.screen, self.camera
+        ball_x, ball_y = frame.positions[0]
+        camera.follow(ball_x, ball_y)
+        screen.camera(camera.x, camera.y)
+        screen.blt(camera.x, camera.y, self.field, camera.x, camera.y, screen.width, screen.height)
+        if camera.visible(ball_x, ball_y, SPRITE_CENTER):
+            screen.blt(ball_x - SPRITE_CENTER, ball_y - SPRITE_CENTER, self.atlas, 0, BALL_ROW * SPRITE_CELL,
+                       SPRITE_SIZE, SPRITE_SIZE, SPRITE_COLKEY)
+        for player, (x, y) in zip(frame.players, frame.positions[1:]):
+            if camera.visible(x, y, SPRITE_CENTER):
+                u, v = player_sprite(player)
+                screen.blt(x - SPRITE_CENTER, y - SPRITE_CENTER, self.atlas, u, v,
+                           SPRITE_SIZE, SPRITE_SIZE, SPRITE_COLKEY)
+        return screen.rgb(self.scale)
+
+    def frames(self, start=0, end=None):
+        """Images RGB des images start à end (exclue) du match, une à la fois."""
+        end = len(self.replay) if end is None else min(end, len(self.replay))
+        self.replay.seek(self.sim, start)
+        self.camera.center_on(self.sim.ball.x, self.sim.ball.y)
+        while self.sim.frame < end:
+            yield self.draw()
+            self.replay.step(self.sim)
+
+    def highlights(self, before=HIGHLIGHT_BEFORE, after=HIGHLIGHT_AFTER):
+        """Images des extraits autour de chaque but (voir highlight_ranges)."""
+        goals = goal_frames(self.replay)
+        for start, end in highlight_ranges(goals, len(self.replay), before, after):
+            yield from self.frames(start, end)
+
+def goal_frames(replay):
+    """Pas de simulation après lesquels le score a changé (rejoue le match sans dessiner)."""
+    sim = replay.new_simulation()
+    goals = []
+    total = 0
+    while replay.step(sim):
+        score = sim.score['A'] + sim.score['B']
+        if score != total:
+            total = score
+            goals.append(sim.frame)
+    return goals
+
+def highlight_ranges(goals, length, before=HIGHLIGHT_BEFORE, after=HIGHLIGHT_AFTER):
+    """Intervalles [début, fin) autour des buts ; ceux qui se chevauchent sont fusionnés."""
+    ranges = []
+    for frame in goals:
+        start, end = max(0, frame - before), min(length, frame + after)
+        if ranges and start <= ranges[-1][1]:
+            ranges[-1] = (ranges[-1][0], max(ranges[-1][1], end))
+        else:
+            ranges.append((start, end))
+    return ranges
+
+# =============================================================================
+# ENCODAGE
+# =============================================================================
+def encode(frames, path, size, fps=SIM_HZ, ffmpeg='ffmpeg'):
+    """
+    Envoie les images RGB de frames (un itérable) à ffmpeg, qui écrit path.
+
+    Le format dépend de l'extension (.mp4, .webm, .gif...). Renvoie le
+    nombre d'images écrites.
+    """
+    executable = shutil.which(ffmpeg)
+    if executable is None:
+        raise RuntimeError(f"{ffmpeg} introuvable : il faut ffmpeg pour encoder la vidéo")
+    width, height = size
+    command = [executable, '-loglevel', 'error', '-y',
+               '-f', 'rawvideo', '-pix_fmt', 'rgb24', '-s', f"{width}x{height}", '-r', str(fps), '-i', '-']
+    if path.lower().endswith('.gif'):
+        command += ['-vf', 'split[a][b];[a]palettegen[p];[b][p]paletteuse']
+    else:
+        command += ['-pix_fmt', 'yuv420p']
+    command.append(path)
+    count = 0
+    broken = False
+    # Messages d'erreur de ffmpeg dans un fichier : un tube plein le bloquerait
+    with tempfile.TemporaryFile() as errors:
+        process = subprocess.Popen(command, stdin=subprocess.PIPE, stderr=errors)
+        try:
+            for image in frames:
+                process.stdin.write(image.tobytes())
+                count += 1
+        except BrokenPipeError:
+            # ffmpeg s'est arrêté avant la fin : son code et son message disent pourquoi
+            broken = True
+        finally:
+            try:
+                process.stdin.close()
+            except BrokenPipeError:
+                broken = True
+            process.wait()
+        if broken or process.returncode != 0:
+            errors.seek(0)
+            message = errors.read().decode(errors='replace').strip()
+            detail = f" : {message}" if message else ""
+            raise RuntimeError(f"ffmpeg a échoué (code {process.returncode}){detail}")
+    return count
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export vidéo d'un match enregistré (sans fenêtre)")
+    parser.add_argument('replay', help="fichier .frpl")
+    parser.add_argument('output', help="vidéo à écrire (.mp4, .webm, .gif...)")
+    parser.add_argument('--highlights', action='store_true', help="seulement les extraits autour des buts")
+    parser.add_argument('--before', type=float, default=HIGHLIGHT_BEFORE / SIM_HZ,
+                        help="secondes gardées avant chaque but")
+    parser.add_argument('--after', type=float, default=HIGHLIGHT_AFTER / SIM_HZ,
+                        help="secondes gardées après chaque but")
+    parser.add_argument('--scale', type=int, default=DEFAULT_SCALE, help="agrandissement des pixels")
+    parser.add_argument('--ffmpeg', default='ffmpeg', help="chemin de ffmpeg")
+    args = parser.parse_args(argv)
+    renderer = MatchRenderer(Replay.load(args.replay), scale=args.scale)
+    if args.highlights:
+        frames = renderer.highlights(round(args.before * SIM_HZ), round(args.after * SIM_HZ))
+    else:
+        frames = renderer.frames()
+    try:
+        count = encode(frames, args.output, renderer.size, ffmpeg=args.ffmpeg)
+    except RuntimeError as error:
+        print(error, file=sys.stderr)
+        return 1
+    print(f"{count} images écrites dans {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,194 @@
+import struct
+import sys
+import zlib
+from array import array
+
+from inputs import as_mask, unpack
+from policy import BUILTIN_AI, make_policies
+from simulation import Simulation
+
+# =============================================================================
+# ENREGISTREMENT ET RELECTURE DES MATCHS
+# =============================================================================
+# La simulation est déterministe : les entrées de chaque image suffisent pour
+# rejouer un match. Chaque image est enregistrée sous forme de masque 16 bits
+# (voir inputs.py), plus 4 octets pour les sticks analogiques (analog.py),
+# presque toujours nuls quand on joue au clavier et donc très compressibles.
+# Avec deux joueurs humains par équipe, le masque passe à 32 bits et les
+# sticks à 8 octets.
+#
+# Pour ne pas tout resimuler depuis l'image 0 quand on saute à la fin d'un
+# long match, on garde aussi un instantané de l'état (Simulation.get_state)
+# toutes les SNAPSHOT_INTERVAL images. seek() repart de l'instantané le plus
+# proche puis rejoue au plus SNAPSHOT_INTERVAL images.
+#
+# Format du fichier (petit-boutiste) :
+#   en-tête : b"FRPL", version, équipe choisie, joueurs par équipe,
+#             drapeaux (bit 0 : gardiens, voir FLAG_KEEPERS ; bit 1 : deux
+#             joueurs humains par équipe, FLAG_TWO_SEATS ; 0 avant eux),
+#             nombre d'images, intervalle entre instantanés
+#   IA de A puis de B (depuis la version 3) : longueur (uint8) puis nom
+#             ASCII d'une politique de policy.py, vide pour l'IA intégrée
+#   corps compressé (zlib) :
+#             masques (uint16 x nombre d'images, uint32 avec deux places)
+#             sticks (int8 x 4 x nombre d'images, depuis la version 2 ;
+#             8 par image avec deux places)
+#             nombre d'instantanés, puis pour chacun :
+#             image, nombre de valeurs, valeurs (float64)
+
+MAGIC = b"FRPL"
+VERSION = 3
+VERSIONS = (1, 2, 3)         # La version 1 n'a pas de sticks, la 2 pas d'IA
+HEADER = struct.Struct("<4sBBBBII")
+SNAPSHOT_INTERVAL = 30 * 30    # Un instantané toutes les 30 secondes de jeu
+FLAG_KEEPERS = 1               # Match joué avec un gardien par équipe (Simulation(keepers=True))
+FLAG_TWO_SEATS = 2             # Deux joueurs humains par équipe (Simulation(seats=2))
+
+TEAM_CODES = {None: 0, 'A': 1, 'B': 2}
+TEAM_FROM_CODE = {code: team for team, code in TEAM_CODES.items()}
+
+def little_endian(values):
+    """Copie d'un array en ordre petit-boutiste (no-op sur x86 / ARM)."""
+    if sys.byteorder == 'big':
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values
+
+class Replay:
+    """Entrées et instantanés d'un match, en mémoire."""
+
+    def __init__(self, selected_team=None, players_per_side=4, snapshot_interval=SNAPSHOT_INTERVAL,
+                 keepers=False, seats=1, ai=None):
+        self.selected_team = selected_team
+        self.players_per_side = players_per_side
+        self.keepers = keepers
+        self.seats = seats
+        self.ai = ai or {'A': BUILTIN_AI, 'B': BUILTIN_AI}   # équipe -> nom (policy.POLICIES)
+        self.snapshot_interval = snapshot_interval
+        self.masks = array('H' if seats == 1 else 'I')
+        self.stick_count = 4 * seats  # Axes par image (voir inputs.pack_sticks)
+        self.sticks = array('b')
+        self.snapshots = {}          # image -> état (array('d'), voir snapshot.py)
+
+    def __len__(self):
+        return len(self.masks)
+
+    def new_simulation(self):
+        """Simulation dans l'état de l'image 0 de ce replay."""
+        return Simulation(self.selected_team, self.players_per_side, policies=make_policies(self.ai),
+                          keepers=self.keepers, seats=self.seats)
+
+    def inputs(self, frame):
+        """Entrées de l'image frame, au format de Simulation.step."""
+        count = self.stick_count
+        return unpack(self.masks[frame], self.sticks[count * frame:count * (frame + 1)])
+
+    def step(self, sim):
+        """Joue l'image suivante de sim à partir des entrées enregistrées ; False à la fin."""
+        if sim.frame >= len(self.masks):
+            return False
+        frame = sim.frame
+        count = self.stick_count
+        sim.step(self.masks[frame], self.sticks[count * frame:count * (frame + 1)])
+        return True
+
+    def seek(self, sim, frame):
+        """Amène sim à l'image frame en partant de l'instantané précédent le plus proche."""
+        frame = max(0, min(frame, len(self.masks)))
+        start = max((f for f in self.snapshots if f <= frame), default=None)
+        if start is not None and not (start <= sim.frame <= frame):
+            sim.set_state(self.snapshots[start])
+        if sim.frame > frame:
+            raise ValueError(f"Aucun instantané avant l'image {frame}")
+        while sim.frame < frame:
+            self.step(sim)
+
+    # -------------------------------------------------------------------------
+    # Fichier
+    # -------------------------------------------------------------------------
+    def save(self, path):
+        body = [little_endian(self.masks).tobytes(), self.sticks.tobytes(),
+                struct.pack("<I", len(self.snapshots))]
+        for frame in sorted(self.snapshots):
+            values = self.snapshots[frame]
+            body.append(struct.pack("<II", frame, len(values)))
+            body.append(little_endian(values).tobytes())
+        flags = (FLAG_KEEPERS if self.keepers else 0) | (FLAG_TWO_SEATS if self.seats == 2 else 0)
+        header = HEADER.pack(MAGIC, VERSION, TEAM_CODES[self.selected_team], self.players_per_side,
+                             flags, len(self.masks), self.snapshot_interval)
+        for team in ('A', 'B'):
+            name = b"" if self.ai[team] == BUILTIN_AI else self.ai[team].encode('ascii')
+            header += bytes([len(name)]) + name
+        with open(path, 'wb') as f:
+            f.write(header)
+            f.write(zlib.compress(b"".join(body), 9))
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            data = f.read()
+        magic, version, team, players, flags, frames, interval = HEADER.unpack_from(data)
+        if magic != MAGIC or version not in VERSIONS:
+            raise ValueError(f"{path} n'est pas un replay (version {VERSION})")
+        offset = HEADER.size
+        ai = {'A': BUILTIN_AI, 'B': BUILTIN_AI}
+        if version >= 3:
+            for side in ('A', 'B'):
+                size = data[offset]
+                ai[side] = data[offset + 1:offset + 1 + size].decode('ascii') or BUILTIN_AI
+                offset += 1 + size
+        replay = cls(TEAM_FROM_CODE[team], players, interval, keepers=bool(flags & FLAG_KEEPERS),
+                     seats=2 if flags & FLAG_TWO_SEATS else 1, ai=ai)
+        body = zlib.decompress(data[offset:])
+        offset = replay.masks.itemsize * frames
+        replay.masks.frombytes(body[:offset])
+        replay.masks = little_endian(replay.masks)
+        size = replay.stick_count * frames
+        if version >= 2:
+            replay.sticks.frombytes(body[offset:offset + size])
+            offset += size
+        else:
+            replay.sticks.frombytes(bytes(size))
+        (count,) = struct.unpack_from("<I", body, offset)
+        offset += 4
+        for _ in range(count):
+            frame, size = struct.unpack_from("<II", body, offset)
+            offset += 8
+            values = array('d')
+            values.frombytes(body[offset:offset + 8 * size])
+            replay.snapshots[frame] = little_endian(values)
+            offset += 8 * size
+        return replay
+
+class ReplayRecorder:
+    """
+    Enregistre un match pendant qu'il se joue.
+
+    À utiliser à la place de sim.step : les entrées passent par leur masque
+    avant d'être jouées, ce qui garantit que le replay suit exactement le
+    même chemin que le match en direct. Si path est donné, le fichier est
+    réécrit à chaque instantané (et par save()).
+    """
+
+    def __init__(self, sim, selected_team=None, players_per_side=4, path=None,
+                 snapshot_interval=SNAPSHOT_INTERVAL):
+        self.sim = sim
+        self.path = path
+        ai = {team: BUILTIN_AI for team in ('A', 'B')}
+        ai.update((team, policy.name) for team, policy in sim.policies.items())
+        self.replay = Replay(selected_team, players_per_side, snapshot_interval, keepers=sim.keepers,
+                             seats=sim.seats, ai=ai)
+        self.replay.snapshots[sim.frame] = array('d', sim.get_state())
+
+    def step(self, inputs=None, sticks=None):
+        mask, sticks = as_mask(inputs, sticks)
+        self.replay.masks.append(mask)
+        self.replay.sticks.extend(sticks[:self.replay.stick_count])
+        self.sim.step(mask, sticks)
+        if self.sim.frame % self.replay.snapshot_interval == 0:
+            self.replay.snapshots[self.sim.frame] = array('d', self.sim.get_state())
+            if self.path:
+                self.save()
+
+    def save(self, path=None):
+        self.replay.save(path or self.path)
@@ -0,0 +1,103 @@
+import atexit
+import threading
+import time
+from collections import namedtuple
+
+from timestep import FixedTimestep, SIM_DT, lerp_positions
+
+# =============================================================================
+# SIMULATION DANS SON PROPRE THREAD
+# =============================================================================
+# Le thread de simulation avance le match à pas fixe (FixedTimestep) et,
+# après chaque pas, publie une image figée (Frame) : positions, drapeaux des
+# joueurs, score. Le dessin ne lit que ces images, jamais les objets de la
+# simulation qui changent pendant ce temps.
+#
+# Double tampon sans verrou : self.frames est un couple (précédente, courante)
+# de tuples immuables, remplacé d'un seul coup par le thread. Une affectation
+# d'attribut est atomique en Python : le dessin lit toujours un couple
+# cohérent, au pire une image en retard.
+#
+# Les entrées vont dans l'autre sens de la même façon : le thread principal
+# remplace self.inputs par un nouveau triplet (numéro, masque, sticks), et le
+# thread note dans self.seen le numéro des dernières entrées jouées.
+#
+# Le GIL empêche le code Python des deux threads de tourner en même temps ;
+# on gagne surtout un affichage régulier quand un pas de simulation est long,
+# et du vrai parallélisme pour le code qui libère le GIL (numpy, vectorized.py).
+
+PlayerView = namedtuple('PlayerView', 'team controlled has_ball facing')
+Frame = namedtuple('Frame', 'frame time resets score positions players')
+
+def capture(sim, now):
+    """Image figée de sim (voir Frame)."""
+    return Frame(sim.frame, now, sim.resets, (sim.score['A'], sim.score['B']),
+                 tuple(sim.positions()),
+                 tuple(PlayerView(p.team, p.controlled, p.has_ball, p.facing) for p in sim.players()))
+
+class SimulationThread:
+    """
+    Fait tourner sim dans un thread. step remplace sim.step (par exemple
+    ReplayRecorder.step) et reçoit (masque, sticks) à chaque pas.
+    """
+
+    def __init__(self, sim, step=None, dt=SIM_DT, clock=time.perf_counter):
+        self.sim = sim
+        self.dt = dt
+        self.clock = clock
+        self.inputs = (0, 0, None)
+        self.sequence = 0
+        self.seen = 0
+        self.timestep = FixedTimestep(sim, dt, clock=clock, step=self.play)
+        self.step = step or sim.step
+        first = capture(sim, clock())
+        self.frames = (first, first)
+        self.thread = None
+        self.running = False
+
+    def publish(self, mask, sticks=None):
+        """Entrées à jouer aux prochains pas (appelé par le thread principal)."""
+        self.sequence += 1
+        self.inputs = (self.sequence, mask, sticks)
+
+    def inputs_seen(self):
+        """Vrai si les dernières entrées publiées ont été jouées par au moins un pas."""
+        return self.seen == self.sequence
+
+    def play(self, inputs, sticks):
+        self.step(inputs, sticks)
+        self.frames = (self.frames[1], capture(self.sim, self.clock()))
+
+    def start(self):
+        if self.thread is None:
+            self.running = True
+            self.thread = threading.Thread(target=self.run, name="simulation", daemon=True)
+            self.thread.start()
+            atexit.register(self.stop)
+
+    def stop(self):
+        self.running = False
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def run(self):
+        while self.running:
+            sequence, mask, sticks = self.inputs
+            if self.timestep.advance(mask, sticks):
+                self.seen = sequence
+            # Dort jusqu'au prochain pas
+            time.sleep(max(0.0, self.dt - self.timestep.accumulator))
+
+    def view(self):
+        """
+        (positions interpolées, PlayerView des joueurs, score) de la dernière
+        image publiée, pour le dessin.
+        """
+        prev, curr = self.frames
+        if curr.resets != prev.resets:
+            positions = curr.positions
+        else:
+            alpha = min(1.0, (self.clock() - curr.time) / self.dt)
+            positions = lerp_positions(prev.positions, curr.positions, alpha)
+        return positions, curr.players, curr.score
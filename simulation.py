@@ -0,0 +1,800 @@
+import math
+import time
+
+from inputs import ACTIONS, KEY_BITS, NO_STICKS, STICK_INDEX, STICK_MAX, as_mask, pressed, seat
+from spatial import UniformGrid
+
+# =============================================================================
+# MOTEUR DE SIMULATION SANS AFFICHAGE (HEADLESS)
+# =============================================================================
+# Cette version reprend la logique de Ball, Player et Team de V8.py sans
+# dépendre de pyxel ni de pygame : un match avance image par image avec
+# Simulation.step(inputs), sans fenêtre ni serveur X. V8.py s'en sert pour le
+# jeu normal, et on peut l'utiliser directement pour simuler des matchs en
+# série, régler l'IA ou vérifier la physique.
+
+# =============================================================================
+# CONSTANTES ET CONFIGURATION
+# =============================================================================
+SCREEN_WIDTH = 256     # Taille de la fenêtre, et du terrain à 4 contre 4 (voir Pitch)
+SCREEN_HEIGHT = 192
+
+# Vitesse et physique
+BALL_SPEED = 3.0       # Vitesse de base de la balle
+PLAYER_SPEED = 2.0     # Vitesse de déplacement des joueurs
+FRICTION = 0.98        # Coefficient de friction appliqué à la balle
+BALL_STOP_SPEED = 0.1  # Sous cette vitesse (sur chaque axe), la balle s'arrête
+MAX_PLAYER_STEP = PLAYER_SPEED * math.sqrt(2)  # Déplacement maximal d'un joueur en une image (diagonale)
+
+# Rayons pour les collisions
+BALL_RADIUS = 3
+PLAYER_RADIUS = 4
+
+# Couleurs (indices de 0 à 15 dans Pyxel)
+TEAM_A_COLOR = 8
+TEAM_B_COLOR = 12
+FIELD_COLOR = 11
+BACKGROUND_COLOR = 3
+GOAL_COLOR = 7
+
+# Marges du terrain
+FIELD_MARGIN = 5
+
+# Dimensions des buts
+GOAL_WIDTH = 12
+GOAL_HEIGHT = 40
+
+# Mappages pour les deux équipes (clés des dictionnaires d'entrées)
+TEAM_A_KEYS = {
+    'up':    "A_UP",
+    'down':  "A_DOWN",
+    'left':  "A_LEFT",
+    'right': "A_RIGHT",
+    'pass':  "A_PASS",
+    'shoot': "A_SHOOT",
+    'select':"A_SELECT",
+    'stick_x':"A_STICK_X",
+    'stick_y':"A_STICK_Y"
+}
+
+TEAM_B_KEYS = {
+    'up':    "B_UP",
+    'down':  "B_DOWN",
+    'left':  "B_LEFT",
+    'right': "B_RIGHT",
+    'pass':  "B_PASS",
+    'shoot': "B_SHOOT",
+    'select':"B_SELECT",
+    'stick_x':"B_STICK_X",
+    'stick_y':"B_STICK_Y"
+}
+
+def seat_keys(name):
+    """Mappage d'une place de joueur humain ('A2', 'B2', voir inputs.SEATS), sur le modèle de TEAM_A_KEYS."""
+    keys = {action.lower(): f"{name}_{action}" for action in ACTIONS}
+    keys['stick_x'] = f"{name}_STICK_X"
+    keys['stick_y'] = f"{name}_STICK_Y"
+    return keys
+
+# Frappes demandées par une politique d'IA (voir policy.py)
+KICK_NONE = 0
+KICK_SHOOT = 1
+KICK_PASS = 2
+
+# Positions de départ (x, y) de chaque équipe
+TEAM_A_POSITIONS = [(30, 50), (50, 70), (30, 100), (50, 130)]
+TEAM_B_POSITIONS = [(220, 50), (200, 70), (220, 100), (200, 130)]
+
+# =============================================================================
+# TERRAIN
+# =============================================================================
+class Pitch:
+    """
+    Dimensions du terrain en coordonnées du monde (pixels).
+
+    Le terrain peut être plus grand que la fenêtre : V8.py le suit alors avec
+    une caméra. Les valeurs par équipe sont des couples (équipe A, équipe B).
+    """
+
+    def __init__(self, width=SCREEN_WIDTH, height=SCREEN_HEIGHT):
+        self.width = width
+        self.height = height
+        self.center_x = width // 2
+        self.center_y = height // 2
+        self.goal_top = (height - GOAL_HEIGHT) // 2
+        self.goal_bottom = self.goal_top + GOAL_HEIGHT
+        # Bornes du centre d'un joueur
+        self.min_x = FIELD_MARGIN + PLAYER_RADIUS
+        self.max_x = width - FIELD_MARGIN - PLAYER_RADIUS
+        self.min_y = FIELD_MARGIN + PLAYER_RADIUS
+        self.max_y = height - FIELD_MARGIN - PLAYER_RADIUS
+        # Ligne d'attaque de l'IA, point visé par les tirs et place du gardien
+        self.attack_x = (width - FIELD_MARGIN - GOAL_WIDTH - 10, FIELD_MARGIN + GOAL_WIDTH + 10)
+        self.shot_x = (width - FIELD_MARGIN - GOAL_WIDTH // 2, FIELD_MARGIN + GOAL_WIDTH // 2)
+        self.keeper_x = (FIELD_MARGIN + PLAYER_RADIUS + 2, width - FIELD_MARGIN - PLAYER_RADIUS - 2)
+
+    def is_default(self):
+        return self.width == SCREEN_WIDTH and self.height == SCREEN_HEIGHT
+
+def pitch_for(players_per_side):
+    """
+    Terrain adapté au nombre de joueurs : celui de V8.py (la taille de
+    l'écran) jusqu'à 4 contre 4, puis une surface proportionnelle au nombre
+    de joueurs (432 x 320 à 11 contre 11), arrondie à 16 pixels.
+    """
+    scale = max(1.0, math.sqrt(players_per_side / 4))
+    return Pitch(int(round(SCREEN_WIDTH * scale / 16)) * 16, int(round(SCREEN_HEIGHT * scale / 16)) * 16)
+
+def formation(team, count, pitch=None):
+    """
+    Positions de départ de count joueurs pour une équipe.
+
+    Avec 4 joueurs on retrouve la disposition de V8.py ; au-delà, les joueurs
+    sont rangés en colonnes de 4 dans leur propre moitié (11 contre 11, etc.).
+    """
+    pitch = pitch or pitch_for(count)
+    base = TEAM_A_POSITIONS if team == 'A' else TEAM_B_POSITIONS
+    if count == len(base) and pitch.is_default():
+        return list(base)
+    columns = (count + 3) // 4
+    positions = []
+    for i in range(count):
+        column = i // 4
+        rows = min(4, count - column * 4)
+        row = i % 4
+        x = 30 + column * (pitch.width // 2 - 50) // max(1, columns - 1) if columns > 1 else 30
+        y = FIELD_MARGIN + (row + 1) * (pitch.height - 2 * FIELD_MARGIN) // (rows + 1)
+        if team == 'B':
+            x = pitch.width - x
+        positions.append((x, y))
+    return positions
+
+def lineup(team, count, pitch, keepers=False):
+    """
+    (positions, indice du gardien) d'une équipe : formation(), et si keepers,
+    le joueur le plus proche de son but devient gardien et prend sa place
+    devant le but (sinon l'indice vaut None).
+    """
+    positions = formation(team, count, pitch)
+    if not keepers:
+        return positions, None
+    side = 0 if team == 'A' else 1
+    goal_x = 0 if team == 'A' else pitch.width
+    keeper = min(range(count), key=lambda i: abs(positions[i][0] - goal_x) + abs(positions[i][1] - pitch.center_y))
+    positions[keeper] = (pitch.keeper_x[side], pitch.center_y)
+    return positions, keeper
+
+def shot_crossing(ball_x, ball_y, vx, vy, line_x, friction=FRICTION):
+    """
+    Hauteur à laquelle la balle franchira la ligne x = line_x, ou None si
+    elle ne va pas vers elle ou s'arrête avant.
+
+    Forme close : en n images la balle parcourt v * (1 - friction ** n) /
+    (1 - friction). Elle atteint la ligne quand friction ** n vaut
+    1 - (line_x - ball_x) * (1 - friction) / vx, s'il lui reste alors assez
+    de vitesse pour ne pas s'arrêter (Ball.update). Hors rebonds, la
+    trajectoire est droite : la hauteur ne dépend pas de n.
+    """
+    distance = line_x - ball_x
+    if vx == 0 or distance * vx <= 0:
+        return None
+    remaining = 1.0 - distance * (1.0 - friction) / vx
+    if remaining * max(abs(vx), abs(vy)) < BALL_STOP_SPEED:
+        return None
+    return ball_y + vy * distance / vx
+
+def crossing_frames(ball_x, vx, line_x, friction=FRICTION):
+    """Images (non entières) avant que la balle n'atteigne la ligne x = line_x, quand shot_crossing la trouve."""
+    return math.log(1.0 - (line_x - ball_x) * (1.0 - friction) / vx) / math.log(friction)
+
+def ball_intercept(ball_x, ball_y, vx, vy, x, y, step, friction=FRICTION):
+    """
+    Première image où un joueur en (x, y), qui avance de step par image, peut
+    toucher la balle, et le point où il la touche : intercept.intercept pour
+    un seul joueur, image par image (simulation.py reste sans NumPy).
+    """
+    reach = PLAYER_RADIUS + BALL_RADIUS
+    fastest = max(abs(vx), abs(vy))
+    stop = 0
+    if fastest > 0:
+        stop = max(math.ceil(math.log(BALL_STOP_SPEED / fastest) / math.log(friction)), 1)
+    frames = 0
+    while True:
+        travel = (1.0 - friction ** min(frames, stop)) / (1.0 - friction)
+        meet_x = ball_x + vx * travel
+        meet_y = ball_y + vy * travel
+        gap = math.hypot(meet_x - x, meet_y - y)
+        if gap <= step * frames + reach:
+            return frames, meet_x, meet_y
+        if frames >= stop:
+            # Balle arrêtée : il la rejoint là où elle est
+            return max(stop, math.ceil((gap - reach) / step)), meet_x, meet_y
+        frames += 1
+
+# --- Fonctions d'aide pour tester l'état d'une touche ---
+# Les entrées d'une image sont un masque de bits (voir inputs.py) : btn lit
+# une touche dans le masque, btnp dans le masque des fronts montants.
+def btn(mask, key):
+    return mask & KEY_BITS[key] != 0
+
+def btnp(pressed_mask, key):
+    return pressed_mask & KEY_BITS[key] != 0
+
+def move_step(mask, sticks, keys):
+    """
+    Déplacement (dx, dy) d'un joueur contrôlé pour une image : proportionnel
+    au stick analogique s'il est incliné, sinon PLAYER_SPEED dans l'une des
+    8 directions des touches.
+    """
+    sx = sticks[STICK_INDEX[keys['stick_x']]]
+    sy = sticks[STICK_INDEX[keys['stick_y']]]
+    if sx or sy:
+        return sx * PLAYER_SPEED / STICK_MAX, sy * PLAYER_SPEED / STICK_MAX
+    dx = 0
+    dy = 0
+    if btn(mask, keys['left']):
+        dx -= PLAYER_SPEED
+    if btn(mask, keys['right']):
+        dx += PLAYER_SPEED
+    if btn(mask, keys['up']):
+        dy -= PLAYER_SPEED
+    if btn(mask, keys['down']):
+        dy += PLAYER_SPEED
+    return dx, dy
+
+# =============================================================================
+# CLASSE BALL
+# =============================================================================
+class Ball:
+    def __init__(self, match):
+        self.match = match
+        self.reset()
+
+    def reset(self):
+        """Replace la balle au centre du terrain avec une vélocité nulle."""
+        self.x = self.match.pitch.center_x
+        self.y = self.match.pitch.center_y
+        self.vx = 0
+        self.vy = 0
+        self.radius = BALL_RADIUS
+        self.in_pass = False
+        self.pass_receiver = None
+        self.cooldown = 0
+
+    def update(self):
+        """Déplace la balle, applique la friction, gère les buts et les rebonds."""
+        self.x += self.vx
+        self.y += self.vy
+        self.vx *= FRICTION
+        self.vy *= FRICTION
+        if self.cooldown > 0:
+            self.cooldown -= 1
+        if abs(self.vx) < BALL_STOP_SPEED and abs(self.vy) < BALL_STOP_SPEED:
+            self.vx = 0
+            self.vy = 0
+            self.in_pass = False
+            self.pass_receiver = None
+        pitch = self.match.pitch
+        goal_top = pitch.goal_top
+        goal_bottom = pitch.goal_bottom
+        if self.x - self.radius < 0:
+            if goal_top <= self.y <= goal_bottom:
+                self.match.score['B'] += 1
+                self.match.reset_positions()
+                return
+            else:
+                self.vx = abs(self.vx) * 0.7
+                self.x = self.radius
+        if self.x + self.radius > pitch.width:
+            if goal_top <= self.y <= goal_bottom:
+                self.match.score['A'] += 1
+                self.match.reset_positions()
+                return
+            else:
+                self.vx = -abs(self.vx) * 0.7
+                self.x = pitch.width - self.radius
+        if self.y - self.radius < FIELD_MARGIN:
+            self.vy = abs(self.vy) * 0.7
+            self.y = self.radius + FIELD_MARGIN
+        if self.y + self.radius > pitch.height - FIELD_MARGIN:
+            self.vy = -abs(self.vy) * 0.7
+            self.y = pitch.height - self.radius - FIELD_MARGIN
+
+# =============================================================================
+# CLASSE PLAYER
+# =============================================================================
+class Player:
+    def __init__(self, x, y, team, keys=None, is_keeper=False, controlled=False):
+        self.x = x
+        self.y = y
+        self.team = team            # 'A' ou 'B'
+        self.keys = keys            # Mapping personnalisé (voir TEAM_A_KEYS / TEAM_B_KEYS)
+        self.is_keeper = is_keeper
+        self.controlled = controlled  # Contrôlé par l'humain
+        self.radius = PLAYER_RADIUS
+        self.has_ball = False
+        self.facing = (0, 0)
+        self.default_x = x
+        self.default_y = y
+        self.match = None           # Renseigné par Team.add_player
+        self.action = None          # (cible x, cible y, frappe, receveur, point visé) si l'équipe a une politique (policy.py)
+
+    def update(self, ball, teammates, opponents):
+        self.check_ball_collision(ball)
+        if self.controlled and self.keys is not None:
+            self.handle_input(ball)
+        elif self.action is not None:
+            self.follow_action(ball, self.action)
+        else:
+            self.ai_behavior(ball, teammates, opponents)
+        pitch = self.match.pitch
+        self.x = max(FIELD_MARGIN + self.radius, min(self.x, pitch.width - FIELD_MARGIN - self.radius))
+        self.y = max(FIELD_MARGIN + self.radius, min(self.y, pitch.height - FIELD_MARGIN - self.radius))
+        if self.has_ball:
+            ball.x = self.x
+            ball.y = self.y
+            ball.vx = 0
+            ball.vy = 0
+
+    def check_ball_collision(self, ball):
+        if ball.cooldown > 0 and ball.pass_receiver != self:
+            self.has_ball = False
+            return
+        distance = math.hypot(self.x - ball.x, self.y - ball.y)
+        if distance < self.radius + ball.radius:
+            if ball.in_pass and ball.pass_receiver is not None:
+                if ball.pass_receiver == self:
+                    self.has_ball = True
+                    ball.in_pass = False
+                    ball.pass_receiver = None
+                    ball.vx = 0
+                    ball.vy = 0
+                elif self.team != ball.pass_receiver.team:
+                    self.has_ball = True
+                    ball.in_pass = False
+                    ball.pass_receiver = None
+                    ball.vx = 0
+                    ball.vy = 0
+                else:
+                    self.has_ball = False
+            else:
+                self.has_ball = True
+                ball.vx = 0
+                ball.vy = 0
+        else:
+            self.has_ball = False
+
+    def handle_input(self, ball):
+        match = self.match
+        dx, dy = move_step(match.mask, match.sticks, self.keys)
+        if dx != 0 or dy != 0:
+            self.facing = (dx, dy)
+        self.x += dx
+        self.y += dy
+        if self.has_ball:
+            if btnp(match.pressed, self.keys['pass']):
+                self.pass_ball(ball)
+            elif btnp(match.pressed, self.keys['shoot']):
+                self.shoot_ball(ball)
+
+    def pass_ball(self, ball, receiver=None, target=None):
+        """
+        Passe à receiver (par défaut le coéquipier le plus proche), vers le
+        point target (par défaut sa position ; une politique vise devant lui).
+        """
+        if receiver is None:
+            best_mate = self.match.grids[self.team].nearest(self.x, self.y, exclude=self)
+        else:
+            best_mate = receiver
+        if best_mate is not None:
+            target_x, target_y = target if target is not None else (best_mate.x, best_mate.y)
+            dx = target_x - self.x
+            dy = target_y - self.y
+            d = math.hypot(dx, dy)
+            if d != 0:
+                ball.vx = (dx / d) * BALL_SPEED * 1.2
+                ball.vy = (dy / d) * BALL_SPEED * 1.2
+            ball.in_pass = True
+            ball.pass_receiver = best_mate
+            ball.cooldown = 10
+            if self.controlled and not best_mate.controlled:
+                # Le contrôle humain suit la balle (une passe de l'IA ne le donne pas).
+                # Vers le joueur d'un coéquipier humain, chacun garde le sien.
+                best_mate.controlled = True
+                best_mate.keys = self.keys
+                self.controlled = False
+                self.keys = None
+            self.has_ball = False
+
+    def shoot_ball(self, ball):
+        pitch = self.match.pitch
+        if self.team == 'A':
+            goal_x = pitch.width - FIELD_MARGIN - GOAL_WIDTH // 2
+        else:
+            goal_x = FIELD_MARGIN + GOAL_WIDTH // 2
+        goal_y = pitch.height // 2
+        dx = goal_x - self.x
+        dy = goal_y - self.y
+        d = math.hypot(dx, dy)
+        if d != 0:
+            ball.vx = (dx / d) * BALL_SPEED * 1.5
+            ball.vy = (dy / d) * BALL_SPEED * 1.5
+            ball.in_pass = True
+            ball.pass_receiver = None
+            ball.cooldown = 10
+            self.has_ball = False
+
+    def ai_behavior(self, ball, teammates, opponents):
+        if self.is_keeper:
+            self.keeper_behavior(ball)
+            return
+        if self.match.team_has_possession(self.team):
+            if self.team == 'A':
+                target_x = self.match.pitch.width - FIELD_MARGIN - GOAL_WIDTH - 10
+            else:
+                target_x = FIELD_MARGIN + GOAL_WIDTH + 10
+            target_y = self.y
+        else:
+            target_x = self.default_x
+            target_y = self.default_y
+        self.move_towards(target_x, target_y)
+
+    def keeper_behavior(self, ball):
+        """
+        Gardien IA : relance dès qu'il a la balle. Sur un tir cadré, va au-devant
+        de la balle s'il peut la toucher avant qu'elle ne franchisse sa ligne
+        (ball_intercept), sinon va le long de sa ligne là où elle la franchira
+        (shot_crossing). Hors tir, se met à la hauteur de la balle, sans
+        quitter son but.
+        """
+        pitch = self.match.pitch
+        line_x = pitch.keeper_x[0 if self.team == 'A' else 1]
+        if self.has_ball:
+            self.distribute(ball)
+        target_y = shot_crossing(ball.x, ball.y, ball.vx, ball.vy, line_x)
+        if target_y is not None and pitch.goal_top <= target_y <= pitch.goal_bottom:
+            frames, meet_x, meet_y = ball_intercept(ball.x, ball.y, ball.vx, ball.vy,
+                                                    self.x, self.y, PLAYER_SPEED * 0.6)
+            # Pas avant la fin du délai où la balle frappée ne peut pas être touchée
+            if ball.cooldown <= frames <= crossing_frames(ball.x, ball.vx, line_x):
+                self.move_towards(meet_x, meet_y, stop=True)
+                return
+        if target_y is None:
+            target_y = ball.y
+        target_y = max(pitch.goal_top, min(target_y, pitch.goal_bottom))
+        self.move_towards(line_x, target_y, stop=True)
+
+    def distribute(self, ball):
+        """Relance du gardien : passe au coéquipier le plus éloigné de tout adversaire."""
+        match = self.match
+        rivals = match.grids['B' if self.team == 'A' else 'A']
+        best_mate = None
+        best_gap = -1.0
+        for mate in match.teams[self.team].players:
+            if mate is self:
+                continue
+            rival = rivals.nearest(mate.x, mate.y)
+            gap = math.hypot(rival.x - mate.x, rival.y - mate.y) if rival is not None else math.inf
+            if gap > best_gap:
+                best_mate = mate
+                best_gap = gap
+        if best_mate is not None:
+            self.pass_ball(ball, best_mate)
+
+    def follow_action(self, ball, action):
+        """Applique l'action choisie par la politique de l'équipe (policy.py)."""
+        target_x, target_y, kick, receiver, target = action
+        if self.has_ball:
+            if kick == KICK_SHOOT:
+                self.shoot_ball(ball)
+            elif kick == KICK_PASS:
+                self.pass_ball(ball, receiver, target)
+        self.move_towards(target_x, target_y, stop=True)
+
+    def move_towards(self, target_x, target_y, stop=False):
+        """
+        Pas de l'IA vers la cible. Avec stop (gardien, politiques), le joueur
+        s'arrête sur sa cible au lieu de la dépasser : il l'attend sans
+        osciller autour, et les moteurs (batch.py) restent d'accord entre eux.
+        """
+        if stop and math.hypot(target_x - self.x, target_y - self.y) < PLAYER_SPEED * 0.6:
+            self.x, self.y = target_x, target_y
+            return
+        angle = math.atan2(target_y - self.y, target_x - self.x)
+        self.x += math.cos(angle) * PLAYER_SPEED * 0.6
+        self.y += math.sin(angle) * PLAYER_SPEED * 0.6
+
+# =============================================================================
+# CLASSE TEAM
+# =============================================================================
+class Team:
+    def __init__(self, team, keys, match=None, seats=1):
+        self.team = team
+        self.keys = keys
+        self.match = match
+        self.players = []
+        # Une place par joueur humain de l'équipe : ses touches et le joueur qu'il a choisi
+        self.seats = [keys] + [seat_keys(seat(team, slot)) for slot in range(1, seats)]
+        self.selected = list(range(seats))
+
+    @property
+    def selected_index(self):
+        return self.selected[0]
+
+    @selected_index.setter
+    def selected_index(self, index):
+        self.selected[0] = index
+
+    def add_player(self, player):
+        player.match = self.match
+        self.players.append(player)
+
+    def cycle_player(self, slot=0):
+        keys = self.seats[slot]
+        index = (self.selected[slot] + 1) % len(self.players)
+        # On saute le joueur d'un coéquipier humain
+        while self.players[index].controlled and self.players[index].keys is not keys:
+            index = (index + 1) % len(self.players)
+        self.selected[slot] = index
+        for i, player in enumerate(self.players):
+            if i == index:
+                player.controlled = True
+                player.keys = keys
+            elif player.keys is keys:
+                player.controlled = False
+                player.keys = None
+
+    def update_selection(self):
+        # On gère le changement de joueur sur le front montant du bouton "select" de chaque place
+        for slot, keys in enumerate(self.seats):
+            if btnp(self.match.pressed, keys['select']):
+                self.cycle_player(slot)
+
+# =============================================================================
+# CLASSE SIMULATION
+# =============================================================================
+class Simulation:
+    """
+    État complet d'un match (balle, équipes, score) sans aucun affichage.
+
+    selected_team reprend le choix de l'écran de sélection de V8.py :
+      - 'A'  : un joueur contrôlé dans chaque équipe
+      - 'B'  : seule l'équipe B est contrôlée
+      - None : les deux équipes sont jouées par l'IA
+
+    players_per_side fixe la taille des équipes (4 comme dans V8.py par défaut)
+    et, sauf si pitch est donné, celle du terrain (pitch_for).
+
+    policies donne éventuellement une politique d'IA par équipe
+    ({'A': policy.ZonePolicy()}) ; sans politique, les joueurs IA suivent
+    Player.ai_behavior.
+
+    keepers : chaque équipe a un gardien (voir lineup et
+    Player.keeper_behavior).
+
+    seats : nombre de joueurs humains par équipe contrôlée (1 ou 2), chacun
+    avec ses touches (inputs.SEATS) et son propre joueur.
+    """
+
+    def __init__(self, selected_team=None, players_per_side=4, pitch=None, policies=None, keepers=False,
+                 seats=1):
+        self.pitch = pitch or pitch_for(players_per_side)
+        self.policies = dict(policies or {})
+        self.keepers = keepers
+        self.seats = seats
+        self.ball = Ball(self)
+        self.teams = {}
+        self.teams['A'] = Team('A', TEAM_A_KEYS, self, seats)
+        self.teams['B'] = Team('B', TEAM_B_KEYS, self, seats)
+        self.score = {'A': 0, 'B': 0}
+        self.frame = 0
+        self.resets = 0             # Nombre de remises en jeu (pour l'interpolation)
+        # Entrées de l'image courante et de la précédente (masques, voir inputs.py)
+        self.mask = 0
+        self.prev_mask = 0
+        self.pressed = 0            # Fronts montants de l'image courante
+        self.sticks = NO_STICKS
+        # Grilles de proximité (une par équipe), reconstruites à chaque image
+        self.grids = {team: UniformGrid(self.pitch.width, self.pitch.height, slack=MAX_PLAYER_STEP)
+                      for team in ('A', 'B')}
+        self.setup_teams(selected_team, players_per_side, keepers)
+        self.rebuild_grids()
+
+    def setup_teams(self, selected_team, players_per_side=4, keepers=False):
+        # La place i d'une équipe contrôlée commence avec le joueur i
+        seats = self.teams['A'].seats
+        positions, keeper = lineup('A', players_per_side, self.pitch, keepers)
+        for i, (x, y) in enumerate(positions):
+            controlled = (i < len(seats) and selected_team == 'A')
+            keys = seats[i] if controlled else None
+            self.teams['A'].add_player(Player(x, y, 'A', keys, is_keeper=(i == keeper), controlled=controlled))
+        seats = self.teams['B'].seats
+        positions, keeper = lineup('B', players_per_side, self.pitch, keepers)
+        for i, (x, y) in enumerate(positions):
+            controlled = (i < len(seats) and selected_team is not None)
+            keys = seats[i] if controlled else None
+            self.teams['B'].add_player(Player(x, y, 'B', keys, is_keeper=(i == keeper), controlled=controlled))
+
+    def rebuild_grids(self):
+        for team_id, team in self.teams.items():
+            self.grids[team_id].rebuild(team.players)
+
+    def players_near(self, team, x, y, radius):
+        """Joueurs de l'équipe team à moins de radius de (x, y)."""
+        return self.grids[team].within(x, y, radius)
+
+    def players_touching_ball(self):
+        """Joueurs (des deux équipes) assez proches pour toucher la balle."""
+        reach = PLAYER_RADIUS + BALL_RADIUS
+        return (self.grids['A'].within(self.ball.x, self.ball.y, reach)
+                + self.grids['B'].within(self.ball.x, self.ball.y, reach))
+
+    def team_has_possession(self, team):
+        for player in self.teams[team].players:
+            if player.has_ball:
+                return True
+        return False
+
+    def step(self, inputs=None, sticks=None):
+        """
+        Avance le match d'une image.
+
+        inputs est soit le masque de l'image (inputs.pack) et sticks ses
+        axes (inputs.pack_sticks), soit un dictionnaire {'A': {...}, 'B': {...}}
+        de clés "A_LEFT", "A_STICK_X"... (ex: {'A': {"A_LEFT": True}}).
+        """
+        self.prev_mask = self.mask
+        self.mask, self.sticks = as_mask(inputs, sticks)
+        self.pressed = pressed(self.mask, self.prev_mask)
+        self.teams['A'].update_selection()
+        self.teams['B'].update_selection()
+        self.rebuild_grids()
+        for team, policy in self.policies.items():
+            policy.decide(self, team)
+        for team in self.teams.values():
+            for player in team.players:
+                teammates = team.players
+                opponents = self.teams['B'].players if team.team == 'A' else self.teams['A'].players
+                player.update(self.ball, teammates, opponents)
+        self.ball.update()
+        if self.ball.x - self.ball.radius < 0:
+            self.score['B'] += 1
+            self.reset_positions()
+        elif self.ball.x + self.ball.radius > self.pitch.width:
+            self.score['A'] += 1
+            self.reset_positions()
+        self.frame += 1
+
+    def run(self, frames, inputs=None):
+        """Avance le match de plusieurs images avec les mêmes entrées."""
+        mask, sticks = as_mask(inputs)
+        for _ in range(frames):
+            self.step(mask, sticks)
+
+    def players(self):
+        """Tous les joueurs, équipe A puis équipe B (ordre de mise à jour)."""
+        return self.teams['A'].players + self.teams['B'].players
+
+    def state_size(self):
+        """
+        Nombre de valeurs de l'état (14 pour le match et la balle, 6 par joueur,
+        puis le joueur choisi par chaque place au-delà de la première).
+        """
+        return 14 + 6 * (len(self.teams['A'].players) + len(self.teams['B'].players)) + 2 * (self.seats - 1)
+
+    def get_state(self):
+        """
+        État dynamique du match sous forme d'une liste de nombres.
+
+        La composition des équipes et les positions par défaut n'en font pas
+        partie : set_state s'applique à une Simulation créée avec les mêmes
+        paramètres. Les entrées de la dernière image sont gardées (masque) pour
+        que la détection de front montant reprenne au même point.
+        """
+        state = [0] * self.state_size()
+        self.write_state(state, 0)
+        return state
+
+    def write_state(self, buf, offset):
+        """
+        Écrit l'état de get_state dans buf à partir de offset.
+
+        Sert à SnapshotRing : les champs des objets sont recopiés un à un
+        dans la case de l'anneau, sans liste intermédiaire.
+        """
+        ball = self.ball
+        receiver = -1
+        i = offset + 14
+        for team in (self.teams['A'], self.teams['B']):
+            # Joueur contrôlé : numéro de sa place + 1 (1 pour la première, comme True)
+            places = {id(keys): slot + 1 for slot, keys in enumerate(team.seats)}
+            for p in team.players:
+                if p is ball.pass_receiver:
+                    receiver = (i - offset - 14) // 6
+                buf[i] = p.x
+                buf[i + 1] = p.y
+                buf[i + 2] = p.has_ball
+                buf[i + 3] = places.get(id(p.keys), 1) if p.controlled else 0
+                buf[i + 4] = p.facing[0]
+                buf[i + 5] = p.facing[1]
+                i += 6
+        for team in (self.teams['A'], self.teams['B']):
+            for index in team.selected[1:]:
+                buf[i] = index
+                i += 1
+        buf[offset] = self.frame
+        buf[offset + 1] = self.score['A']
+        buf[offset + 2] = self.score['B']
+        buf[offset + 3] = self.resets
+        buf[offset + 4] = self.teams['A'].selected_index
+        buf[offset + 5] = self.teams['B'].selected_index
+        buf[offset + 6] = self.mask
+        buf[offset + 7] = ball.x
+        buf[offset + 8] = ball.y
+        buf[offset + 9] = ball.vx
+        buf[offset + 10] = ball.vy
+        buf[offset + 11] = ball.in_pass
+        buf[offset + 12] = receiver
+        buf[offset + 13] = ball.cooldown
+
+    def set_state(self, state):
+        """Restaure un état obtenu par get_state."""
+        (frame, score_a, score_b, resets, selected_a, selected_b, mask,
+         bx, by, bvx, bvy, in_pass, receiver, cooldown) = state[:14]
+        self.frame = int(frame)
+        self.score = {'A': int(score_a), 'B': int(score_b)}
+        self.resets = int(resets)
+        self.teams['A'].selected_index = int(selected_a)
+        self.teams['B'].selected_index = int(selected_b)
+        self.mask = int(mask)
+        self.sticks = NO_STICKS
+        players = self.players()
+        ball = self.ball
+        ball.x, ball.y, ball.vx, ball.vy = bx, by, bvx, bvy
+        ball.in_pass = bool(in_pass)
+        ball.pass_receiver = players[int(receiver)] if receiver >= 0 else None
+        ball.cooldown = int(cooldown)
+        i = 14
+        for p in players:
+            p.x, p.y = state[i], state[i + 1]
+            p.has_ball = bool(state[i + 2])
+            p.controlled = bool(state[i + 3])
+            p.keys = self.teams[p.team].seats[int(state[i + 3]) - 1] if p.controlled else None
+            p.facing = (state[i + 4], state[i + 5])
+            i += 6
+        for team in (self.teams['A'], self.teams['B']):
+            for slot in range(1, self.seats):
+                team.selected[slot] = int(state[i])
+                i += 1
+        # Ce que les politiques gardent d'une image à l'autre n'est pas dans l'état
+        for policy in self.policies.values():
+            policy.reset()
+
+    def positions(self):
+        """Positions (x, y) de la balle puis des joueurs de A et de B."""
+        positions = [(self.ball.x, self.ball.y)]
+        for team in self.teams.values():
+            for player in team.players:
+                positions.append((player.x, player.y))
+        return positions
+
+    def reset_positions(self):
+        self.resets += 1
+        self.ball.reset()
+        for team in self.teams.values():
+            for player in team.players:
+                player.x = player.default_x
+                player.y = player.default_y
+
+def main():
+    # Petit banc d'essai : un match IA contre IA sans fenêtre
+    frames = 100000
+    sim = Simulation()
+    start = time.perf_counter()
+    sim.run(frames)
+    elapsed = time.perf_counter() - start
+    print(f"{frames} images en {elapsed:.2f} s ({frames / elapsed:.0f} images/s)")
+    print("Score:", sim.score)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+from array import array
+
+# =============================================================================
+# INSTANTANÉS DANS UN TAMPON PLAT
+# =============================================================================
+# Un instantané est l'état de Simulation.get_state (balle, positions et
+# drapeaux de chaque joueur, selected_index, score...) rangé dans une tranche
+# d'un grand array('d') préalloué. L'état vivant reste dans les objets Player
+# et Ball : Simulation.write_state les sérialise champ par champ dans la case,
+# et set_state les relit de la même façon. Ce n'est donc pas une copie d'un
+# bloc mémoire, mais une boucle Python (six valeurs par joueur, quatorze pour
+# le match et la balle), sans liste intermédiaire ni graphe d'objets à
+# recréer comme avec copy.deepcopy.
+#
+# Seul l'état du match est pris : ce que garde une politique d'IA d'une image
+# à l'autre (policy.py) n'est pas dans la case. Ce ne sont que des caches
+# tirés des positions, que set_state fait reconstruire (Policy.reset).
+#
+# Copie à l'écriture : pin() renvoie une poignée qui lit directement la case
+# de l'anneau, sans copie. Ce n'est qu'au moment où l'anneau s'apprête à
+# réécrire cette case que la poignée reçoit sa propre copie. Replay, rollback
+# réseau et recherche de l'IA peuvent donc garder des instantanés sans payer
+# de copie tant qu'ils ne sont pas écrasés.
+
+RING_CAPACITY = 64
+
+class Snapshot:
+    """Poignée vers un instantané de l'anneau (copiée seulement si la case est réécrite)."""
+
+    def __init__(self, ring, slot, frame):
+        self.ring = ring
+        self.slot = slot
+        self.frame = frame
+        self.own = None
+
+    def detach(self):
+        """Prend une copie privée : appelé par l'anneau avant de réécrire la case."""
+        if self.own is None:
+            self.own = array('d', self.ring.view(self.slot))
+            self.ring = None
+
+    @property
+    def data(self):
+        if self.own is not None:
+            return self.own
+        return self.ring.view(self.slot)
+
+    def restore(self, sim):
+        sim.set_state(self.data)
+
+class SnapshotRing:
+    """
+    Anneau de capacity instantanés dans un seul array('d').
+
+    La case d'un instantané est frame % capacity : on retrouve directement
+    l'état d'une image récente sans recherche.
+    """
+
+    def __init__(self, sim, capacity=RING_CAPACITY):
+        self.size = sim.state_size()
+        self.capacity = capacity
+        self.buffer = array('d', bytes(8 * self.size * capacity))
+        self.memory = memoryview(self.buffer)
+        self.frames = [-1] * capacity
+        self.pins = [[] for _ in range(capacity)]
+
+    def view(self, slot):
+        start = slot * self.size
+        return self.memory[start:start + self.size]
+
+    def save(self, sim):
+        """Copie l'état courant de sim dans la case de son image."""
+        slot = sim.frame % self.capacity
+        if self.pins[slot]:
+            for handle in self.pins[slot]:
+                handle.detach()
+            self.pins[slot] = []
+        sim.write_state(self.buffer, slot * self.size)
+        self.frames[slot] = sim.frame
+
+    def has(self, frame):
+        return frame >= 0 and self.frames[frame % self.capacity] == frame
+
+    def restore(self, sim, frame):
+        """Remet sim dans l'état de l'image frame (qui doit encore être dans l'anneau)."""
+        slot = frame % self.capacity
+        if self.frames[slot] != frame:
+            raise KeyError(f"L'image {frame} n'est plus dans l'anneau")
+        sim.set_state(self.view(slot))
+
+    def pin(self, frame):
+        """Poignée durable sur l'instantané de l'image frame."""
+        slot = frame % self.capacity
+        if self.frames[slot] != frame:
+            raise KeyError(f"L'image {frame} n'est plus dans l'anneau")
+        handle = Snapshot(self, slot, frame)
+        self.pins[slot].append(handle)
+        return handle
@@ -0,0 +1,99 @@
+import math
+
+# =============================================================================
+# GRILLE UNIFORME POUR LES REQUÊTES DE PROXIMITÉ
+# =============================================================================
+# Le terrain est découpé en cases carrées de CELL_SIZE pixels. Chaque case
+# garde la liste des joueurs qui s'y trouvaient au moment de rebuild(). Une
+# requête n'examine que les cases proches au lieu de tous les joueurs.
+#
+# La grille est reconstruite une fois par image, mais les joueurs continuent
+# de bouger pendant l'image. Les requêtes calculent donc toujours la distance
+# avec la position actuelle du joueur, et élargissent la recherche de
+# « slack » pixels (le déplacement maximal depuis rebuild()) pour ne manquer
+# personne.
+
+CELL_SIZE = 16
+
+class UniformGrid:
+    def __init__(self, width, height, cell_size=CELL_SIZE, slack=0.0):
+        self.cell_size = cell_size
+        self.cols = max(1, math.ceil(width / cell_size))
+        self.rows = max(1, math.ceil(height / cell_size))
+        self.slack = slack
+        self.cells = [[] for _ in range(self.cols * self.rows)]
+        self.order = {}
+
+    def cell_of(self, x, y):
+        """Coordonnées (colonne, ligne) de la case contenant (x, y), bornées à la grille."""
+        cx = min(self.cols - 1, max(0, int(x // self.cell_size)))
+        cy = min(self.rows - 1, max(0, int(y // self.cell_size)))
+        return cx, cy
+
+    def rebuild(self, items):
+        """Range les objets (ayant .x et .y) dans leurs cases ; l'ordre sert à départager les égalités."""
+        for cell in self.cells:
+            cell.clear()
+        self.order = {}
+        for i, item in enumerate(items):
+            self.order[id(item)] = i
+            cx, cy = self.cell_of(item.x, item.y)
+            self.cells[cy * self.cols + cx].append(item)
+
+    def ring(self, cx, cy, k):
+        """Cases à distance de Tchebychev exactement k de la case (cx, cy)."""
+        if k == 0:
+            yield self.cells[cy * self.cols + cx]
+            return
+        for gx in range(cx - k, cx + k + 1):
+            if 0 <= gx < self.cols:
+                if cy - k >= 0:
+                    yield self.cells[(cy - k) * self.cols + gx]
+                if cy + k < self.rows:
+                    yield self.cells[(cy + k) * self.cols + gx]
+        for gy in range(cy - k + 1, cy + k):
+            if 0 <= gy < self.rows:
+                if cx - k >= 0:
+                    yield self.cells[gy * self.cols + cx - k]
+                if cx + k < self.cols:
+                    yield self.cells[gy * self.cols + cx + k]
+
+    def nearest(self, x, y, exclude=None):
+        """
+        Objet le plus proche de (x, y), ou None.
+
+        En cas d'égalité, on garde le premier dans l'ordre donné à rebuild(),
+        comme la boucle de Player.pass_ball.
+        """
+        cx, cy = self.cell_of(x, y)
+        best = None
+        best_key = None
+        max_ring = max(self.cols, self.rows)
+        for k in range(max_ring + 1):
+            # Un objet de l'anneau k (ou plus loin) est au moins à (k - 1) cases de la requête
+            if best is not None and best_key[0] < (k - 1) * self.cell_size - self.slack:
+                break
+            for cell in self.ring(cx, cy, k):
+                for item in cell:
+                    if item is exclude:
+                        continue
+                    key = (math.hypot(item.x - x, item.y - y), self.order[id(item)])
+                    if best_key is None or key < best_key:
+                        best = item
+                        best_key = key
+        return best
+
+    def within(self, x, y, radius):
+        """Objets à une distance strictement inférieure à radius de (x, y), dans l'ordre de rebuild()."""
+        reach = radius + self.slack
+        x0, y0 = self.cell_of(x - reach, y - reach)
+        x1, y1 = self.cell_of(x + reach, y + reach)
+        found = []
+        for gy in range(y0, y1 + 1):
+            row = gy * self.cols
+            for gx in range(x0, x1 + 1):
+                for item in self.cells[row + gx]:
+                    if math.hypot(item.x - x, item.y - y) < radius:
+                        found.append(item)
+        found.sort(key=lambda item: self.order[id(item)])
+        return found
@@ -0,0 +1,77 @@
+import os
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+
+from analog import STICK_CURVES
+from controllers import ControllerManager, GamepadSource
+from simulation import Simulation
+
+# =============================================================================
+# DEUX MANETTES DANS LA MÊME ÉQUIPE
+# =============================================================================
+# Lancer avec : python -m pytest test_controllers.py
+# Les manettes sont simulées (FakePad) : pas besoin de matériel.
+
+BUTTONS = {'PASS': 0, 'SHOOT': 1, 'SELECT': 2}
+
+class FakePad:
+    """Manette branchée à la main : axes fixes, aucun bouton."""
+
+    def __init__(self, guid, x=0.0, y=0.0):
+        self.guid = guid
+        self.name = guid
+        self.axes = [x, y]
+
+    def axis(self, index):
+        return self.axes[index]
+
+    def pressed(self, button):
+        return False
+
+def plug(manager, instance_id, pad):
+    manager.events.pads[instance_id] = pad
+    manager.place(instance_id, pad)
+
+def test_two_pads_on_one_team_move_two_players():
+    pygame.init()
+    manager = ControllerManager()
+    # Places A0, B0, A1 : la troisième manette est le second joueur de A
+    plug(manager, 1, FakePad('droite', x=1.0))
+    plug(manager, 2, FakePad('immobile'))
+    plug(manager, 3, FakePad('bas', y=1.0))
+    assert manager.places[1] == ('A', 0) and manager.places[3] == ('A', 1)
+    assert manager.seats() == 2
+
+    source = GamepadSource(manager, BUTTONS)
+    sim = Simulation('A', 4, seats=2)
+    first, second = sim.teams['A'].players[:2]
+    start = [(p.x, p.y) for p in (first, second)]
+    for _ in range(10):
+        sim.step(*source.poll())
+
+    assert first.controlled and second.controlled
+    assert first.x > start[0][0] and first.y == start[0][1]
+    assert second.y > start[1][1] and second.x == start[1][0]
+
+def test_select_skips_the_teammate_player():
+    sim = Simulation('A', 4, seats=2)
+    team = sim.teams['A']
+    # SELECT de la première place : le joueur 1 est à l'autre place, on passe au 2
+    sim.step({'A': {'A_SELECT': True}})
+    assert team.selected == [2, 1]
+    assert [p.controlled for p in team.players] == [False, True, True, False]
+    assert team.players[1].keys is team.seats[1]
+
+def test_curve_follows_the_pad():
+    pygame.init()
+    manager = ControllerManager()
+    manager.set_curve(STICK_CURVES['precise'], 'douce')
+    plug(manager, 1, FakePad('douce', x=0.6))
+    plug(manager, 2, FakePad('normale', x=0.6))
+    states = {'A': {}, 'B': {}}
+    manager.fill('A', 0, states['A'], BUTTONS)
+    manager.fill('B', 0, states['B'], BUTTONS)
+    assert 0 < states['A']['A_STICK_X'] < states['B']['B_STICK_X']
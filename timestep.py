@@ -0,0 +1,81 @@
+import time
+
+# =============================================================================
+# BOUCLE À PAS FIXE ET INTERPOLATION DE L'AFFICHAGE
+# =============================================================================
+# Les constantes physiques (PLAYER_SPEED, FRICTION, ...) sont exprimées par
+# pas de simulation. Pour que le jeu reste déterministe quand des images
+# sautent, la simulation avance toujours par pas de SIM_DT secondes, quel que
+# soit le rythme de pyxel : on accumule le temps réel écoulé et on joue autant
+# de pas qu'il en contient. L'affichage interpole entre les deux derniers
+# états simulés avec alpha = temps restant / SIM_DT.
+#
+# Sans affichage, il suffit d'appeler Simulation.step() en boucle : la
+# simulation va alors aussi vite que le processeur le permet.
+
+SIM_HZ = 30                  # Pas de simulation par seconde (cadence historique de pyxel)
+SIM_DT = 1.0 / SIM_HZ
+MAX_STEPS_PER_FRAME = 5      # Au-delà, on ralentit plutôt que de s'enfoncer dans le retard
+
+def lerp_positions(prev, curr, alpha):
+    """Interpole deux listes de positions (x, y)."""
+    return [(px + (x - px) * alpha, py + (y - py) * alpha)
+            for (px, py), (x, y) in zip(prev, curr)]
+
+class FixedTimestep:
+    """
+    Fait avancer une simulation à pas fixe d'après une horloge réelle.
+
+    clock est une fonction renvoyant le temps en secondes (time.perf_counter
+    par défaut) ; on peut la remplacer pour piloter la boucle à la main.
+    step remplace sim.step (par exemple ReplayRecorder.step pour enregistrer).
+    """
+
+    def __init__(self, sim, dt=SIM_DT, max_steps=MAX_STEPS_PER_FRAME, clock=time.perf_counter, step=None):
+        self.sim = sim
+        self.step = step or sim.step
+        self.dt = dt
+        self.max_steps = max_steps
+        self.clock = clock
+        self.last_time = None
+        self.accumulator = 0.0
+        self.positions = sim.positions()
+        self.prev_positions = self.positions
+
+    def advance(self, inputs=None, sticks=None):
+        """
+        Joue les pas de simulation dus depuis le dernier appel ; renvoie leur
+        nombre. inputs et sticks sont passés tels quels à chaque pas.
+        """
+        now = self.clock()
+        if self.last_time is None:
+            self.last_time = now
+        self.accumulator += min(now - self.last_time, self.max_steps * self.dt)
+        self.last_time = now
+        steps = 0
+        while self.accumulator >= self.dt:
+            resets = self.sim.resets
+            self.prev_positions = self.positions
+            self.step(inputs, sticks)
+            self.positions = self.sim.positions()
+            if self.sim.resets != resets:
+                # Remise en jeu : on ne fait pas glisser les joueurs jusqu'au centre
+                self.prev_positions = self.positions
+            self.accumulator -= self.dt
+            steps += 1
+        return steps
+
+    def sync(self):
+        """Repart de l'état actuel de la simulation (après un saut dans un replay)."""
+        self.positions = self.sim.positions()
+        self.prev_positions = self.positions
+        self.accumulator = 0.0
+
+    @property
+    def alpha(self):
+        """Fraction du pas suivant déjà écoulée (0 <= alpha < 1)."""
+        return self.accumulator / self.dt
+
+    def interpolated_positions(self):
+        """Positions à afficher : balle d'abord, puis joueurs (voir Simulation.positions)."""
+        return lerp_positions(self.prev_positions, self.positions, self.alpha)
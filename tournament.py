@@ -0,0 +1,251 @@
+import argparse
+import json
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from simulation import BALL_SPEED, PLAYER_SPEED, FRICTION
+from batch import BatchSimulator
+from policy import BUILTIN_AI, POLICIES, make_policies
+
+# =============================================================================
+# TOURNOI IA CONTRE IA SUR PLUSIEURS PROCESSUS
+# =============================================================================
+# Répartit des milliers de matchs entre les cœurs de la machine avec un
+# ProcessPoolExecutor. Chaque processus fait tourner un lot de matchs avec
+# BatchSimulator et renvoie le résultat de chaque match ; les lots sont
+# fusionnés au fil de l'eau dans un résumé unique.
+#
+# La graine d'un match ne dépend que de la graine du tournoi et du numéro du
+# match : n'importe quel match peut être rejoué à l'identique avec --match,
+# quel que soit le découpage en lots ou le nombre de processus. Le moteur
+# n'utilise jamais le module random global (contrairement au random.choice de
+# ai_behavior dans mainv3.py ou « affichage select team »), donc rien ne
+# dépend de l'ordre d'exécution des processus.
+#
+# Chaque équipe peut être jouée par une politique d'IA (policy.py) : --ai-a
+# et --ai-b permettent de comparer deux IA sur les mêmes graines (test A/B).
+#
+# Exemple :
+#   python tournament.py --matches 5000 --frames 5400 --workers 8
+#   python tournament.py --seed 1 --match 1234 --frames 5400
+#   python tournament.py --ai-a zone --ai-b chase
+#   python tournament.py --check --matches 200 --frames 2000
+#
+# --check joue quelques affiches entre IA et vérifie que chacune donne encore
+# un vrai match (code de sortie 1 sinon) : une IA qui ne sait plus avancer
+# avec la balle ne se voit pas dans les tests d'équivalence entre moteurs.
+
+FPS = 30   # Cadence de pyxel par défaut, pour convertir les images en minutes
+
+def match_seed(tournament_seed, index):
+    """Graine (entier 32 bits) du match index d'un tournoi."""
+    return int(np.random.SeedSequence([tournament_seed, index]).generate_state(1)[0])
+
+def run_chunk(indices, tournament_seed, frames, settings):
+    """
+    Joue un lot de matchs dans un processus de travail.
+
+    Renvoie une liste de dictionnaires (un par match) qui se sérialisent
+    tels quels en JSON.
+    """
+    seeds = [match_seed(tournament_seed, i) for i in indices]
+    settings = dict(settings)
+    settings['policies'] = make_policies(settings.pop('ai', {}))
+    batch = BatchSimulator(len(indices), seeds=seeds, **settings)
+    batch.run(frames)
+    results = []
+    for m, index in enumerate(indices):
+        results.append({
+            'match': index,
+            'seed': seeds[m],
+            'score': batch.score(m),
+            'shots': {'A': int(batch.shots[m, 0]), 'B': int(batch.shots[m, 1])},
+            'possession': {'A': int(batch.possession[m, 0]), 'B': int(batch.possession[m, 1])},
+        })
+    return results
+
+class Summary:
+    """Cumul des résultats de tous les matchs reçus."""
+
+    def __init__(self, ai=None):
+        self.ai = ai or {'A': BUILTIN_AI, 'B': BUILTIN_AI}
+        self.matches = 0
+        self.wins = {'A': 0, 'B': 0}
+        self.draws = 0
+        self.goals = {'A': 0, 'B': 0}
+        self.shots = {'A': 0, 'B': 0}
+        self.possession = {'A': 0, 'B': 0}
+
+    def add(self, result):
+        self.matches += 1
+        score = result['score']
+        if score['A'] > score['B']:
+            self.wins['A'] += 1
+        elif score['B'] > score['A']:
+            self.wins['B'] += 1
+        else:
+            self.draws += 1
+        for team in ('A', 'B'):
+            self.goals[team] += score[team]
+            self.shots[team] += result['shots'][team]
+            self.possession[team] += result['possession'][team]
+
+    def as_dict(self):
+        held = self.possession['A'] + self.possession['B']
+        return {
+            'ai': self.ai,
+            'matches': self.matches,
+            'wins': self.wins,
+            'draws': self.draws,
+            'goals': self.goals,
+            'shots': self.shots,
+            'possession_share': {team: (self.possession[team] / held if held else 0.0)
+                                 for team in ('A', 'B')},
+        }
+
+    def report(self):
+        d = self.as_dict()
+        lines = [
+            f"IA A : {self.ai['A']}   IA B : {self.ai['B']}",
+            f"Matchs joués : {self.matches}",
+            f"Victoires A : {self.wins['A']}   Victoires B : {self.wins['B']}   Nuls : {self.draws}",
+            f"Buts A : {self.goals['A']}   Buts B : {self.goals['B']}",
+            f"Tirs A : {self.shots['A']}   Tirs B : {self.shots['B']}",
+            f"Possession A : {d['possession_share']['A']:.1%}   "
+            f"Possession B : {d['possession_share']['B']:.1%}",
+        ]
+        return "\n".join(lines)
+
+def both_attack(results):
+    """Les deux équipes tirent dans au moins la moitié des matchs et marquent."""
+    failures = []
+    for team in ('A', 'B'):
+        shooting = sum(result['shots'][team] > 0 for result in results)
+        if shooting < len(results) / 2:
+            failures.append(f"l'équipe {team} ne tire que dans {shooting} matchs sur {len(results)}")
+        if not any(result['score'][team] for result in results):
+            failures.append(f"l'équipe {team} ne marque jamais")
+    return failures
+
+def varied(results):
+    """Les graines changent le match : aucun résultat (score, tirs) ne revient dans plus de la moitié des matchs."""
+    outcomes = Counter((result['score']['A'], result['score']['B'], result['shots']['A'], result['shots']['B'])
+                       for result in results)
+    outcome, count = outcomes.most_common(1)[0]
+    if count > len(results) / 2:
+        return [f"{count} matchs sur {len(results)} finissent à {outcome[0]}-{outcome[1]} "
+                f"avec {outcome[2]} et {outcome[3]} tirs"]
+    return []
+
+# Affiches de --check : (IA A, IA B, gardiens, conditions sur les résultats des matchs)
+CHECKS = [
+    # Jeu en bloc des deux côtés : l'équipe qui a la balle doit encore la porter vers l'avant
+    ('zone', 'zone', False, (both_attack, varied)),
+    # Une boucle (tir dès la remise en jeu, relance du gardien) rejoue le même match à chaque graine
+    ('zone', 'chase', False, (both_attack, varied)),
+    ('chase', 'chase', True, (both_attack, varied)),
+    ('influence', 'zone', True, (both_attack, varied)),
+]
+
+def play(args, settings, on_result):
+    """Joue args.matches matchs répartis entre les processus ; on_result reçoit chaque résultat."""
+    chunks = [list(range(start, min(start + args.chunk, args.matches)))
+              for start in range(0, args.matches, args.chunk)]
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        futures = [executor.submit(run_chunk, chunk, args.seed, args.frames, settings)
+                   for chunk in chunks]
+        for future in as_completed(futures):
+            for result in future.result():
+                on_result(result)
+
+def check(args, settings):
+    """Joue chaque affiche de CHECKS ; renvoie 1 si l'une d'elles échoue."""
+    failed = False
+    for ai_a, ai_b, keepers, conditions in CHECKS:
+        settings = dict(settings, keepers=keepers, ai={'A': ai_a, 'B': ai_b})
+        summary = Summary(settings['ai'])
+        results = []
+
+        def add(result):
+            summary.add(result)
+            results.append(result)
+
+        play(args, settings, add)
+        failures = [failure for condition in conditions for failure in condition(results)]
+        with_keepers = " avec gardiens" if keepers else ""
+        print(f"{ai_a} contre {ai_b}{with_keepers} : " + ("; ".join(failures) if failures else "ok"))
+        if failures:
+            print(summary.report())
+            failed = True
+    return 1 if failed else 0
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Tournoi IA contre IA sans affichage")
+    parser.add_argument('--matches', type=int, default=1000, help="nombre de matchs")
+    parser.add_argument('--frames', type=int, default=90 * FPS, help="durée d'un match en images")
+    parser.add_argument('--seed', type=int, default=0, help="graine du tournoi")
+    parser.add_argument('--workers', type=int, default=None, help="nombre de processus (tous les cœurs par défaut)")
+    parser.add_argument('--chunk', type=int, default=100, help="matchs par lot envoyé à un processus")
+    parser.add_argument('--players', type=int, default=4, help="joueurs par équipe")
+    parser.add_argument('--player-speed', type=float, default=PLAYER_SPEED)
+    parser.add_argument('--ball-speed', type=float, default=BALL_SPEED)
+    parser.add_argument('--friction', type=float, default=FRICTION)
+    parser.add_argument('--keepers', action='store_true', help="un gardien par équipe")
+    ai_choices = [BUILTIN_AI] + sorted(POLICIES)
+    parser.add_argument('--ai-a', choices=ai_choices, default=BUILTIN_AI, help="IA de l'équipe A (policy.py)")
+    parser.add_argument('--ai-b', choices=ai_choices, default=BUILTIN_AI, help="IA de l'équipe B (policy.py)")
+    parser.add_argument('--match', type=int, default=None, help="rejoue seulement ce numéro de match")
+    parser.add_argument('--results', default=None, help="fichier JSON lines recevant chaque résultat")
+    parser.add_argument('--json', action='store_true', help="affiche le résumé en JSON")
+    parser.add_argument('--check', action='store_true',
+                        help="vérifie que les affiches entre IA donnent un vrai match (code de sortie 1 sinon)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    settings = {
+        'players_per_side': args.players,
+        'player_speed': args.player_speed,
+        'ball_speed': args.ball_speed,
+        'friction': args.friction,
+        'keepers': args.keepers,
+        'ai': {'A': args.ai_a, 'B': args.ai_b},
+    }
+
+    if args.check:
+        return check(args, settings)
+
+    if args.match is not None:
+        # Reproduction d'un seul match, dans le processus courant
+        result = run_chunk([args.match], args.seed, args.frames, settings)[0]
+        print(json.dumps(result))
+        return
+
+    summary = Summary(settings['ai'])
+    out = open(args.results, 'w') if args.results else None
+
+    def add(result):
+        summary.add(result)
+        if out:
+            out.write(json.dumps(result) + "\n")
+        print(f"\r{summary.matches}/{args.matches} matchs", end="", file=sys.stderr, flush=True)
+
+    start = time.perf_counter()
+    try:
+        play(args, settings, add)
+    finally:
+        if out:
+            out.close()
+    elapsed = time.perf_counter() - start
+    print(f"\r{summary.matches} matchs en {elapsed:.1f} s", file=sys.stderr)
+    if args.json:
+        print(json.dumps(summary.as_dict()))
+    else:
+        print(summary.report())
+
+if __name__ == "__main__":
+    sys.exit(main())